@@ -0,0 +1,81 @@
+"""Reestimación de calorías del historial (fithome.calories) en lote.
+
+Genera un historial sintético de sesiones con telemetría por ejercicio y
+compara la estimación sesión a sesión (session_calories) con la pasada de
+NumPy de estimate_history.
+
+    python benchmarks/calorie_reestimate.py --sessions 100000
+"""
+import argparse
+import bisect
+import datetime
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.calories import BodyProfile, estimate_history, session_calories
+from fithome.catalog import get_catalog
+from fithome.telemetry import ExerciseDetail
+
+def synthetic_history(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    workouts = get_catalog().workouts
+    start = datetime.date(2024, 1, 1)
+    sessions, details, per_session = [], [], []
+    for session_id in range(1, count + 1):
+        workout = rng.choice(workouts)
+        day = start + datetime.timedelta(days=session_id * 700 // count)
+        sessions.append((session_id, workout.id, day, 0, workout.duration_minutes))
+        rows = []
+        if rng.random() < 0.8:
+            for order, exercise in enumerate(workout.exercises):
+                detail = ExerciseDetail(
+                    exercise_order=order,
+                    exercise_id=exercise.exercise_id,
+                    duration_seconds=rng.randrange(20, 70) if exercise.work_seconds else None,
+                    rest_seconds=rng.randrange(5, 30),
+                    sets_completed=exercise.sets,
+                    reps_completed=exercise.reps,
+                )
+                rows.append(detail)
+                details.append((
+                    session_id, detail.exercise_id,
+                    -1 if detail.duration_seconds is None else detail.duration_seconds,
+                    detail.rest_seconds, int(detail.skipped), detail.sets_completed or 0, detail.reps_completed or 0
+                ))
+        per_session.append((workout, rows, day))
+    weights = [(start + datetime.timedelta(days=d), 85 - d / 50) for d in range(0, 700, 7)]
+    return (sessions, details), per_session, weights
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    history, per_session, weights = synthetic_history(args.sessions)
+    body = BodyProfile(weight_kg=weights[-1][1], height_cm=175, age=35, gender='femenino')
+    print(f"{args.sessions} sesiones, {len(history[1])} filas de telemetría\n")
+
+    started = time.perf_counter()
+    loop = {}
+    measured_days = [day for day, _ in weights]
+    for (session_id, *_), (workout, rows, day) in zip(history[0], per_session):
+        kg = weights[max(bisect.bisect_right(measured_days, day) - 1, 0)][1]
+        session_body = BodyProfile(kg, body.height_cm, body.age, body.gender)
+        loop[session_id] = session_calories(workout, rows, session_body)
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batched = estimate_history(history, get_catalog().workouts, body, weights)
+    batched_seconds = time.perf_counter() - started
+
+    mismatches = sum(1 for session_id, kcal in loop.items() if batched.get(session_id, 0) != kcal)
+    print(f"sesión a sesión: {loop_seconds:.2f} s")
+    print(f"en lote (NumPy): {batched_seconds:.2f} s  ({loop_seconds / batched_seconds:.0f}x)")
+    print(f"diferencias: {mismatches}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Coste por rerun de las tarjetas HTML, con y sin caché de fragmentos.
+
+Mide el tiempo de generar el HTML de todas las tarjetas que dibujan las
+pestañas (entrenamientos, zona infantil, películas y vista previa de cada
+entrenamiento) y los bytes que se envían por rerun, incluida la hoja de
+estilos global: antes iba en cada ejecución del script y ahora se inyecta
+una vez por sesión (fithome.ui.styles).
+
+    python benchmarks/card_render.py --reruns 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.catalog import get_catalog
+from fithome.ui import fragments
+
+def rerun_uncached(catalog, theme):
+    html = []
+    for workout in catalog.workouts:
+        html.append(fragments.render_workout_card(workout, theme, fragments.DEFAULT_LOCALE))
+        html.append(fragments.render_workout_hero(workout, theme, fragments.DEFAULT_LOCALE))
+        html.append(fragments.render_exercise_list(workout, theme, fragments.DEFAULT_LOCALE))
+    for activity in catalog.kids_activities:
+        html.append(fragments.render_kids_card(activity, theme, fragments.DEFAULT_LOCALE))
+    for movie in catalog.movies:
+        html.append(fragments.render_movie_card(movie, theme, fragments.DEFAULT_LOCALE))
+    return html
+
+def rerun_cached(catalog, theme):
+    html = []
+    for workout in catalog.workouts:
+        html.append(fragments.workout_card(workout, theme))
+        html.append(fragments.workout_hero(workout, theme))
+        html.append(fragments.exercise_list(workout, theme))
+    for activity in catalog.kids_activities:
+        html.append(fragments.kids_card(activity, theme))
+    for movie in catalog.movies:
+        html.append(fragments.movie_card(movie, theme))
+    return html
+
+def measure(run, catalog, reruns):
+    started = time.perf_counter()
+    for i in range(reruns):
+        run(catalog, ("masculino", "femenino", fragments.DEFAULT_THEME)[i % 3])
+    return (time.perf_counter() - started) / reruns
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=2000)
+    args = parser.parse_args()
+
+    # fithome.ui.styles importa streamlit; basta con el tamaño de la hoja
+    css_bytes = Path(fragments.__file__).with_name("global.css").stat().st_size
+
+    catalog = get_catalog()
+    cards = len(rerun_uncached(catalog, fragments.DEFAULT_THEME))
+    before = measure(rerun_uncached, catalog, args.reruns)
+    after = measure(rerun_cached, catalog, args.reruns)
+
+    print(f"{cards} fragmentos por rerun, {args.reruns} reruns")
+    print(f"{'modo':<10} {'µs/rerun':>10} {'CSS enviado/rerun':>18}")
+    print(f"{'antes':<10} {before * 1e6:>10.1f} {css_bytes:>16} B")
+    print(f"{'caché':<10} {after * 1e6:>10.1f} {0:>16} B")
+
+if __name__ == "__main__":
+    main()
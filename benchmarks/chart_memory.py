@@ -0,0 +1,83 @@
+"""Memoria residente (RSS) tras muchas vistas de la pestaña de progreso.
+
+Compara el código anterior de stats_tab (pyplot.subplots en cada rerun,
+sin cerrar la figura) con fithome.charts (Figure sin pyplot, liberada al
+terminar y con caché por vector semanal). Cada modo corre en un proceso
+nuevo para que uno no herede la memoria del otro.
+
+    python benchmarks/chart_memory.py --views 5000 --distinct 200
+"""
+import argparse
+import random
+import resource
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/statm") as handle:
+            pages = int(handle.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        # Sin /proc (macOS): pico de RSS, en bytes
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**20
+
+def weekly_vectors(distinct: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [tuple(rng.choice((0, 0, 15, 20, 30, 45, 60)) for _ in range(7)) for _ in range(distinct)]
+
+def view_pyplot(weekly):
+    import io
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.bar(['L', 'M', 'X', 'J', 'V', 'S', 'D'], weekly, color='#667eea')
+    ax.set_ylabel('Minutos de actividad')
+    ax.set_title('Actividad por día de la semana')
+    fig.savefig(io.BytesIO(), format="png")
+
+def view_service(weekly):
+    from fithome.charts import weekly_activity_chart
+    weekly_activity_chart(weekly)
+
+def run_mode(mode: str, views: int, distinct: int, every: int):
+    view = view_pyplot if mode == "pyplot" else view_service
+    vectors = weekly_vectors(distinct)
+    rng = random.Random(11)
+    view(vectors[0])
+    baseline = rss_mb()
+    samples = []
+    for i in range(1, views + 1):
+        view(rng.choice(vectors))
+        if i % every == 0:
+            samples.append((i, rss_mb()))
+    print(f"{mode:<8} inicio {baseline:7.1f} MB", end="")
+    for i, rss in samples:
+        print(f" | {i}: {rss:7.1f} MB", end="")
+    print(f" | crecimiento {samples[-1][1] - baseline:+.1f} MB" if samples else "")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--views", type=int, default=5000)
+    parser.add_argument("--distinct", type=int, default=200, help="vectores semanales distintos")
+    parser.add_argument("--every", type=int, default=1000, help="cada cuántas vistas se mide")
+    parser.add_argument("--mode", choices=("pyplot", "service"))
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.views, args.distinct, args.every)
+        return
+    for mode in ("pyplot", "service"):
+        subprocess.run(
+            [sys.executable, __file__, "--mode", mode, "--views", str(args.views),
+             "--distinct", str(args.distinct), "--every", str(args.every)],
+            check=True
+        )
+
+if __name__ == "__main__":
+    main()
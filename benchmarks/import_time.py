@@ -0,0 +1,83 @@
+"""Tiempo de importación en frío de cada pantalla (python -X importtime).
+
+Cada pantalla se importa en un proceso nuevo, igual que la primera sesión
+de un worker recién arrancado. Se muestra el tiempo acumulado y qué
+módulos pesados arrastra; con --check falla si la pantalla de carga o la
+de acceso importan algo de gráficas.
+
+    python benchmarks/import_time.py --repeat 5
+    python benchmarks/import_time.py --check
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+TARGETS = {
+    "loading": "fithome.screens.loading",
+    "auth": "fithome.screens.auth",
+    "onboarding": "fithome.screens.onboarding",
+    "dashboard": "fithome.screens.dashboard",
+    "home": "fithome.screens.home",
+    "workouts": "fithome.screens.workouts",
+    "stats": "fithome.screens.stats",
+    "workout": "fithome.screens.workout",
+}
+
+# Módulos que conviene ver en el informe cuando aparecen
+HEAVY = ("streamlit", "matplotlib", "numpy", "pandas", "sqlite3", "fithome.charts", "fithome.journal")
+
+# Pantallas que no deben cargar nada de gráficas
+MUST_NOT_IMPORT = {
+    "loading": ("matplotlib", "fithome.charts"),
+    "auth": ("matplotlib", "fithome.charts"),
+}
+
+def import_profile(module: str):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "error"
+        raise RuntimeError(error)
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, _, fields = line.partition("import time:")
+        _, total, name = (field.strip() for field in fields.split("|"))
+        cumulative[name] = int(total)
+    return cumulative
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="procesos por pantalla (se toma la mediana)")
+    parser.add_argument("--check", action="store_true", help="falla si loading/auth importan gráficas")
+    args = parser.parse_args()
+
+    failures = []
+    print(f"{'pantalla':<12} {'ms':>8}  módulos pesados")
+    for screen, module in TARGETS.items():
+        try:
+            runs = [import_profile(module) for _ in range(args.repeat)]
+        except RuntimeError as exc:
+            print(f"{screen:<12} {'—':>8}  no se pudo importar: {exc}")
+            continue
+        total_ms = statistics.median(run.get(module, 0) for run in runs) / 1000
+        loaded = runs[0]
+        heavy = [name for name in HEAVY if name in loaded]
+        print(f"{screen:<12} {total_ms:>8.1f}  {', '.join(heavy) or '-'}")
+        for name in MUST_NOT_IMPORT.get(screen, ()):
+            if name in loaded:
+                failures.append(f"{screen} importa {name}")
+
+    if args.check and failures:
+        print("\n".join(failures), file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
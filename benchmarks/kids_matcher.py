@@ -0,0 +1,101 @@
+"""Búsqueda de actividades infantiles por edades, tiempo y materiales (fithome.kidsmatch).
+
+Genera un catálogo sintético de actividades con rangos de edad y duración
+en texto ("6-12 años", "30-45 min") y materiales (algunos "(opcional)"), y
+mide la primera página de resultados para combinaciones de filtros como
+las que cambia un padre en la pantalla, frente a recorrer el catálogo
+parseando los textos y comparando los materiales en cada rerun.
+
+    python benchmarks/kids_matcher.py --activities 20000 --materials 400
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.kidsmatch import KidsMatcher, parse_material
+from fithome.models import KidsActivity
+from fithome.search import build_kids_index, normalize, parse_range
+
+TYPES = ("Construcción", "Ejercicio", "Manualidad", "Educativo", "Arte")
+PAGE_SIZE = 10
+
+def synthetic_activities(count: int, materials: int, seed: int = 31):
+    rng = random.Random(seed)
+    names = [f"Material {i}" for i in range(materials)]
+    activities = []
+    for i in range(1, count + 1):
+        age = rng.randrange(2, 13)
+        minutes = rng.randrange(5, 91, 5)
+        needed = [
+            name if rng.random() < 0.8 else f"{name} (opcional)"
+            for name in rng.sample(names, rng.randrange(1, 6))
+        ]
+        activities.append(KidsActivity(
+            i, f"Actividad {i}", rng.choice(TYPES), f"{minutes}-{minutes + rng.randrange(0, 31, 5)} min",
+            f"{age}-{age + rng.randrange(1, 7)} años", "🎨", "Fácil", tuple(needed), (), (), rng.random() < 0.2,
+        ))
+    return activities, names
+
+def linear_first_page(activities, ages, minutes, have, adult):
+    # Referencia: parsear y comparar actividad por actividad, y ordenar
+    have = {normalize(name) for name in have}
+    ranked = []
+    for activity in activities:
+        if not adult and activity.adult_supervision:
+            continue
+        age_min, age_max = parse_range(activity.age)
+        covered = [age_min <= age <= age_max for age in ages]
+        if ages and not any(covered):
+            continue
+        low, high = parse_range(activity.duration)
+        if low > minutes:
+            continue
+        missing = {normalize(name) for name, essential in map(parse_material, activity.materials) if essential} - have
+        if len(missing) > 1:
+            continue
+        ranked.append(((bool(missing), not all(covered), high > minutes), activity.id, activity))
+    ranked.sort(key=lambda item: item[:2])
+    return [activity for *_, activity in ranked[:PAGE_SIZE]]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--activities", type=int, default=20_000)
+    parser.add_argument("--materials", type=int, default=400)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    activities, names = synthetic_activities(args.activities, args.materials)
+    started = time.perf_counter()
+    matcher = KidsMatcher(build_kids_index(activities))
+    print(f"{args.activities} actividades, {args.materials} materiales: "
+          f"índices en {(time.perf_counter() - started) * 1e3:.0f} ms\n")
+
+    rng = random.Random(5)
+    queries = [
+        (rng.sample(range(2, 16), rng.randrange(1, 4)), rng.choice((15, 30, 45, 60, 90)),
+         rng.sample(names, rng.randrange(args.materials // 4, args.materials)), rng.random() < 0.7)
+        for _ in range(args.queries)
+    ]
+
+    indexed, linear = [], []
+    for ages, minutes, have, adult in queries:
+        started = time.perf_counter()
+        page = matcher.page(matcher.match(ages, minutes, have, adult), 0, PAGE_SIZE)
+        indexed.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        expected = linear_first_page(activities, ages, minutes, have, adult)
+        linear.append(time.perf_counter() - started)
+        assert list(page.items) == expected
+
+    for label, samples in (("con índices", indexed), ("recorriendo el catálogo", linear)):
+        samples = sorted(samples)
+        print(f"{label:<24} mediana {statistics.median(samples) * 1e3:7.2f} ms   "
+              f"p95 {samples[int(len(samples) * 0.95)] * 1e3:7.2f} ms")
+
+if __name__ == "__main__":
+    main()
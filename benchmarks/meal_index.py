@@ -0,0 +1,93 @@
+"""Índice de alérgenos y sustitutos de los platos (fithome.mealindex).
+
+Genera un catálogo sintético con alérgenos y sustitutos y mide: platos
+seguros para varios alérgenos con el índice frente a recorrer los platos
+leyendo el JSON de allergen_types de cada ingrediente (como las columnas
+de MySQL), la búsqueda del plato sustituto en frío y en caché, y la
+actualización de un ingrediente frente a reconstruir el índice.
+
+    python benchmarks/meal_index.py --meals 50000 --ingredients 2000
+"""
+import argparse
+import dataclasses
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.mealindex import MealIndex
+from fithome.models import ALLERGENS, MEAL_TYPES, Ingredient, Meal, MealIngredient
+
+def synthetic_catalog(meals: int, ingredients: int, seed: int = 29):
+    rng = random.Random(seed)
+    codes = list(ALLERGENS)
+    pantry = [
+        Ingredient(i, f"ingrediente {i}", "otros", 100, 5, 10, 5, 1,
+                   tuple(rng.sample(codes, rng.choice((1, 2)))) if rng.random() < 0.3 else ())
+        for i in range(1, ingredients + 1)
+    ]
+    dishes = [
+        Meal(i, f"plato {i}", rng.choice(MEAL_TYPES)[0], 1, None, "fácil", "",
+             tuple(MealIngredient(rng.randrange(1, ingredients + 1), 100, rng.random() < 0.1,
+                                  tuple(rng.sample(range(1, ingredients + 1), rng.randrange(0, 3))))
+                   for _ in range(rng.randrange(2, 8))))
+        for i in range(1, meals + 1)
+    ]
+    return pantry, dishes
+
+def timed(function, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e3
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meals", type=int, default=50_000)
+    parser.add_argument("--ingredients", type=int, default=2_000)
+    args = parser.parse_args()
+
+    pantry, dishes = synthetic_catalog(args.meals, args.ingredients)
+    print(f"{args.meals} platos, {args.ingredients} ingredientes\n")
+    print(f"construcción del índice:            {timed(lambda: MealIndex(pantry, dishes)):9.1f} ms")
+    index = MealIndex(pantry, dishes)
+
+    allergen_json = {ingredient.id: json.dumps(list(ingredient.allergens)) for ingredient in pantry}
+    wanted = {"gluten", "lactosa"}
+
+    def scan():
+        return [
+            meal for meal in dishes
+            if not any(wanted.intersection(json.loads(allergen_json[item.ingredient_id]))
+                       for item in meal.ingredients if not item.is_optional)
+        ]
+
+    assert [meal.id for meal in scan()] == [meal.id for meal in index.meals_in(index.safe(wanted))]
+    print(f"seguros sin gluten ni lactosa:      {timed(lambda: index.safe(wanted), 1000) * 1e3:9.1f} µs"
+          f" ({index.safe(wanted).bit_count()} platos)")
+    print(f"  ... con la lista de platos:       {timed(lambda: index.meals_in(index.safe(wanted)), 10):9.1f} ms")
+    print(f"  ... leyendo el JSON por fila:     {timed(scan):9.1f} ms")
+
+    unsafe = index.meals_in(index.containing(wanted))[:1000]
+    cold = timed(lambda: [index.nearest_safe(meal.id, wanted) for meal in unsafe]) / len(unsafe)
+    warm = timed(lambda: [index.nearest_safe(meal.id, wanted) for meal in unsafe]) / len(unsafe)
+    print(f"\nplato sustituto (en frío):         {cold * 1e3:9.1f} µs")
+    print(f"plato sustituto (en caché):         {warm * 1e3:9.2f} µs")
+
+    rng = random.Random(2)
+    edits = [
+        dataclasses.replace(ingredient, allergens=("gluten",) if not ingredient.allergens else ())
+        for ingredient in rng.sample(pantry, 100)
+    ]
+    per_edit = timed(lambda: [index.update_ingredient(edit) for edit in edits]) / len(edits)
+    print(f"\nalérgenos de un ingrediente:        {per_edit:9.3f} ms")
+    edited = {ingredient.id: ingredient for ingredient in pantry}
+    edited.update((edit.id, edit) for edit in edits)
+    rebuilt = MealIndex(edited.values(), dishes)
+    assert rebuilt.allergen_meals == index.allergen_meals
+
+if __name__ == "__main__":
+    main()
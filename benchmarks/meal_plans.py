@@ -0,0 +1,82 @@
+"""Generación de planes de comidas (fithome.mealplan) con un catálogo grande.
+
+Genera ingredientes con alérgenos y miles de platos sintéticos, y mide la
+semana de un usuario (opciones de cada franja más búsqueda en haz), la de
+un grupo ya resuelto y el lote para muchos usuarios agrupados por (plan,
+alergias). Comprueba que cada día cae en el rango de calorías del plan.
+
+    python benchmarks/meal_plans.py --meals 5000 --users 10000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.mealindex import MealIndex
+from fithome.mealplan import MealPlanner
+from fithome.models import ALLERGENS, MEAL_TYPES, Ingredient, Meal, MealIngredient, NutritionPlan
+from fithome.nutrition import NutritionEngine
+
+PLANS = (
+    NutritionPlan(1, "Pérdida de peso", "", "perder_peso", 1500, 1700, 40, 30, 30, ()),
+    NutritionPlan(2, "Ganancia muscular", "", "ganar_musculo", 2400, 2700, 45, 30, 25, ()),
+    NutritionPlan(3, "Mantenimiento", "", "mantener", 1900, 2200, 50, 20, 30, ()),
+)
+
+def synthetic_catalog(meals: int, ingredients: int, seed: int = 17):
+    rng = random.Random(seed)
+    codes = list(ALLERGENS)
+    pantry = [
+        Ingredient(i, f"ingrediente {i}", "otros", rng.uniform(20, 500), rng.uniform(0, 30), rng.uniform(0, 70),
+                   rng.uniform(0, 30), rng.uniform(0, 10), tuple(rng.sample(codes, 1)) if rng.random() < 0.2 else ())
+        for i in range(1, ingredients + 1)
+    ]
+    dishes = [
+        Meal(i, f"plato {i}", rng.choice(MEAL_TYPES)[0], rng.randrange(1, len(PLANS) + 1), None, "fácil", "",
+             tuple(MealIngredient(rng.randrange(1, ingredients + 1), rng.randrange(20, 150), rng.random() < 0.1)
+                   for _ in range(rng.randrange(2, 7))))
+        for i in range(1, meals + 1)
+    ]
+    return pantry, dishes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meals", type=int, default=5_000)
+    parser.add_argument("--ingredients", type=int, default=500)
+    parser.add_argument("--users", type=int, default=10_000)
+    args = parser.parse_args()
+
+    pantry, dishes = synthetic_catalog(args.meals, args.ingredients)
+    planner = MealPlanner(NutritionEngine(pantry, dishes, PLANS), MealIndex(pantry, dishes))
+    print(f"{args.meals} platos, {args.ingredients} ingredientes\n")
+
+    started = time.perf_counter()
+    week = planner.week(PLANS[0], ("gluten",))
+    print(f"semana de un usuario:            {(time.perf_counter() - started) * 1e3:8.1f} ms")
+    started = time.perf_counter()
+    planner.week(PLANS[0], ("gluten",))
+    print(f"semana de un grupo ya resuelto:  {(time.perf_counter() - started) * 1e6:8.1f} µs")
+
+    rng = random.Random(3)
+    codes = list(ALLERGENS)
+    users = [(rng.choice(PLANS), tuple(rng.sample(codes, rng.choice((0, 0, 0, 1, 1, 2))))) for _ in range(args.users)]
+    planner = MealPlanner(NutritionEngine(pantry, dishes, PLANS), MealIndex(pantry, dishes))
+    started = time.perf_counter()
+    weeks = [planner.week(plan, allergies) for plan, allergies in users]
+    elapsed = time.perf_counter() - started
+    groups = len({(plan.id, frozenset(allergies)) for plan, allergies in users})
+    print(f"lote de {args.users} usuarios ({groups} grupos): {elapsed:8.2f} s")
+
+    outside = sum(
+        not plan.calories_min <= day.macros.calories <= plan.calories_max
+        for (plan, _), user_week in zip(users, weeks)
+        for day in user_week
+    )
+    print(f"\ndías fuera del rango de calorías: {outside} de {sum(len(user_week) for user_week in weeks)}")
+    print("semana de ejemplo:", [round(day.macros.calories) for day in week])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Totales de nutrientes de comidas y planes (fithome.nutrition) a gran escala.
+
+Genera un catálogo sintético de ingredientes y comidas y mide la
+construcción del motor (producto comidas x ingredientes), la misma suma
+recorriendo comida a comida en Python y la edición de un ingrediente
+aplicada de forma incremental frente a reconstruir el motor.
+
+    python benchmarks/nutrition_engine.py --meals 50000 --ingredients 2000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import numpy as np
+
+from fithome.models import MEAL_TYPES, Ingredient, Meal, MealIngredient, NutritionPlan
+from fithome.nutrition import NUTRIENTS, NutritionEngine
+
+def synthetic_catalog(meals: int, ingredients: int, plans: int, seed: int = 13):
+    rng = random.Random(seed)
+    pantry = [
+        Ingredient(i, f"ingrediente {i}", "otros", rng.uniform(10, 600), rng.uniform(0, 30),
+                   rng.uniform(0, 80), rng.uniform(0, 50), rng.uniform(0, 15), ())
+        for i in range(1, ingredients + 1)
+    ]
+    dishes = [
+        Meal(i, f"comida {i}", rng.choice(MEAL_TYPES)[0], rng.randrange(1, plans + 1), None, "fácil", "",
+             tuple(MealIngredient(rng.randrange(1, ingredients + 1), rng.randrange(5, 250), rng.random() < 0.1)
+                   for _ in range(rng.randrange(2, 12))))
+        for i in range(1, meals + 1)
+    ]
+    programs = [
+        NutritionPlan(i, f"plan {i}", "", "mantener", 1800, 2200, 50, 20, 30, ())
+        for i in range(1, plans + 1)
+    ]
+    return pantry, dishes, programs
+
+def naive_totals(pantry, dishes):
+    by_id = {ingredient.id: ingredient for ingredient in pantry}
+    totals = []
+    for meal in dishes:
+        row = [0.0] * len(NUTRIENTS)
+        for item in meal.ingredients:
+            if item.is_optional:
+                continue
+            ingredient = by_id[item.ingredient_id]
+            for k, name in enumerate(NUTRIENTS):
+                row[k] += getattr(ingredient, name) * item.grams / 100
+        totals.append(row)
+    return totals
+
+def timed(function, repeat: int = 1) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e3
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--meals", type=int, default=50_000)
+    parser.add_argument("--ingredients", type=int, default=2_000)
+    parser.add_argument("--plans", type=int, default=500)
+    args = parser.parse_args()
+
+    pantry, dishes, programs = synthetic_catalog(args.meals, args.ingredients, args.plans)
+    print(f"{args.meals} comidas, {args.ingredients} ingredientes, {args.plans} planes\n")
+
+    engine = NutritionEngine(pantry, dishes, programs)
+    naive = naive_totals(pantry, dishes)
+    assert np.allclose(engine.meal_totals, naive)
+
+    print(f"motor (producto disperso):      {timed(lambda: NutritionEngine(pantry, dishes, programs), 3):9.1f} ms")
+    print(f"comida a comida en Python:      {timed(lambda: naive_totals(pantry, dishes)):9.1f} ms")
+
+    rng = random.Random(1)
+    edits = [
+        Ingredient(ingredient.id, ingredient.name, ingredient.category, ingredient.calories * 1.1,
+                   ingredient.protein, ingredient.carbs, ingredient.fat * 0.9, ingredient.fiber, ())
+        for ingredient in rng.sample(pantry, 100)
+    ]
+    per_edit = timed(lambda: [engine.update_ingredient(edit) for edit in edits]) / len(edits)
+    print(f"edición de un ingrediente:      {per_edit:9.3f} ms")
+
+    rebuilt = NutritionEngine(list(engine.ingredients.values()), dishes, programs)
+    assert np.allclose(engine.meal_totals, rebuilt.meal_totals)
+    assert np.allclose(engine.plan_totals, rebuilt.plan_totals)
+
+if __name__ == "__main__":
+    main()
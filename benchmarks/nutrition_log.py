@@ -0,0 +1,92 @@
+"""Importación masiva del registro de comidas (fithome.intake).
+
+Crea una base SQLite temporal y genera al vuelo un año de entradas por
+usuario (platos del catálogo y comidas personalizadas). Mide la ingesta
+por bloques frente a una transacción por entrada (sobre una muestra),
+extrapola al volumen pedido y comprueba que daily_stats.calories_consumed
+coincide con la suma del registro.
+
+    python benchmarks/nutrition_log.py --users 10000 --days 365
+"""
+import argparse
+import datetime
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.intake import ingest
+from fithome.models import MEAL_TYPES
+from fithome.storage import FoodLogEntry, SQLiteBackend, WriteBatch
+
+def synthetic_entries(users: int, days: int, seed: int = 23):
+    # Por usuario y día, entre 3 y 5 comidas; una de cada 5 personalizada
+    rng = random.Random(seed)
+    start = datetime.date(2026, 1, 1) - datetime.timedelta(days=days)
+    for user_id in range(1, users + 1):
+        for offset in range(days):
+            day = start + datetime.timedelta(days=offset)
+            for meal_type, *_ in rng.sample(MEAL_TYPES, rng.randrange(3, 6)):
+                if rng.random() < 0.2:
+                    calories = rng.randrange(100, 900)
+                    yield FoodLogEntry(user_id, day, meal_type, calories, custom_meal_name="Comida libre",
+                                       custom_calories=calories)
+                else:
+                    yield FoodLogEntry(user_id, day, meal_type, rng.randrange(80, 700), meal_id=rng.randrange(1, 23))
+
+def create_users(backend: SQLiteBackend, users: int):
+    with backend.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO users (user_id, name, email, password_hash) VALUES (?, ?, ?, '')",
+            [(user_id, f"u{user_id}", f"u{user_id}@example.com") for user_id in range(1, users + 1)]
+        )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--sample-users", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteBackend(Path(tmp) / "intake.db")
+        create_users(backend, args.users)
+
+        started = time.perf_counter()
+        entries = ingest(synthetic_entries(args.users, args.days), backend)
+        elapsed = time.perf_counter() - started
+        print(f"{entries} entradas de {args.users} usuarios en {args.days} días: {elapsed:.1f} s "
+              f"({entries / elapsed:,.0f} entradas/s)")
+
+        with backend.pool.connection() as conn:
+            logged = conn.execute("SELECT SUM(calories_consumed) FROM user_nutrition_log").fetchone()[0]
+            consumed = conn.execute("SELECT SUM(calories_consumed) FROM daily_stats").fetchone()[0]
+            mismatched = conn.execute(
+                """
+                SELECT COUNT(*) FROM daily_stats d
+                JOIN (SELECT user_id, date, SUM(calories_consumed) AS kcal FROM user_nutrition_log
+                      GROUP BY user_id, date) l ON l.user_id = d.user_id AND l.date = d.stat_date
+                WHERE l.kcal <> d.calories_consumed
+                """
+            ).fetchone()[0]
+        print(f"kcal en el registro: {logged}, en daily_stats: {consumed}, días distintos: {mismatched}")
+
+        # Referencia: una transacción por entrada sobre una muestra de usuarios
+        sample = list(synthetic_entries(args.sample_users, args.days, seed=99))
+        for entry in sample:
+            entry.user_id = entry.user_id % args.users + 1
+        started = time.perf_counter()
+        for entry in sample:
+            backend.apply(WriteBatch(food=[entry]))
+        per_entry = (time.perf_counter() - started) / len(sample)
+        print(f"\nuna transacción por entrada: {1 / per_entry:,.0f} entradas/s")
+        print(f"10k usuarios x 365 días (~{4 * 365 * 10_000:,} entradas): "
+              f"por bloques ~{4 * 365 * 10_000 / (entries / elapsed) / 60:.1f} min, "
+              f"por entrada ~{4 * 365 * 10_000 * per_entry / 3600:.1f} h")
+        backend.pool.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Latencia del recomendador (fithome.recommend) con un catálogo grande.
+
+Mide el top-k de un usuario (pestaña de inicio) y el rendimiento del
+precálculo por bloques de usuarios sobre un catálogo sintético; con
+--legacy compara contra puntuar con un bucle de Python y ordenar todo.
+
+    python benchmarks/recommendations.py --items 100000 --users 2000
+"""
+import argparse
+import dataclasses
+import datetime
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.catalog import get_catalog
+from fithome.models import UserProfile
+from fithome.ratings import RatingAggregate
+from fithome.recommend import GOAL_CATEGORIES, WorkoutFeatures, preferences_for
+
+CATEGORIES = ("Cardio", "Fuerza", "Flexibilidad", "Core")
+LEVELS = ("Principiante", "Intermedio", "Avanzado")
+USER_LEVELS = ("principiante", "intermedio", "avanzado", "")
+
+def synthetic_catalog(count: int, rng: random.Random):
+    base = get_catalog().workouts
+    workouts = [
+        dataclasses.replace(
+            base[i % len(base)],
+            id=i + 1,
+            category=rng.choice(CATEGORIES),
+            level=rng.choice(LEVELS),
+            rating=round(rng.uniform(3.5, 5.0), 1),
+            completions=rng.randrange(0, 5000),
+        )
+        for i in range(count)
+    ]
+    ratings = {
+        workout.id: RatingAggregate(count * 4, count)
+        for workout in rng.sample(workouts, count // 10)
+        for count in (rng.randrange(1, 50),)
+    }
+    return workouts, ratings
+
+def synthetic_users(count: int, items: int, rng: random.Random):
+    now = datetime.datetime.now()
+    goals = list(GOAL_CATEGORIES)
+    return [
+        preferences_for(
+            user_id,
+            UserProfile(fitness_level=rng.choice(USER_LEVELS), goals=rng.sample(goals, rng.randrange(0, 3))),
+            [(rng.randrange(1, items + 1), now - datetime.timedelta(days=rng.uniform(0, 28)))
+             for _ in range(rng.randrange(0, 12))],
+            now,
+        )
+        for user_id in range(1, count + 1)
+    ]
+
+def legacy_top_k(features, user, k):
+    # Referencia: puntuar registro a registro y ordenar el catálogo entero
+    scores = features.scores([user])[0].tolist()
+    return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:k]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--batch-users", type=int, default=64)
+    parser.add_argument("--legacy", action="store_true")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    workouts, ratings = synthetic_catalog(args.items, rng)
+    started = time.perf_counter()
+    features = WorkoutFeatures(workouts, ratings)
+    print(f"vectores de {args.items} entrenamientos en {time.perf_counter() - started:.2f} s")
+    users = synthetic_users(args.users, args.items, rng)
+
+    samples = []
+    for user in users[:200]:
+        started = time.perf_counter()
+        features.top_k([user], args.top)
+        samples.append(time.perf_counter() - started)
+    print(f"top-{args.top} de un usuario: mediana {statistics.median(samples) * 1000:.2f} ms, "
+          f"máx {max(samples) * 1000:.2f} ms")
+
+    if args.legacy:
+        samples = []
+        for user in users[:20]:
+            started = time.perf_counter()
+            legacy_top_k(features, user, args.top)
+            samples.append(time.perf_counter() - started)
+        print(f"orden completo en Python: mediana {statistics.median(samples) * 1000:.2f} ms")
+
+    started = time.perf_counter()
+    for start in range(0, len(users), args.batch_users):
+        features.top_k(users[start:start + args.batch_users], args.top)
+    elapsed = time.perf_counter() - started
+    print(f"precálculo de {len(users)} usuarios en bloques de {args.batch_users}: "
+          f"{elapsed:.2f} s ({len(users) / elapsed:.0f} usuarios/s)")
+
+if __name__ == "__main__":
+    main()
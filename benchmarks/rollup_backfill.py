@@ -0,0 +1,114 @@
+"""Reconstrucción de activity_rollups (fithome.rollups) sobre años de historial.
+
+Crea una base SQLite temporal con sesiones sintéticas repartidas en varios
+años, mide la reconstrucción por bloques (tiempo y pico de memoria con
+distintos --max-buckets) y compara la lectura de la semana y el mes desde
+los cubos con el GROUP BY equivalente sobre daily_stats.
+
+    python benchmarks/rollup_backfill.py --sessions 500000 --users 2000
+"""
+import argparse
+import datetime
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.rollups import DAY, MONTH, WEEK, period_start
+from fithome.storage import SQLiteBackend
+
+def populate(backend: SQLiteBackend, sessions: int, users: int, years: int, seed: int = 5):
+    rng = random.Random(seed)
+    start = datetime.datetime(2026, 1, 1) - datetime.timedelta(days=365 * years)
+    span_hours = 365 * years * 24
+    with backend.transaction() as conn:
+        conn.executemany(
+            "INSERT INTO users (user_id, name, email, password_hash) VALUES (?, ?, ?, '')",
+            [(user_id, f"u{user_id}", f"u{user_id}@example.com") for user_id in range(1, users + 1)]
+        )
+        rows = []
+        for _ in range(sessions):
+            at = (start + datetime.timedelta(hours=rng.randrange(span_hours))).isoformat(sep=' ')
+            rows.append((rng.randrange(1, users + 1), rng.randrange(1, 6), at, at, rng.randrange(50, 400), rng.randrange(10, 60)))
+        conn.executemany(
+            """
+            INSERT INTO workout_sessions (
+                user_id, workout_id, started_at, completed_at, calories_burned, duration_minutes, is_completed
+            ) VALUES (?, ?, ?, ?, ?, ?, 1)
+            """,
+            rows
+        )
+        conn.execute(
+            """
+            INSERT INTO daily_stats (user_id, stat_date, workouts_completed, total_exercise_minutes, calories_burned)
+            SELECT user_id, date(completed_at), COUNT(*), SUM(duration_minutes), SUM(calories_burned)
+            FROM workout_sessions GROUP BY user_id, date(completed_at)
+            """
+        )
+
+def timed(function, repeat: int = 200) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=500_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--years", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteBackend(Path(tmp) / "rollups.db")
+        populate(backend, args.sessions, args.users, args.years)
+        print(f"{args.sessions} sesiones de {args.users} usuarios en {args.years} años\n")
+
+        print(f"{'max_buckets':>12} {'segundos':>9} {'pico MiB':>9}")
+        for max_buckets in (1_000, 20_000, 10_000_000):
+            # Tiempo y memoria en pasadas separadas: tracemalloc ralentiza
+            started = time.perf_counter()
+            backend.rebuild_rollups(max_buckets=max_buckets)
+            elapsed = time.perf_counter() - started
+            tracemalloc.start()
+            backend.rebuild_rollups(max_buckets=max_buckets)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{max_buckets:>12} {elapsed:>9.2f} {peak / 2**20:>9.1f}")
+
+        today = datetime.date(2025, 12, 17)
+        week, month = period_start(WEEK, today), period_start(MONTH, today)
+        user_id = args.users // 2
+
+        def from_rollups():
+            backend.load_rollups(user_id, DAY, week, week + datetime.timedelta(days=6))
+            backend.load_rollups(user_id, MONTH, month, month)
+
+        def from_daily_stats():
+            with backend.pool.connection() as conn:
+                conn.execute(
+                    """
+                    SELECT stat_date, SUM(total_exercise_minutes) FROM daily_stats
+                    WHERE user_id = ? AND stat_date BETWEEN ? AND ? GROUP BY stat_date
+                    """,
+                    (user_id, week.isoformat(), (week + datetime.timedelta(days=6)).isoformat())
+                ).fetchall()
+                conn.execute(
+                    """
+                    SELECT strftime('%Y-%m', stat_date), SUM(workouts_completed), SUM(total_exercise_minutes),
+                           SUM(calories_burned)
+                    FROM daily_stats WHERE user_id = ? GROUP BY strftime('%Y-%m', stat_date)
+                    """,
+                    (user_id,)
+                ).fetchall()
+
+        print(f"\nsemana + mes desde activity_rollups: {timed(from_rollups):.0f} µs")
+        print(f"semana + meses agrupando daily_stats: {timed(from_daily_stats):.0f} µs")
+        backend.pool.close()
+
+if __name__ == "__main__":
+    main()
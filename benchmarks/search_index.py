@@ -0,0 +1,85 @@
+"""Latencia del índice de búsqueda (fithome.search) con un catálogo grande.
+
+Genera un catálogo sintético de entrenamientos a partir de los del CSV
+(variando categoría, nivel, duración, calorías y nombre), construye el
+índice y mide consultas combinadas con paginación.
+
+    python benchmarks/search_index.py --items 100000
+"""
+import argparse
+import dataclasses
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.catalog import get_catalog
+from fithome.search import build_workout_index
+
+CATEGORIES = ("Cardio", "Fuerza", "Flexibilidad", "Core", "HIIT", "Rehabilitación")
+LEVELS = ("Principiante", "Intermedio", "Avanzado")
+WORDS = ("express", "matutino", "total", "intenso", "suave", "funcional", "quema", "core", "piernas", "brazos")
+
+QUERIES = {
+    "categoría": dict(facets={'category': 'Cardio'}),
+    "categoría+nivel": dict(facets={'category': ['Cardio', 'HIIT'], 'level': 'Intermedio'}),
+    "duración+calorías": dict(ranges={'duration': (15, 25), 'calories': (150, 250)}),
+    "texto": dict(text="quem"),
+    "todo combinado": dict(
+        facets={'category': 'Fuerza', 'level': ['Intermedio', 'Avanzado']},
+        ranges={'duration': (20, 40)},
+        text="total",
+    ),
+}
+
+def synthetic_workouts(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    base = get_catalog().workouts
+    workouts = []
+    for i in range(count):
+        template = base[i % len(base)]
+        minutes = rng.randrange(5, 61, 5)
+        low = rng.randrange(50, 400, 10)
+        workouts.append(dataclasses.replace(
+            template,
+            id=i + 1,
+            name=f"{template.name} {rng.choice(WORDS)} {i}",
+            category=rng.choice(CATEGORIES),
+            level=rng.choice(LEVELS),
+            duration_minutes=minutes,
+            calories_min=low,
+            calories_max=low + rng.randrange(20, 80, 10),
+        ))
+    return workouts
+
+def timed(function, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1e6, max(samples) * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    workouts = synthetic_workouts(args.items)
+    started = time.perf_counter()
+    index = build_workout_index(workouts)
+    print(f"índice de {args.items} entrenamientos construido en {time.perf_counter() - started:.2f} s\n")
+
+    print(f"{'consulta':<20} {'resultados':>10} {'mediana µs':>11} {'máx µs':>9} {'pág. 50 µs':>11}")
+    for name, query in QUERIES.items():
+        mask = index.query(**query)
+        median, worst = timed(lambda: index.search(page=0, page_size=20, **query), args.repeat)
+        deep, _ = timed(lambda: index.page(mask, page=50, page_size=20), args.repeat)
+        print(f"{name:<20} {mask.bit_count():>10} {median:>11.1f} {worst:>9.1f} {deep:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""Prueba de carga: sesiones por worker de la pantalla de carga, con y sin time.sleep.
+
+Simula un worker de Streamlit con un número fijo de hilos de script y
+usuarios concurrentes que abren la aplicación una y otra vez hasta llegar
+a la pantalla de acceso. El modo ``legacy`` ejecuta la pantalla de carga
+anterior (``time.sleep(2)`` y ``st.rerun()``); el modo ``async`` ejecuta
+fithome.screens.loading.loading_screen con fithome.warmup real: cada
+ejecución del script vuelve enseguida y el fragmento de espera se
+reprograma cada ``run_every`` segundos sin ocupar un hilo entretanto.
+
+Las pantallas se llaman con un ``st`` mínimo (markdown, session_state,
+rerun y fragment) en lugar de Streamlit, así que mide el tiempo que cada
+flujo retiene los hilos de script y no el coste de dibujar.
+
+    python benchmarks/session_load.py --threads 8 --users 64 --seconds 10
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+LEGACY_SLEEP = 2.0
+
+class Rerun(Exception):
+    pass
+
+class StubStreamlit(types.ModuleType):
+    # Lo que usan las pantallas de carga; la sesión es la del hilo actual
+    def __init__(self):
+        super().__init__("streamlit")
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        return self._local.session
+
+    @session.setter
+    def session(self, session):
+        self._local.session = session
+
+    @property
+    def session_state(self):
+        return self.session.state
+
+    def markdown(self, *args, **kwargs):
+        pass
+
+    def error(self, *args, **kwargs):
+        pass
+
+    def button(self, *args, **kwargs):
+        return False
+
+    def rerun(self, scope="app"):
+        raise Rerun(scope)
+
+    def fragment(self, run_every=None):
+        # Se ejecuta en la pasada del script y después cada run_every
+        def decorator(function):
+            def run(*args, **kwargs):
+                self.session.fragment = (function, run_every)
+                return function(*args, **kwargs)
+            return run
+        return decorator
+
+st = StubStreamlit()
+sys.modules["streamlit"] = st
+
+from fithome.screens.loading import loading_screen
+
+# Pantalla de carga anterior (fitness_app.py antes de fithome.warmup)
+def legacy_loading_screen():
+    st.markdown("💪 FitHome Pro", unsafe_allow_html=True)
+    time.sleep(LEGACY_SLEEP)
+    st.session_state.current_screen = 'auth'
+    st.rerun()
+
+class Worker:
+    def __init__(self, threads: int, seconds: float):
+        self.pool = ThreadPoolExecutor(max_workers=threads)
+        self.deadline = time.perf_counter() + seconds
+        self.sessions = 0
+        self.completed = 0
+        self.script_runs = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+        self._idle = threading.Event()
+        self._running = 0
+
+    def submit(self, run, *args, delay: float = 0.0):
+        if time.perf_counter() >= self.deadline:
+            return
+        with self._lock:
+            self._running += 1
+        if delay:
+            threading.Timer(delay, self.pool.submit, (self._wrap, run, *args)).start()
+        else:
+            self.pool.submit(self._wrap, run, *args)
+
+    def _wrap(self, run, *args):
+        started = time.perf_counter()
+        try:
+            run(self, *args)
+        finally:
+            with self._lock:
+                self.busy_seconds += time.perf_counter() - started
+                self.script_runs += 1
+                self._running -= 1
+                if not self._running:
+                    self._idle.set()
+
+    def wait(self):
+        self._idle.wait()
+        self.pool.shutdown()
+
+def new_session(screen):
+    return types.SimpleNamespace(state=types.SimpleNamespace(current_screen='loading'), fragment=None, screen=screen)
+
+def script_run(worker: Worker, session, script):
+    # Una ejecución del script (o del fragmento) en un hilo del worker
+    st.session = session
+    if script is session.screen:
+        # Una ejecución completa vuelve a registrar el fragmento
+        session.fragment = None
+    try:
+        script()
+    except Rerun:
+        if session.state.current_screen == 'auth':
+            # sessions: las terminadas dentro del tiempo medido
+            with worker._lock:
+                worker.completed += 1
+                worker.sessions += time.perf_counter() < worker.deadline
+            session = new_session(session.screen)
+        worker.submit(script_run, session, session.screen)
+        return
+    if session.fragment is not None:
+        function, run_every = session.fragment
+        worker.submit(script_run, session, function, delay=run_every or 0.0)
+
+def run(screen, threads: int, users: int, seconds: float) -> Worker:
+    worker = Worker(threads, seconds)
+    for _ in range(users):
+        worker.submit(script_run, new_session(screen), screen)
+    worker.wait()
+    return worker
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8, help="hilos de script del worker")
+    parser.add_argument("--users", type=int, default=64, help="usuarios concurrentes")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duración de cada modo")
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="fithome-bench-")
+    os.environ.setdefault("FITHOME_DB_PATH", os.path.join(workdir, "fithome.db"))
+    os.environ.setdefault("FITHOME_JOURNAL_PATH", os.path.join(workdir, "fithome.journal"))
+
+    print(f"{args.threads} hilos, {args.users} usuarios, {args.seconds:g} s por modo\n")
+    print(f"{'modo':<8} {'sesiones':>9} {'sesiones/s':>11} {'ejecuciones':>12} {'hilo·s por sesión':>18}")
+    for mode, screen in (("legacy", legacy_loading_screen), ("async", loading_screen)):
+        worker = run(screen, args.threads, args.users, args.seconds)
+        per_session = worker.busy_seconds / worker.completed if worker.completed else float("nan")
+        print(f"{mode:<8} {worker.sessions:>9} {worker.sessions / args.seconds:>11.1f} "
+              f"{worker.script_runs:>12} {per_session:>18.4f}")
+
+if __name__ == "__main__":
+    main()
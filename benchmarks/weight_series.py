@@ -0,0 +1,73 @@
+"""Consultas de la serie de peso (fithome.bodyweight) con años de lecturas.
+
+Genera lecturas diarias sintéticas y mide la carga, las consultas que usa
+la pestaña de progreso (tendencia de 30 días, gráfica reducida con su media
+de 7 días) y, como referencia, la misma tendencia recorriendo la lista.
+
+    python benchmarks/weight_series.py --years 10
+"""
+import argparse
+import datetime
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fithome.bodyweight import WeightSeries
+
+# Los de fithome/screens/stats.py
+CHART_POINTS = 120
+TREND_DAYS = 30
+
+def synthetic_readings(years: int, seed: int = 11):
+    rng = random.Random(seed)
+    start = datetime.date(2026, 1, 1) - datetime.timedelta(days=365 * years)
+    kg = 85.0
+    readings = []
+    for offset in range(365 * years):
+        kg += rng.gauss(-0.005, 0.15)
+        readings.append((start + datetime.timedelta(days=offset), round(kg, 1)))
+    return readings
+
+def naive_trend(readings, start):
+    window = [(day.toordinal(), kg) for day, kg in readings if day >= start]
+    xs = [x for x, _ in window]
+    ys = [y for _, y in window]
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    return sum((x - mx) * (y - my) for x, y in window) / sum((x - mx) ** 2 for x in xs) * 7
+
+def timed(function, repeat: int = 200) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=10)
+    args = parser.parse_args()
+
+    readings = synthetic_readings(args.years)
+    started = time.perf_counter()
+    series = WeightSeries(readings)
+    print(f"{len(series)} lecturas cargadas en {(time.perf_counter() - started) * 1e3:.1f} ms\n")
+
+    day = series.latest()[0]
+    since = day - datetime.timedelta(days=TREND_DAYS)
+
+    def chart():
+        points = series.downsample(CHART_POINTS)
+        return [series.mean(point - datetime.timedelta(days=6), point) for point, _ in points]
+
+    print(f"tendencia {TREND_DAYS} días:        {timed(lambda: series.trend(start=since)):8.1f} µs")
+    print(f"tendencia recorriendo la lista: {timed(lambda: naive_trend(readings, since), 20):8.1f} µs")
+    print(f"tendencia de toda la serie:     {timed(lambda: series.trend()):8.1f} µs")
+    print(f"gráfica ({CHART_POINTS} puntos + media):  {timed(chart):8.1f} µs")
+    print(f"media móvil del último año:     {timed(lambda: series.moving_average(7, start=day - datetime.timedelta(days=365)), 20):8.1f} µs")
+    print(f"lectura nueva (append):         {timed(lambda: series.append(day, 80.0), 1000):8.2f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,2 @@
+# Paquete de soporte de FitHome Pro: catálogo, persistencia y servicios
+# compartidos por las pantallas de fitness_app.py.
@@ -0,0 +1,67 @@
+import bisect
+import logging
+from dataclasses import dataclass
+from typing import Collection, Dict, Iterable, List, Mapping, Optional, Set
+
+# Motor de logros guiado por las filas de la tabla achievements. Cada regla
+# se indexa por el contador que observa (entrenamientos, calorías o racha)
+# y, dentro de él, por umbral; evaluar un evento solo mira los contadores
+# que cambiaron y las reglas cuyo umbral ya se alcanzó. Como compara con
+# >= y no con igualdades, un evento perdido no impide desbloquear después.
+
+logger = logging.getLogger(__name__)
+
+WORKOUTS = "workouts"
+CALORIES = "calories"
+STREAK = "streak"
+
+# (requirement_type, requirement_unit) -> contador observado
+COUNTERS = {
+    ("count", "workouts"): WORKOUTS,
+    ("count", "calories"): CALORIES,
+    ("streak", "days"): STREAK,
+}
+
+@dataclass(frozen=True, slots=True)
+class AchievementRule:
+    achievement_id: int
+    name: str
+    requirement_type: str
+    requirement_value: int
+    requirement_unit: str
+
+    @property
+    def counter(self) -> Optional[str]:
+        return COUNTERS.get((self.requirement_type, self.requirement_unit))
+
+class AchievementEngine:
+    def __init__(self, rules: Iterable[AchievementRule]):
+        self.rules = tuple(rules)
+        self._by_name = {rule.name: rule for rule in self.rules}
+        self._thresholds: Dict[str, List[int]] = {}
+        self._rules_by_counter: Dict[str, List[AchievementRule]] = {}
+
+        for rule in sorted(self.rules, key=lambda r: r.requirement_value):
+            if rule.counter is None:
+                logger.info("Logro %r sin contador soportado (%s/%s); se ignora",
+                            rule.name, rule.requirement_type, rule.requirement_unit)
+                continue
+            self._thresholds.setdefault(rule.counter, []).append(rule.requirement_value)
+            self._rules_by_counter.setdefault(rule.counter, []).append(rule)
+
+    def evaluate(self, progress: Mapping[str, int], unlocked: Collection[int],
+                 changed: Optional[Iterable[str]] = None) -> List[AchievementRule]:
+        # Reglas recién alcanzadas entre los contadores que cambiaron
+        newly_unlocked = []
+        for counter in (progress if changed is None else changed):
+            thresholds = self._thresholds.get(counter)
+            if not thresholds:
+                continue
+            reached = bisect.bisect_right(thresholds, progress[counter])
+            for rule in self._rules_by_counter[counter][:reached]:
+                if rule.achievement_id not in unlocked:
+                    newly_unlocked.append(rule)
+        return newly_unlocked
+
+    def unlocked_ids(self, names: Iterable[str]) -> Set[int]:
+        return {self._by_name[name].achievement_id for name in names if name in self._by_name}
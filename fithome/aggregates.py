@@ -0,0 +1,43 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+# Totales por usuario materializados en user_stats_summary. Se actualizan en
+# la misma transacción que registra las sesiones, así que leerlos cuesta lo
+# mismo con 10 o con 10.000 entrenamientos en el historial.
+
+@dataclass(frozen=True, slots=True)
+class UserTotals:
+    total_workouts: int = 0
+    total_calories: int = 0
+    total_minutes: int = 0
+    total_achievements: int = 0
+
+class AggregateCache:
+    # Caché compartida por todas las sesiones del proceso. Quien escribe
+    # sobre un usuario debe invalidarlo explícitamente después del commit.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[int, UserTotals] = {}
+        self._generation = 0
+
+    def get(self, user_id: int, loader: Callable[[int], UserTotals]) -> UserTotals:
+        totals = self._totals.get(user_id)
+        if totals is None:
+            generation = self._generation
+            totals = loader(user_id)
+            with self._lock:
+                # Si hubo una invalidación durante la lectura, el valor
+                # leído puede estar desactualizado: no se guarda
+                if generation == self._generation:
+                    self._totals[user_id] = totals
+        return totals
+
+    def invalidate(self, user_ids: Optional[Iterable[int]] = None):
+        with self._lock:
+            self._generation += 1
+            if user_ids is None:
+                self._totals.clear()
+                return
+            for user_id in user_ids:
+                self._totals.pop(user_id, None)
@@ -0,0 +1,131 @@
+import datetime
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable, List, Optional, Tuple
+
+# Serie temporal del peso (body_measurements) para "Registrar Peso" y la
+# gráfica de la pestaña de progreso. Columnas en array: días (ordinal de la
+# fecha) y kg, en orden cronológico, más sumas prefijas de x, x², y y x·y
+# con x = días desde la primera lectura. Con ellas la media de cualquier
+# intervalo, la media móvil de cada punto y la pendiente de mínimos
+# cuadrados salen en O(log n) por consulta, tras dos bisect, aunque haya
+# años de lecturas diarias.
+#
+# Las lecturas nuevas se añaden al final; una lectura con fecha anterior a
+# la última (carga atrasada) se inserta en su sitio y recalcula las sumas
+# desde ahí.
+
+Reading = Tuple[datetime.date, float]
+
+class WeightSeries:
+    def __init__(self, readings: Iterable[Reading] = ()):
+        self.days = array('l')
+        self.values = array('d')
+        self._sum_x = array('d', [0.0])
+        self._sum_xx = array('d', [0.0])
+        self._sum_y = array('d', [0.0])
+        self._sum_xy = array('d', [0.0])
+        for day, kg in readings:
+            self.append(day, kg)
+
+    def __len__(self):
+        return len(self.days)
+
+    def __bool__(self):
+        return bool(self.days)
+
+    def append(self, day: datetime.date, kg: float):
+        ordinal = day.toordinal()
+        if self.days and ordinal < self.days[-1]:
+            position = bisect_right(self.days, ordinal)
+            self.days.insert(position, ordinal)
+            self.values.insert(position, kg)
+            # position 0 es un nuevo origen de x: cambian todas las sumas
+            self._truncate(position)
+            for index in range(position, len(self.days)):
+                self._push(self.days[index], self.values[index])
+            return
+        self.days.append(ordinal)
+        self.values.append(kg)
+        self._push(ordinal, kg)
+
+    def _truncate(self, length: int):
+        # Deja las sumas de las `length` primeras lecturas
+        for sums in (self._sum_x, self._sum_xx, self._sum_y, self._sum_xy):
+            del sums[length + 1:]
+
+    def _push(self, ordinal: int, kg: float):
+        x = ordinal - self.days[0]
+        self._sum_x.append(self._sum_x[-1] + x)
+        self._sum_xx.append(self._sum_xx[-1] + x * x)
+        self._sum_y.append(self._sum_y[-1] + kg)
+        self._sum_xy.append(self._sum_xy[-1] + x * kg)
+
+    def latest(self) -> Optional[Reading]:
+        if not self.days:
+            return None
+        return datetime.date.fromordinal(self.days[-1]), self.values[-1]
+
+    def _span(self, start: Optional[datetime.date], end: Optional[datetime.date]) -> Tuple[int, int]:
+        # Posiciones [lo, hi) de las lecturas entre start y end (incluidos)
+        lo = bisect_left(self.days, start.toordinal()) if start else 0
+        hi = bisect_right(self.days, end.toordinal()) if end else len(self.days)
+        return lo, max(lo, hi)
+
+    def _mean(self, lo: int, hi: int) -> float:
+        return (self._sum_y[hi] - self._sum_y[lo]) / (hi - lo)
+
+    def between(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None) -> List[Reading]:
+        lo, hi = self._span(start, end)
+        return [(datetime.date.fromordinal(self.days[i]), self.values[i]) for i in range(lo, hi)]
+
+    def mean(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None) -> Optional[float]:
+        lo, hi = self._span(start, end)
+        return self._mean(lo, hi) if hi > lo else None
+
+    def moving_average(self, window_days: int = 7, start: Optional[datetime.date] = None,
+                       end: Optional[datetime.date] = None) -> List[Reading]:
+        # Para cada lectura del intervalo, la media de las lecturas de los
+        # `window_days` días que terminan en ella
+        lo, hi = self._span(start, end)
+        averages = []
+        for i in range(lo, hi):
+            first = bisect_right(self.days, self.days[i] - window_days, 0, i + 1)
+            last = bisect_right(self.days, self.days[i], i)
+            averages.append((datetime.date.fromordinal(self.days[i]), self._mean(first, last)))
+        return averages
+
+    def trend(self, start: Optional[datetime.date] = None, end: Optional[datetime.date] = None) -> Optional[float]:
+        # Pendiente de mínimos cuadrados en kg por semana; None con menos de
+        # dos días distintos
+        lo, hi = self._span(start, end)
+        n = hi - lo
+        if n < 2:
+            return None
+        sx = self._sum_x[hi] - self._sum_x[lo]
+        sxx = self._sum_xx[hi] - self._sum_xx[lo]
+        sy = self._sum_y[hi] - self._sum_y[lo]
+        sxy = self._sum_xy[hi] - self._sum_xy[lo]
+        denominator = n * sxx - sx * sx
+        if denominator <= 0:
+            return None
+        return (n * sxy - sx * sy) / denominator * 7
+
+    def downsample(self, max_points: int, start: Optional[datetime.date] = None,
+                   end: Optional[datetime.date] = None) -> List[Reading]:
+        # Como mucho `max_points` puntos para la gráfica: el intervalo se
+        # parte en tramos de igual duración y cada tramo con lecturas aporta
+        # su media (fechada en su última lectura)
+        lo, hi = self._span(start, end)
+        if hi - lo <= max_points:
+            return self.between(start, end)
+        first, last = self.days[lo], self.days[hi - 1]
+        width = (last - first + 1) / max_points
+        points = []
+        bucket_lo = lo
+        for bucket in range(1, max_points + 1):
+            bucket_hi = hi if bucket == max_points else bisect_left(self.days, first + bucket * width, bucket_lo, hi)
+            if bucket_hi > bucket_lo:
+                points.append((datetime.date.fromordinal(self.days[bucket_hi - 1]), self._mean(bucket_lo, bucket_hi)))
+                bucket_lo = bucket_hi
+        return points
@@ -0,0 +1,214 @@
+import datetime
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+from fithome.models import UserProfile, Workout
+from fithome.telemetry import ExerciseDetail
+
+# Estimación de calorías con METs (Compendium of Physical Activities). Cada
+# ejercicio de data/exercises.csv tiene su MET; las calorías de una sesión
+# son la suma de MET x horas reales de cada fase por el gasto de 1 MET del
+# usuario, que sale de su peso (y de estatura, edad y género cuando están:
+# metabolismo basal de Mifflin-St Jeor).
+#
+# Una sesión se estima al completarla (complete_workout). Cuando cambia el
+# peso, reestimate_history recalcula todo el historial del usuario en una
+# sola pasada de NumPy: peso vigente en cada sesión con searchsorted, MET x
+# segundos por fila de session_exercise_details y suma por sesión con
+# bincount.
+
+logger = logging.getLogger(__name__)
+
+# 1 MET = 3.5 ml O2/kg/min y 5 kcal por litro de O2 -> 1.05 kcal/kg/h
+KCAL_PER_KG_HOUR = 1.05
+DEFAULT_WEIGHT_KG = 70.0
+# Ejercicio sin MET en el catálogo y descanso entre ejercicios
+DEFAULT_MET = 5.0
+REST_MET = 1.5
+# Ejercicios por series sin tiempo medido
+SECONDS_PER_REP = 3
+
+# Constante de Mifflin-St Jeor por género (sin género: la media)
+_BMR_GENDER_OFFSET = {'masculino': 5.0, 'femenino': -161.0}
+_BMR_DEFAULT_OFFSET = -78.0
+
+def _positive(value) -> Optional[float]:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+@dataclass(frozen=True, slots=True)
+class BodyProfile:
+    weight_kg: float = DEFAULT_WEIGHT_KG
+    height_cm: Optional[float] = None
+    age: Optional[float] = None
+    gender: str = ""
+
+    @property
+    def gender_offset(self) -> float:
+        return _BMR_GENDER_OFFSET.get(self.gender, _BMR_DEFAULT_OFFSET)
+
+    @property
+    def kcal_per_met_hour(self) -> float:
+        return kcal_per_met_hour(self.weight_kg, self.height_cm, self.age, self.gender_offset)
+
+def kcal_per_met_hour(weight_kg, height_cm: Optional[float], age: Optional[float], gender_offset: float):
+    # Gasto de 1 MET en kcal/h. Admite escalares o arrays de pesos (para el
+    # historial) con la misma fórmula.
+    if height_cm and age:
+        return (10 * weight_kg + 6.25 * height_cm - 5 * age + gender_offset) / 24
+    return KCAL_PER_KG_HOUR * weight_kg
+
+def body_from_profile(profile: UserProfile, weight_kg: Optional[float] = None) -> BodyProfile:
+    # weight_kg: última medición de body_measurements, si la hay
+    return BodyProfile(
+        weight_kg=weight_kg or _positive(profile.weight) or DEFAULT_WEIGHT_KG,
+        height_cm=_positive(profile.height),
+        age=_positive(profile.age),
+        gender=profile.gender,
+    )
+
+def exercise_met(met: Optional[float]) -> float:
+    return met if met else DEFAULT_MET
+
+def planned_met_seconds(workout: Workout) -> float:
+    # MET medio del plan ponderado por tiempo (ejercicio + descanso) por la
+    # duración anunciada: estimación de sesiones sin telemetría
+    met_seconds = 0.0
+    seconds = 0.0
+    for exercise in workout.exercises:
+        work = exercise.work_seconds
+        if work is None:
+            work = (exercise.sets or 0) * (exercise.reps or 0) * SECONDS_PER_REP
+        rest = exercise.rest_seconds or 0
+        met_seconds += exercise_met(exercise.met) * work + REST_MET * rest
+        seconds += work + rest
+    average = met_seconds / seconds if seconds else DEFAULT_MET
+    return average * workout.duration_minutes * 60
+
+def detail_work_seconds(duration_seconds: Optional[int], skipped: bool,
+                        sets_completed: Optional[int], reps_completed: Optional[int]) -> int:
+    # Segundos de ejercicio de una fila de telemetría; las series sin tiempo
+    # medido se estiman por repeticiones
+    if duration_seconds is not None:
+        return duration_seconds
+    if skipped:
+        return 0
+    return (sets_completed or 0) * (reps_completed or 0) * SECONDS_PER_REP
+
+def detail_met_seconds(workout: Workout, detail: ExerciseDetail) -> float:
+    exercise = workout.exercises[detail.exercise_order]
+    work = detail_work_seconds(detail.duration_seconds, detail.skipped, detail.sets_completed, detail.reps_completed)
+    return exercise_met(exercise.met) * work + REST_MET * (detail.rest_seconds or 0)
+
+def session_calories(workout: Workout, details: Sequence[ExerciseDetail], body: BodyProfile) -> int:
+    # Con telemetría, los segundos medidos; sin ella, el plan anunciado
+    if details:
+        met_seconds = sum(detail_met_seconds(workout, detail) for detail in details)
+    else:
+        met_seconds = planned_met_seconds(workout)
+    return round(met_seconds / 3600 * body.kcal_per_met_hour)
+
+# Reestimación del historial (NumPy). `history` es el par de listas de
+# StorageBackend.load_calorie_history: sesiones (session_id, workout_id,
+# fecha, calorías, minutos) y telemetría, solo enteros para convertirla en
+# una matriz de una vez: (session_id, exercise_id o -1, duration_seconds o
+# -1, rest_seconds, skipped, sets_completed, reps_completed).
+def estimate_history(history, catalog_workouts: Iterable[Workout], body: BodyProfile,
+                     weights: Sequence[Tuple[datetime.date, float]]) -> Dict[int, int]:
+    import numpy as np
+
+    sessions, details = history
+    if not sessions:
+        return {}
+    workouts = {workout.id: workout for workout in catalog_workouts}
+
+    # MET por exercise_id
+    mets = {
+        exercise.exercise_id: exercise_met(exercise.met)
+        for workout in workouts.values() for exercise in workout.exercises
+        if exercise.exercise_id is not None
+    }
+    met_table = np.full(max(mets, default=0) + 1, DEFAULT_MET)
+    for exercise_id, met in mets.items():
+        met_table[exercise_id] = met
+
+    session_ids = np.fromiter((row[0] for row in sessions), dtype=np.int64, count=len(sessions))
+    days = np.fromiter((row[2].toordinal() for row in sessions), dtype=np.int64, count=len(sessions))
+    old_calories = np.fromiter((row[3] for row in sessions), dtype=np.int64, count=len(sessions))
+    # Sin telemetría: el plan del entrenamiento, calculado una vez por
+    # workout_id (o DEFAULT_MET x minutos si ya no está en el catálogo)
+    plans = {workout_id: planned_met_seconds(workout) for workout_id, workout in workouts.items()}
+    planned = np.fromiter(
+        (plans.get(row[1], DEFAULT_MET * row[4] * 60) for row in sessions),
+        dtype=np.float64, count=len(sessions)
+    )
+
+    # Peso vigente en cada sesión: la última medición de ese día o
+    # anterior; antes de la primera medición, la primera
+    if weights:
+        measured_days = np.array([day.toordinal() for day, _ in weights], dtype=np.int64)
+        measured_kg = np.array([kg for _, kg in weights], dtype=np.float64)
+        index = np.searchsorted(measured_days, days, side='right') - 1
+        session_kg = measured_kg[np.maximum(index, 0)]
+    else:
+        session_kg = np.full(len(sessions), body.weight_kg)
+    per_met_hour = kcal_per_met_hour(session_kg, body.height_cm, body.age, body.gender_offset)
+
+    # MET x segundos de la telemetría, sumado por sesión
+    measured = np.zeros(len(sessions))
+    has_details = np.zeros(len(sessions), dtype=bool)
+    if details:
+        detail_sessions, exercise_ids, duration, rest, skipped, sets, reps = np.array(details, dtype=np.int64).T
+        order = np.argsort(session_ids)
+        position = order[np.searchsorted(session_ids, detail_sessions, sorter=order)]
+        known = (exercise_ids >= 0) & (exercise_ids < len(met_table))
+        detail_mets = np.where(known, met_table[np.where(known, exercise_ids, 0)], DEFAULT_MET)
+        # Mismas reglas que detail_work_seconds, columna a columna
+        by_reps = np.where(skipped > 0, 0, sets * reps * SECONDS_PER_REP)
+        work = np.where(duration >= 0, duration, by_reps)
+        measured = np.bincount(position, weights=detail_mets * work + REST_MET * rest, minlength=len(sessions))
+        has_details[position] = True
+
+    met_seconds = np.where(has_details, measured, planned)
+    calories = np.rint(met_seconds / 3600 * per_met_hour).astype(np.int64)
+    changed = calories != old_calories
+    return dict(zip(session_ids[changed].tolist(), calories[changed].tolist()))
+
+def reestimate_history(user_id: int, backend=None, catalog=None) -> int:
+    # Recalcula y guarda las calorías de todas las sesiones del usuario;
+    # devuelve cuántas cambiaron
+    from fithome.catalog import get_catalog
+    from fithome.storage import get_backend
+    backend = backend or get_backend()
+    catalog = catalog or get_catalog()
+    profile = backend.load_profile(user_id) or UserProfile()
+    weights = backend.load_weight_history(user_id)
+    body = body_from_profile(profile, weights[-1][1] if weights else None)
+    corrections = estimate_history(backend.load_calorie_history(user_id), catalog.workouts, body, weights)
+    if corrections:
+        backend.apply_calorie_corrections(user_id, corrections)
+    return len(corrections)
+
+# Las reestimaciones tras un cambio de peso se hacen fuera del hilo del
+# script, de una en una
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fithome-calories")
+
+def _reestimate_logged(user_id: int) -> int:
+    try:
+        changed = reestimate_history(user_id)
+    except ImportError:
+        logger.warning("NumPy no está disponible; no se reestiman las calorías del usuario %d", user_id)
+        return 0
+    except Exception:
+        logger.exception("No se pudieron reestimar las calorías del usuario %d", user_id)
+        raise
+    logger.info("Calorías reestimadas para el usuario %d: %d sesiones", user_id, changed)
+    return changed
+
+def schedule_reestimate(user_id: int) -> Future:
+    return _executor.submit(_reestimate_logged, user_id)
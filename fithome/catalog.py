@@ -0,0 +1,181 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Hashable, Optional, Protocol, Tuple
+
+from fithome.models import Ingredient, KidsActivity, Meal, Movie, NutritionPlan, Workout
+
+# Catálogo compartido por todas las sesiones del proceso. Se construye una
+# sola vez y solo se vuelve a cargar cuando cambia la huella (fingerprint)
+# de su fuente de datos.
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+@dataclass(frozen=True, slots=True)
+class Catalog:
+    workouts: Tuple[Workout, ...]
+    kids_activities: Tuple[KidsActivity, ...]
+    movies: Tuple[Movie, ...]
+    nutrition_plans: Tuple[NutritionPlan, ...] = ()
+    ingredients: Tuple[Ingredient, ...] = ()
+    meals: Tuple[Meal, ...] = ()
+    version: Hashable = None
+    _workouts_by_id: Dict[int, Workout] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, '_workouts_by_id', {w.id: w for w in self.workouts})
+
+    def workout(self, workout_id: int) -> Optional[Workout]:
+        return self._workouts_by_id.get(workout_id)
+
+class CatalogSource(Protocol):
+    def fingerprint(self) -> Hashable: ...
+
+    def load(self) -> Catalog: ...
+
+class BuiltinSource:
+    # Contenido incluido en fithome.seed; no cambia durante la vida del proceso
+    VERSION = 1
+
+    def fingerprint(self) -> Hashable:
+        return self.VERSION
+
+    def load(self) -> Catalog:
+        from fithome import seed
+        return Catalog(
+            workouts=seed.WORKOUTS,
+            kids_activities=seed.KIDS_ACTIVITIES,
+            movies=seed.MOVIES,
+            version=self.VERSION
+        )
+
+class CsvSource:
+    # Contenido editable por el equipo de contenidos en data/*.csv. Las
+    # películas no tienen CSV todavía y salen de fithome.seed.
+    FILES = {
+        'workouts': 'datoscsv.csv',
+        'kids_activities': 'kids.csv',
+        'nutrition_plans': 'nutrition.csv',
+        'exercises': 'exercises.csv',
+        'ingredients': 'ingredients.csv',
+        'meals': 'meals.csv',
+        'meal_ingredients': 'meal_ingredients.csv',
+    }
+
+    def __init__(self, data_dir: Path = DATA_DIR):
+        self.data_dir = Path(data_dir)
+
+    def _path(self, key: str) -> Path:
+        return self.data_dir / self.FILES[key]
+
+    def fingerprint(self) -> Hashable:
+        stamps = []
+        for key in self.FILES:
+            try:
+                stat = self._path(key).stat()
+                stamps.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def load(self) -> Catalog:
+        from fithome import csv_loader, seed
+        # Sin data/exercises.csv los ejercicios quedan sin exercise_id ni MET
+        exercises_path = self._path('exercises')
+        exercises = csv_loader.read_exercises(exercises_path) if exercises_path.exists() else {}
+        # Las comidas se arman con sus ingredientes (meal_ingredients.csv)
+        ingredients = self._load(csv_loader.iter_ingredients, 'ingredients', ())
+        ingredient_ids = {ingredient.id for ingredient in ingredients}
+        meal_ingredients_path = self._path('meal_ingredients')
+        meal_ingredients = (
+            csv_loader.read_meal_ingredients(meal_ingredients_path, ingredient_ids)
+            if meal_ingredients_path.exists() else {}
+        )
+        return Catalog(
+            workouts=self._load(lambda path: csv_loader.iter_workouts(path, exercises), 'workouts', seed.WORKOUTS),
+            kids_activities=self._load(csv_loader.iter_kids_activities, 'kids_activities', seed.KIDS_ACTIVITIES),
+            movies=seed.MOVIES,
+            nutrition_plans=self._load(csv_loader.iter_nutrition_plans, 'nutrition_plans', ()),
+            ingredients=ingredients,
+            meals=self._load(lambda path: csv_loader.iter_meals(path, meal_ingredients), 'meals', ()),
+            version=self.fingerprint()
+        )
+
+    def _load(self, reader, key, fallback):
+        path = self._path(key)
+        if not path.exists():
+            logger.warning("%s no existe; se usa el contenido incluido", path)
+            return fallback
+        return tuple(reader(path))
+
+class CatalogCache:
+    # Sólo la primera carga bloquea. Después, si la fuente cambia, se sigue
+    # sirviendo el catálogo actual mientras un hilo construye el nuevo.
+    def __init__(self, source: CatalogSource, check_interval: float = 1.0):
+        self._source = source
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._catalog: Optional[Catalog] = None
+        self._fingerprint: Hashable = None
+        self._checked_at = 0.0
+        self._reloading = False
+
+    def get(self) -> Catalog:
+        catalog = self._catalog
+        if catalog is None:
+            return self._load_blocking()
+
+        now = time.monotonic()
+        if now - self._checked_at >= self._check_interval:
+            self._checked_at = now
+            fingerprint = self._source.fingerprint()
+            if fingerprint != self._fingerprint:
+                self._start_reload(fingerprint)
+        return catalog
+
+    def _load_blocking(self) -> Catalog:
+        with self._lock:
+            # Otra sesión pudo haber cargado mientras esperábamos el lock
+            if self._catalog is None:
+                self._fingerprint = self._source.fingerprint()
+                self._catalog = self._source.load()
+                self._checked_at = time.monotonic()
+            return self._catalog
+
+    def _start_reload(self, fingerprint: Hashable):
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(target=self._reload, args=(fingerprint,), name="catalog-reload", daemon=True).start()
+
+    def _reload(self, fingerprint: Hashable):
+        try:
+            catalog = self._source.load()
+        except Exception:
+            # Se conserva el catálogo anterior; se reintentará con el
+            # próximo cambio de la fuente
+            logger.exception("No se pudo recargar el catálogo")
+            catalog = None
+        with self._lock:
+            if catalog is not None:
+                self._catalog = catalog
+            self._fingerprint = fingerprint
+            self._reloading = False
+
+    def invalidate(self):
+        with self._lock:
+            self._catalog = None
+            self._fingerprint = None
+
+_default_cache = CatalogCache(CsvSource())
+
+def get_catalog() -> Catalog:
+    return _default_cache.get()
+
+def invalidate_catalog():
+    _default_cache.invalidate()
@@ -0,0 +1,116 @@
+import datetime
+import io
+import threading
+from collections import OrderedDict
+from typing import Sequence, Tuple
+
+# Gráficas de la pestaña de progreso. matplotlib se importa la primera vez
+# que hace falta (normalmente desde fithome.warmup, fuera de una petición)
+# y se usa la API orientada a objetos (Figure + FigureCanvasAgg) en vez de
+# pyplot: las figuras no quedan registradas en un estado global y se
+# liberan en cuanto se obtienen los bytes. El resultado se guarda por
+# vector de datos, así que dos usuarios con la misma semana comparten imagen.
+
+WEEK_DAYS = ('L', 'M', 'X', 'J', 'V', 'S', 'D')
+BAR_COLOR = '#667eea'
+
+_backend_lock = threading.Lock()
+_figure_class = None
+_canvas_class = None
+
+def _load_backend():
+    global _figure_class, _canvas_class
+    if _figure_class is None:
+        with _backend_lock:
+            if _figure_class is None:
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                from matplotlib.figure import Figure
+                _canvas_class = FigureCanvasAgg
+                _figure_class = Figure
+    return _figure_class, _canvas_class
+
+class ChartCache:
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._images: "OrderedDict[Tuple, bytes]" = OrderedDict()
+
+    def get(self, key: Tuple):
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+            return image
+
+    def put(self, key: Tuple, image: bytes):
+        with self._lock:
+            self._images[key] = image
+            self._images.move_to_end(key)
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+
+    def __len__(self):
+        return len(self._images)
+
+_cache = ChartCache()
+
+def render_weekly_activity(weekly_progress: Sequence[int], fmt: str = "png") -> bytes:
+    Figure, FigureCanvasAgg = _load_backend()
+    fig = Figure(figsize=(10, 4))
+    try:
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        ax.bar(WEEK_DAYS, list(weekly_progress), color=BAR_COLOR)
+        ax.set_ylabel('Minutos de actividad')
+        ax.set_title('Actividad por día de la semana')
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        # Rompe las referencias entre figura, ejes y artistas para que la
+        # memoria se libere sin esperar al recolector de ciclos
+        fig.clear()
+
+def weekly_activity_chart(weekly_progress: Sequence[int], fmt: str = "png") -> bytes:
+    key = (tuple(weekly_progress), fmt)
+    image = _cache.get(key)
+    if image is None:
+        image = render_weekly_activity(weekly_progress, fmt)
+        _cache.put(key, image)
+    return image
+
+def render_weight_trend(points: Sequence[Tuple[datetime.date, float]],
+                        averages: Sequence[float], fmt: str = "png") -> bytes:
+    Figure, FigureCanvasAgg = _load_backend()
+    fig = Figure(figsize=(10, 4))
+    try:
+        FigureCanvasAgg(fig)
+        ax = fig.subplots()
+        days = [day for day, _ in points]
+        ax.plot(days, [kg for _, kg in points], color=BAR_COLOR, alpha=0.4, marker='.', linewidth=1, label='Registros')
+        ax.plot(days, list(averages), color=BAR_COLOR, linewidth=2, label='Media 7 días')
+        ax.set_ylabel('Peso (kg)')
+        ax.set_title('Evolución del peso')
+        ax.legend(loc='upper right')
+        fig.autofmt_xdate()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=fmt, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+def weight_trend_chart(points: Sequence[Tuple[datetime.date, float]],
+                       averages: Sequence[float], fmt: str = "png") -> bytes:
+    # `points` ya viene reducido (WeightSeries.downsample), así que la clave
+    # de caché y la figura tienen un tamaño acotado
+    key = ('weight', tuple(points), tuple(averages), fmt)
+    image = _cache.get(key)
+    if image is None:
+        image = render_weight_trend(points, averages, fmt)
+        _cache.put(key, image)
+    return image
+
+def warm_up():
+    # Importa matplotlib, carga las fuentes y deja en caché la gráfica vacía
+    # (la que ve un usuario sin actividad esta semana)
+    weekly_activity_chart([0] * len(WEEK_DAYS))
@@ -0,0 +1 @@
+# Componentes personalizados de Streamlit (HTML + JS sin paso de build)
@@ -0,0 +1,66 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import streamlit.components.v1 as components
+
+from fithome.models import Exercise, Workout
+
+# Temporizador de entrenamiento que corre en el navegador. Recibe la lista
+# de fases (ejercicio / descanso) y solo devuelve un valor al servidor en
+# las transiciones: fin de ejercicio, fin de descanso y fin del
+# entrenamiento. "+10s", saltar y la cuenta atrás no provocan reruns.
+
+FRONTEND_DIR = Path(__file__).resolve().parent / "frontend"
+
+_component = components.declare_component("workout_timer", path=str(FRONTEND_DIR))
+
+# Eventos que envía el componente
+EXERCISE_DONE = "exercise_done"
+REST_DONE = "rest_done"
+FINISHED = "finished"
+
+WORK = "work"
+REST = "rest"
+
+# Ejercicios por series ("3x12") no tienen duración (work_seconds es None):
+# la fase queda abierta hasta que el usuario pulsa "Hecho"
+def _work_phase(index: int, exercise: Exercise) -> Dict:
+    return {
+        "kind": WORK,
+        "exercise": index,
+        "name": exercise.name,
+        "detail": exercise.detail,
+        "seconds": exercise.work_seconds,
+    }
+
+def build_phases(workout: Workout) -> List[Dict]:
+    # Sin descanso tras el último ejercicio: su fin es el fin del entrenamiento
+    phases = []
+    last = len(workout.exercises) - 1
+    for index, exercise in enumerate(workout.exercises):
+        phases.append(_work_phase(index, exercise))
+        rest = exercise.rest_seconds
+        if rest and index < last:
+            phases.append({
+                "kind": REST,
+                "exercise": index,
+                "name": "Descanso",
+                "detail": f"Siguiente: {workout.exercises[index + 1].name}",
+                "seconds": rest,
+            })
+    return phases
+
+def workout_timer(workout: Workout, session_id: str, start_exercise: int = 0,
+                  key: Optional[str] = None) -> Optional[Dict]:
+    # Devuelve el último evento recibido ({"seq", "event", "exercise",
+    # "skipped", "extra_seconds", "exercises"}) o None; "exercises" es la
+    # telemetría acumulada (ver fithome.telemetry). El valor se conserva
+    # entre reruns: quien llama debe procesar cada seq una sola vez.
+    return _component(
+        session_id=session_id,
+        phases=build_phases(workout),
+        start_exercise=start_exercise,
+        total_exercises=len(workout.exercises),
+        key=key,
+        default=None,
+    )
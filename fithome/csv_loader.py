@@ -0,0 +1,296 @@
+import csv
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Set, Tuple
+
+from fithome.models import (
+    ALLERGENS, MEAL_TYPES, Exercise, ExerciseInfo, Ingredient, KidsActivity, Meal, MealIngredient, NutritionPlan, Workout
+)
+
+# Lectura en streaming de los CSV de contenido (data/). Cada archivo se
+# recorre fila a fila con csv.DictReader, así que la memoria usada depende
+# del tamaño de una fila y no del archivo completo.
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKOUT_IMAGE = "🏋️"
+DEFAULT_KIDS_IMAGE = "🧸"
+
+_MEAL_TYPE_NAMES = frozenset(meal_type for meal_type, *_ in MEAL_TYPES)
+
+# "Push-ups (3x12; 60s)" -> nombre, detalle (duración o series) y descanso
+_EXERCISE_RE = re.compile(r'^(?P<name>[^()]+?)\s*\((?P<detail>[^;()]+)(?:;\s*(?P<rest>[^;()]+))?\)$')
+# Formato anterior: solo el nombre ("Push-ups"); se le asignan los tiempos
+# por defecto (los 30 s fijos del temporizador original y el descanso más
+# habitual de data/datoscsv.csv)
+_NAME_ONLY_RE = re.compile(r'^[^()]+$')
+DEFAULT_WORK_SECONDS = 30
+DEFAULT_REST_SECONDS = 15
+_SETS_RE = re.compile(r'^(?P<sets>\d+)\s*x\s*(?P<reps>\d+)$', re.IGNORECASE)
+_SECONDS_RE = re.compile(r'^(?P<value>\d+)\s*(?P<unit>s|seg|min)(?P<per_side>\s+cada lado)?$', re.IGNORECASE)
+_MINUTES_RE = re.compile(r'^(?P<value>\d+)\s*min$', re.IGNORECASE)
+_CALORIES_RE = re.compile(r'^(?P<low>\d+)(?:\s*-\s*(?P<high>\d+))?$')
+
+# Límites del validador: fuera de ellos la fila se considera mal formada
+MAX_WORKOUT_MINUTES = 300
+MAX_WORKOUT_CALORIES = 3000
+MAX_RATING = 5.0
+
+# Conversión de los textos del CSV a enteros. Se hace una sola vez al
+# cargar el catálogo; un valor que no encaja lanza ValueError y la fila se
+# descarta.
+def parse_seconds(value: str) -> Tuple[int, bool]:
+    # "45s" -> (45, False), "5 min" -> (300, False), "30s cada lado" -> (30, True)
+    match = _SECONDS_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"duración no válida: {value!r}")
+    seconds = int(match.group('value'))
+    if match.group('unit').lower() == 'min':
+        seconds *= 60
+    return seconds, match.group('per_side') is not None
+
+def parse_minutes(value: str) -> int:
+    # "20 min" -> 20
+    match = _MINUTES_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"duración no válida: {value!r}")
+    return int(match.group('value'))
+
+def parse_calories(value: str) -> Tuple[int, int]:
+    # "180-220" -> (180, 220), "200" -> (200, 200)
+    match = _CALORIES_RE.match(value.strip())
+    if not match:
+        raise ValueError(f"calorías no válidas: {value!r}")
+    low = int(match.group('low'))
+    return low, int(match.group('high') or low)
+
+def split_packed(value: str) -> List[str]:
+    # Separa por comas, respetando las que van entre paréntesis:
+    # "Elige un animal (oso, rana, pájaro), Imita sus movimientos"
+    items = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(value):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(0, depth - 1)
+        elif char == ',' and depth == 0:
+            items.append(value[start:i])
+            start = i + 1
+    items.append(value[start:])
+    return [item.strip() for item in items if item.strip()]
+
+def exercise_key(name: str) -> str:
+    return " ".join(name.lower().split())
+
+def parse_exercise(value: str, exercises: Optional[Mapping[str, ExerciseInfo]] = None) -> Exercise:
+    match = _EXERCISE_RE.match(value)
+    if not match and not _NAME_ONLY_RE.match(value):
+        raise ValueError(f"ejercicio no válido: {value!r}")
+
+    name = (match.group('name') if match else value).strip()
+    info = (exercises or {}).get(exercise_key(name))
+    exercise_id, met = (info.id, info.met) if info else (None, None)
+    if not match:
+        return Exercise(name, duration_seconds=DEFAULT_WORK_SECONDS, rest_seconds=DEFAULT_REST_SECONDS,
+                        exercise_id=exercise_id, met=met)
+    detail = match.group('detail').strip()
+    rest_seconds = parse_seconds(match.group('rest'))[0] if match.group('rest') else None
+    sets = _SETS_RE.match(detail)
+    if sets:
+        return Exercise(name, sets=int(sets.group('sets')), reps=int(sets.group('reps')),
+                        rest_seconds=rest_seconds, exercise_id=exercise_id, met=met)
+    seconds, per_side = parse_seconds(detail)
+    return Exercise(name, duration_seconds=seconds, rest_seconds=rest_seconds, per_side=per_side,
+                    exercise_id=exercise_id, met=met)
+
+def validate_workout(workout: Workout) -> Workout:
+    # Reglas que el resto de la aplicación da por supuestas (p. ej. que
+    # calories_max sirve como calorías quemadas y que todo ejercicio tiene
+    # duración o series)
+    if not workout.name or not workout.level or not workout.category:
+        raise ValueError("faltan nombre, nivel o categoría")
+    if not 0 < workout.duration_minutes <= MAX_WORKOUT_MINUTES:
+        raise ValueError(f"duración fuera de rango: {workout.duration_minutes}")
+    if not 0 < workout.calories_min <= workout.calories_max <= MAX_WORKOUT_CALORIES:
+        raise ValueError(f"calorías fuera de rango: {workout.calories_min}-{workout.calories_max}")
+    if not 0 <= workout.rating <= MAX_RATING:
+        raise ValueError(f"valoración fuera de rango: {workout.rating}")
+    if workout.completions < 0:
+        raise ValueError(f"completados negativo: {workout.completions}")
+    if not workout.exercises:
+        raise ValueError("sin ejercicios")
+    for exercise in workout.exercises:
+        if (exercise.duration_seconds is None) == (exercise.sets is None):
+            raise ValueError(f"{exercise.name}: necesita duración o series")
+        if exercise.duration_seconds is not None and exercise.duration_seconds <= 0:
+            raise ValueError(f"{exercise.name}: duración no válida")
+        if exercise.sets is not None and (exercise.sets <= 0 or not exercise.reps or exercise.reps <= 0):
+            raise ValueError(f"{exercise.name}: series no válidas")
+    return workout
+
+def _iter_rows(path: Path) -> Iterator[Tuple[int, dict]]:
+    with open(path, newline='', encoding='utf-8') as handle:
+        for line_number, row in enumerate(csv.DictReader(handle), start=2):
+            yield line_number, row
+
+def read_exercises(path: Path) -> Dict[str, ExerciseInfo]:
+    # data/exercises.csv indexado por nombre normalizado
+    exercises: Dict[str, ExerciseInfo] = {}
+    for line_number, row in _iter_rows(path):
+        try:
+            met = float(row['met']) if (row.get('met') or '').strip() else None
+            if met is not None and met <= 0:
+                raise ValueError(f"MET no válido: {met}")
+            info = ExerciseInfo(
+                id=int(row['id']),
+                name=row['name'].strip(),
+                muscle_groups=tuple(split_packed(row.get('muscle_groups') or '')),
+                met=met
+            )
+            exercises[exercise_key(info.name)] = info
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            logger.warning("%s:%d: fila de ejercicio ignorada (%s)", path, line_number, exc)
+    return exercises
+
+def iter_workouts(path: Path, exercises: Optional[Mapping[str, ExerciseInfo]] = None) -> Iterator[Workout]:
+    for line_number, row in _iter_rows(path):
+        try:
+            calories_min, calories_max = parse_calories(row['calories'])
+            yield validate_workout(Workout(
+                id=int(row['id']),
+                name=row['name'].strip(),
+                duration_minutes=parse_minutes(row['duration']),
+                level=row['level'].strip(),
+                calories_min=calories_min,
+                calories_max=calories_max,
+                image=(row.get('image') or DEFAULT_WORKOUT_IMAGE).strip(),
+                category=row['category'].strip(),
+                description=row['description'].strip(),
+                exercises=tuple(parse_exercise(item, exercises) for item in split_packed(row['exercises'])),
+                rating=float(row['rating']),
+                completions=int(row['completions'])
+            ))
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            logger.warning("%s:%d: fila de entrenamiento ignorada (%s)", path, line_number, exc)
+
+def iter_kids_activities(path: Path) -> Iterator[KidsActivity]:
+    for line_number, row in _iter_rows(path):
+        try:
+            yield KidsActivity(
+                id=int(row['id']),
+                name=row['name'].strip(),
+                type=row['type'].strip(),
+                duration=row['duration'].strip(),
+                age=row['age'].strip(),
+                image=(row.get('image') or DEFAULT_KIDS_IMAGE).strip(),
+                difficulty=row['difficulty'].strip(),
+                materials=tuple(split_packed(row['materials'])),
+                steps=tuple(split_packed(row['steps'])),
+                benefits=tuple(split_packed(row['benefits'])),
+                adult_supervision=(row.get('adult_supervision') or '0').strip() in ('1', 'true', 'True')
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            logger.warning("%s:%d: fila de actividad ignorada (%s)", path, line_number, exc)
+
+def parse_amount(value: str, field_name: str) -> float:
+    # Valores nutricionales y cantidades: número no negativo ("3.6", "0")
+    amount = float(value)
+    if amount < 0 or amount != amount:
+        raise ValueError(f"{field_name} no válido: {value!r}")
+    return amount
+
+def parse_ids(value: str) -> Tuple[int, ...]:
+    # "28, 38" -> (28, 38)
+    return tuple(int(item) for item in split_packed(value or ''))
+
+def iter_ingredients(path: Path) -> Iterator[Ingredient]:
+    for line_number, row in _iter_rows(path):
+        try:
+            allergens = tuple(split_packed(row.get('allergens') or ''))
+            unknown = [code for code in allergens if code not in ALLERGENS]
+            if unknown:
+                raise ValueError(f"alérgeno desconocido: {unknown[0]!r}")
+            yield Ingredient(
+                id=int(row['id']),
+                name=row['name'].strip(),
+                category=row['category'].strip(),
+                calories=parse_amount(row['calories_per_100g'], 'calories_per_100g'),
+                protein=parse_amount(row['protein'], 'protein'),
+                carbs=parse_amount(row['carbs'], 'carbs'),
+                fat=parse_amount(row['fat'], 'fat'),
+                fiber=parse_amount(row['fiber'], 'fiber'),
+                allergens=allergens
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            logger.warning("%s:%d: fila de ingrediente ignorada (%s)", path, line_number, exc)
+
+def read_meal_ingredients(path: Path, ingredient_ids: Set[int]) -> Dict[int, List[MealIngredient]]:
+    # data/meal_ingredients.csv agrupado por comida; las filas y sustitutos
+    # con ingredientes desconocidos se descartan
+    by_meal: Dict[int, List[MealIngredient]] = {}
+    for line_number, row in _iter_rows(path):
+        try:
+            ingredient_id = int(row['ingredient_id'])
+            if ingredient_id not in ingredient_ids:
+                raise ValueError(f"ingrediente desconocido: {ingredient_id}")
+            grams = parse_amount(row['quantity'], 'quantity')
+            if grams == 0:
+                raise ValueError("cantidad nula")
+            substitutes = parse_ids(row.get('substitutes'))
+            by_meal.setdefault(int(row['meal_id']), []).append(MealIngredient(
+                ingredient_id=ingredient_id,
+                grams=grams,
+                is_optional=(row.get('is_optional') or '0').strip() in ('1', 'true', 'True'),
+                substitutes=tuple(item for item in substitutes if item in ingredient_ids)
+            ))
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            logger.warning("%s:%d: ingrediente de comida ignorado (%s)", path, line_number, exc)
+    return by_meal
+
+def iter_meals(path: Path, meal_ingredients: Mapping[int, List[MealIngredient]]) -> Iterator[Meal]:
+    for line_number, row in _iter_rows(path):
+        try:
+            meal_id = int(row['id'])
+            meal_type = row['meal_type'].strip()
+            if meal_type not in _MEAL_TYPE_NAMES:
+                raise ValueError(f"tipo de comida desconocido: {meal_type!r}")
+            minutes = (row.get('preparation_minutes') or '').strip()
+            yield Meal(
+                id=meal_id,
+                name=row['name'].strip(),
+                meal_type=meal_type,
+                plan_id=int(row['plan_id']),
+                preparation_minutes=int(minutes) if minutes else None,
+                difficulty=(row.get('difficulty') or '').strip(),
+                instructions=(row.get('instructions') or '').strip(),
+                ingredients=tuple(meal_ingredients.get(meal_id, ()))
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            logger.warning("%s:%d: fila de comida ignorada (%s)", path, line_number, exc)
+
+def iter_nutrition_plans(path: Path) -> Iterator[NutritionPlan]:
+    for line_number, row in _iter_rows(path):
+        try:
+            shares = tuple(int(row[column]) for column in ('carb_percentage', 'protein_percentage', 'fat_percentage'))
+            if sum(shares) != 100 or min(shares) < 0:
+                raise ValueError(f"reparto de macronutrientes no suma 100: {shares}")
+            calories_min, calories_max = int(row['daily_calories_min']), int(row['daily_calories_max'])
+            if not 0 < calories_min <= calories_max:
+                raise ValueError(f"rango de calorías no válido: {calories_min}-{calories_max}")
+            yield NutritionPlan(
+                id=int(row['id']),
+                name=row['name'].strip(),
+                description=(row.get('description') or '').strip(),
+                target_goal=(row.get('target_goal') or '').strip(),
+                calories_min=calories_min,
+                calories_max=calories_max,
+                carb_percentage=shares[0],
+                protein_percentage=shares[1],
+                fat_percentage=shares[2],
+                tips=tuple(split_packed(row.get('tips') or ''))
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as exc:
+            logger.warning("%s:%d: fila de plan nutricional ignorada (%s)", path, line_number, exc)
@@ -0,0 +1,106 @@
+import argparse
+import csv
+import datetime
+import logging
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Mapping, Optional
+
+from fithome.models import MEAL_TYPES
+from fithome.storage import FoodLogEntry, WriteBatch
+
+# Ingesta del registro de comidas (user_nutrition_log). Las entradas llegan
+# de un CSV o de cualquier generador y se aplican por bloques de
+# CHUNK_ENTRIES: cada bloque es un WriteBatch, así que inserta sus entradas
+# con un executemany y suma las calorías de cada (usuario, día) del bloque
+# a daily_stats.calories_consumed con un único upsert aditivo, en la misma
+# transacción. Como las sumas son aditivas, un mismo día repartido en
+# varios bloques queda bien; la memoria depende del bloque y no del archivo.
+#
+#     python -m fithome.intake registros.csv
+#
+# Columnas del CSV (las de user_nutrition_log): user_id, date, meal_type,
+# meal_id, calories_consumed, custom_meal_name, custom_calories, notes.
+# Las calorías de cada entrada son calories_consumed si viene, si no
+# custom_calories (comida personalizada) y si no las del plato del catálogo.
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ENTRIES = 50_000
+
+_MEAL_TYPE_NAMES = frozenset(meal_type for meal_type, *_ in MEAL_TYPES)
+
+def _optional_int(value: Optional[str]) -> Optional[int]:
+    value = (value or '').strip()
+    return int(value) if value else None
+
+def _optional_text(value: Optional[str]) -> Optional[str]:
+    value = (value or '').strip()
+    return value or None
+
+def catalog_meal_calories() -> Dict[int, int]:
+    # kcal de cada plato del catálogo (fithome.nutrition, requiere NumPy)
+    from fithome.nutrition import nutrition_engine
+    engine = nutrition_engine()
+    return {meal.id: round(engine.meal(meal.id).calories) for meal in engine.meals}
+
+def iter_log_csv(path: Path, meal_calories: Optional[Mapping[int, int]] = None) -> Iterator[FoodLogEntry]:
+    # Lectura en streaming; las filas no válidas se registran y se omiten
+    with open(path, newline='', encoding='utf-8') as handle:
+        for line_number, row in enumerate(csv.DictReader(handle), start=2):
+            try:
+                meal_type = row['meal_type'].strip()
+                if meal_type not in _MEAL_TYPE_NAMES:
+                    raise ValueError(f"tipo de comida desconocido: {meal_type!r}")
+                meal_id = _optional_int(row.get('meal_id'))
+                custom_calories = _optional_int(row.get('custom_calories'))
+                calories = _optional_int(row.get('calories_consumed'))
+                if calories is None:
+                    calories = custom_calories
+                if calories is None and meal_id is not None:
+                    if meal_calories is None:
+                        meal_calories = catalog_meal_calories()
+                    calories = meal_calories[meal_id]
+                if calories is None:
+                    raise ValueError("sin calorías ni plato")
+                if calories < 0:
+                    raise ValueError(f"calorías negativas: {calories}")
+                yield FoodLogEntry(
+                    user_id=int(row['user_id']),
+                    day=datetime.date.fromisoformat(row['date'].strip()),
+                    meal_type=meal_type,
+                    calories=calories,
+                    meal_id=meal_id,
+                    custom_meal_name=_optional_text(row.get('custom_meal_name')),
+                    custom_calories=custom_calories,
+                    notes=_optional_text(row.get('notes'))
+                )
+            except (AttributeError, KeyError, TypeError, ValueError) as exc:
+                logger.warning("%s:%d: entrada ignorada (%s)", path, line_number, exc)
+
+def ingest(entries: Iterable[FoodLogEntry], backend=None, chunk_size: int = CHUNK_ENTRIES) -> int:
+    # Aplica las entradas por bloques; devuelve cuántas se registraron
+    from fithome.storage import get_backend
+    backend = backend or get_backend()
+    iterator = iter(entries)
+    total = 0
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return total
+        backend.apply(WriteBatch(food=chunk))
+        total += len(chunk)
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa un registro de comidas a user_nutrition_log")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_ENTRIES)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    entries = ingest(iter_log_csv(args.path), chunk_size=args.chunk_size)
+    logger.info("%d entradas importadas en %.1f s", entries, time.perf_counter() - started)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import atexit
+import datetime
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from fithome.storage import ROOT_DIR, StorageBackend, WorkoutRecord, WriteBatch, get_backend
+from fithome.telemetry import ExerciseDetail
+
+# Journal de escritura diferida (write-behind). Las acciones de la interfaz
+# se añaden a un archivo local de solo anexado (JSON por línea) y vuelven de
+# inmediato; un hilo en segundo plano las aplica por lotes en la base de
+# datos. El último seq aplicado se guarda en journal_checkpoints dentro de
+# la misma transacción, así que tras una caída se reaplica exactamente lo
+# pendiente. Usa un archivo distinto por proceso (FITHOME_JOURNAL_PATH):
+# cada archivo tiene su propio checkpoint, con un nombre sacado de su ruta.
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_PATH = Path(os.environ.get("FITHOME_JOURNAL_PATH", ROOT_DIR / "fithome.journal"))
+
+# Checkpoint que compartían todos los journals antes de tener uno por
+# archivo; solo se lee si el archivo aún no tiene el suyo
+LEGACY_NAME = "default"
+
+WORKOUT_COMPLETED = "workout_completed"
+WATER_SET = "water_set"
+
+@dataclass(frozen=True, slots=True)
+class JournalEvent:
+    seq: int
+    type: str
+    data: Dict
+
+    def to_line(self) -> str:
+        return json.dumps({"seq": self.seq, "type": self.type, "data": self.data}, ensure_ascii=False) + "\n"
+
+    @classmethod
+    def from_line(cls, line: str) -> "JournalEvent":
+        raw = json.loads(line)
+        return cls(seq=int(raw["seq"]), type=raw["type"], data=raw["data"])
+
+def journal_name(path: Path) -> str:
+    # Nombre del archivo (acotado a journal_checkpoints.journal_name) y hash
+    # de la ruta absoluta: dos archivos distintos nunca comparten checkpoint
+    path = Path(path)
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+    return f"{path.name[:60]}-{digest}"
+
+def build_batch(events: List[JournalEvent], journal_name: str) -> WriteBatch:
+    batch = WriteBatch(journal=(journal_name, events[-1].seq))
+    for event in events:
+        data = event.data
+        if event.type == WORKOUT_COMPLETED:
+            batch.record_workout(WorkoutRecord(
+                user_id=data["user_id"],
+                workout_id=data["workout_id"],
+                started_at=datetime.datetime.fromisoformat(data["started_at"]),
+                completed_at=datetime.datetime.fromisoformat(data["completed_at"]),
+                calories_burned=data["calories_burned"],
+                duration_minutes=data["duration_minutes"],
+                difficulty_rating=data.get("difficulty_rating"),
+                enjoyment_rating=data.get("enjoyment_rating"),
+                exercises=[ExerciseDetail.from_dict(detail) for detail in data.get("exercises", ())]
+            ))
+        elif event.type == WATER_SET:
+            batch.set_water(data["user_id"], datetime.date.fromisoformat(data["date"]), data["glasses"])
+        else:
+            logger.warning("Evento de journal desconocido ignorado: %s (seq %d)", event.type, event.seq)
+    return batch
+
+class EventJournal:
+    def __init__(self, backend: StorageBackend, path: Path = DEFAULT_JOURNAL_PATH, name: Optional[str] = None,
+                 batch_size: int = 200, flush_interval: float = 0.5, fsync: bool = True,
+                 compact_bytes: int = 1 << 20):
+        self.backend = backend
+        self.path = Path(path)
+        self.name = name or journal_name(self.path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.compact_bytes = compact_bytes
+
+        self._lock = threading.Lock()          # archivo y lista de pendientes
+        self._flush_lock = threading.Lock()    # un solo flush a la vez
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._pending: List[JournalEvent] = []
+        self._next_seq = 0
+        self._file = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "EventJournal":
+        self._recover()
+        self._thread = threading.Thread(target=self._run, name=f"journal-{self.name}", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def _recover(self):
+        checkpoint = self.backend.journal_checkpoint(self.name)
+        if checkpoint is None:
+            # Primer arranque con un checkpoint por archivo: lo aplicado
+            # hasta ahora quedó en el compartido. Se guarda ya el propio para
+            # no volver a leer el compartido
+            checkpoint = self.backend.journal_checkpoint(LEGACY_NAME) or 0
+            self.backend.apply(WriteBatch(journal=(self.name, checkpoint)))
+        last_seq = checkpoint
+        valid_bytes = 0
+        if self.path.exists():
+            with open(self.path, "rb") as handle:
+                for raw in handle:
+                    try:
+                        event = JournalEvent.from_line(raw.decode("utf-8"))
+                    except (ValueError, KeyError, UnicodeDecodeError):
+                        # Línea incompleta de una caída a mitad de escritura
+                        logger.warning("%s: journal truncado en el byte %d", self.path, valid_bytes)
+                        break
+                    valid_bytes += len(raw)
+                    last_seq = max(last_seq, event.seq)
+                    if event.seq > checkpoint:
+                        self._pending.append(event)
+            os.truncate(self.path, valid_bytes)
+
+        self._next_seq = last_seq + 1
+        self._file = open(self.path, "a", encoding="utf-8")
+        if self._pending:
+            logger.info("Reaplicando %d eventos pendientes del journal %s", len(self._pending), self.path)
+            self._wake.set()
+
+    def append(self, event_type: str, **data) -> int:
+        with self._lock:
+            if self._file is None:
+                raise RuntimeError("El journal no está iniciado")
+            event = JournalEvent(self._next_seq, event_type, data)
+            self._next_seq += 1
+            self._file.write(event.to_line())
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._pending.append(event)
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+        return event.seq
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                # La base no está disponible; los eventos siguen en el
+                # journal y se reintentan en la próxima vuelta
+                logger.exception("No se pudo aplicar el journal %s", self.path)
+
+    def flush(self):
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    chunk = self._pending[:self.batch_size]
+                if not chunk:
+                    break
+                self.backend.apply(build_batch(chunk, self.name))
+                with self._lock:
+                    del self._pending[:len(chunk)]
+            self._compact()
+
+    def _compact(self):
+        # Con todo aplicado, el contenido del archivo ya está en la base
+        with self._lock:
+            if self._pending or self._file is None or self._file.tell() < self.compact_bytes:
+                return
+            self._file.truncate(0)
+            self._file.seek(0)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def stop(self):
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Eventos sin aplicar al cerrar; se reaplicarán al reiniciar")
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+_journal: Optional[EventJournal] = None
+_journal_lock = threading.Lock()
+
+def get_journal() -> EventJournal:
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                _journal = EventJournal(get_backend()).start()
+    return _journal
@@ -0,0 +1,154 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+from fithome.models import KidsActivity
+from fithome.search import FacetIndex, SearchPage, bitset, kids_index, normalize
+
+# Actividades infantiles para lo que un padre tiene ahora mismo: edades de
+# los niños, minutos disponibles y materiales en casa. Usa los rangos de
+# edad y duración del índice de búsqueda (fithome.search, parseados al
+# construirlo) y añade un índice de materiales: para cada material
+# obligatorio, el bitset de las actividades que lo necesitan. "Marcadores
+# (opcional)" es un material no obligatorio (is_essential en MySQL).
+#
+# Las actividades que se pueden hacer son las que no necesitan ningún
+# material que falte: el OR de los bitsets de los materiales que no hay en
+# casa da las que no se pueden hacer. Con un segundo bitset se separan las
+# que solo necesitan uno que falta, que se muestran al final.
+#
+# El orden es por grupos (bitsets), de más a menos importante: tener todos
+# los materiales, servir para todos los niños y caber entera en el tiempo
+# disponible. Dentro de cada grupo, el orden del catálogo.
+
+OPTIONAL_SUFFIX = "(opcional)"
+
+def parse_material(text: str) -> Tuple[str, bool]:
+    # "Marcadores (opcional)" -> ("Marcadores", False)
+    name = text.strip()
+    if name.lower().endswith(OPTIONAL_SUFFIX):
+        return name[:-len(OPTIONAL_SUFFIX)].rstrip(), False
+    return name, True
+
+@dataclass(frozen=True, slots=True)
+class KidsMatch:
+    # Bitsets de cada grupo en el orden en que se muestran
+    tiers: Tuple[int, ...]
+    # Actividades a las que les falta un material obligatorio
+    one_short: int
+
+    @property
+    def total(self) -> int:
+        return sum(tier.bit_count() for tier in self.tiers)
+
+class KidsMatcher:
+    def __init__(self, index: FacetIndex[KidsActivity]):
+        self.index = index
+        size = len(index.items)
+        names: Dict[str, str] = {}
+        required: Dict[str, List[int]] = {}
+        supervised: List[int] = []
+        self._essentials: Dict[int, FrozenSet[str]] = {}
+        for position, activity in enumerate(index.items):
+            essentials = set()
+            for text in activity.materials:
+                name, essential = parse_material(text)
+                key = normalize(name)
+                names.setdefault(key, name)
+                if essential:
+                    essentials.add(key)
+            for key in essentials:
+                required.setdefault(key, []).append(position)
+            self._essentials[activity.id] = frozenset(essentials)
+            if activity.adult_supervision:
+                supervised.append(position)
+        # Material normalizado -> nombre a mostrar, por nombre
+        self.materials = dict(sorted(names.items(), key=lambda item: normalize(item[1])))
+        self.requires = {key: bitset(positions, size) for key, positions in required.items()}
+        self.supervised = bitset(supervised, size)
+
+    def match(self, ages: Sequence[int] = (), minutes: Optional[int] = None,
+              materials: Optional[Iterable[str]] = None, adult: bool = True,
+              base: Optional[int] = None) -> KidsMatch:
+        # base: resultado de kids_index().query() con el resto de filtros.
+        # Sin materiales (None) no se filtra por ellos; sin edades ni
+        # minutos, tampoco por edad ni por tiempo
+        mask = self.index.all if base is None else base
+        if not adult:
+            mask &= ~self.supervised
+
+        # Para algún niño (filtro) y para todos (orden)
+        every_child = mask
+        if ages:
+            age_ranges = self.index.ranges['age']
+            any_child = 0
+            for age in set(ages):
+                fits = age_ranges.overlapping(age, age)
+                any_child |= fits
+                every_child &= fits
+            mask &= any_child
+
+        # Empieza en el tiempo disponible (filtro) y acaba en él (orden)
+        whole = mask
+        if minutes is not None:
+            durations = self.index.ranges['duration']
+            mask &= durations.starting_by(minutes)
+            whole = durations.ending_by(minutes)
+
+        # Cuántos materiales obligatorios faltan: al menos uno y al menos dos
+        ready, one_short = mask, 0
+        if materials is not None:
+            have = {normalize(name) for name in materials}
+            missing, missing_more = 0, 0
+            for key, holders in self.requires.items():
+                if key in have:
+                    continue
+                holders &= mask
+                missing_more |= missing & holders
+                missing |= holders
+            ready = mask & ~missing
+            one_short = missing & ~missing_more
+
+        tiers = tuple(
+            group & children & time
+            for group in (ready, one_short)
+            for children in (every_child, ~every_child)
+            for time in (whole, ~whole)
+        )
+        return KidsMatch(tiers, one_short)
+
+    def page(self, match: KidsMatch, page: int = 0, page_size: int = 20) -> SearchPage[KidsActivity]:
+        skip = page * page_size
+        items: List[KidsActivity] = []
+        for tier in match.tiers:
+            count = tier.bit_count()
+            if skip >= count:
+                skip -= count
+                continue
+            items.extend(self.index.take(tier, skip, page_size - len(items)))
+            skip = 0
+            if len(items) == page_size:
+                break
+        return SearchPage(tuple(items), match.total, page, page_size)
+
+    def missing(self, activity: KidsActivity, materials: Iterable[str]) -> List[str]:
+        # Materiales obligatorios de la actividad que no hay en casa
+        have = {normalize(name) for name in materials}
+        return sorted(self.materials[key] for key in self._essentials.get(activity.id, ()) if key not in have)
+
+# Un buscador por índice de actividades: kids_index() ya se reconstruye
+# solo cuando cambia el catálogo
+_matcher: Optional[Tuple[FacetIndex, KidsMatcher]] = None
+_matcher_lock = threading.Lock()
+
+def kids_matcher() -> KidsMatcher:
+    global _matcher
+    index = kids_index()
+    cached = _matcher
+    if cached is not None and cached[0] is index:
+        return cached[1]
+    with _matcher_lock:
+        cached = _matcher
+        if cached is None or cached[0] is not index:
+            cached = _matcher = (index, KidsMatcher(index))
+    return cached[1]
@@ -0,0 +1,226 @@
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from fithome.models import ALLERGENS, Ingredient, Meal
+from fithome.search import bitset
+
+# Índice de alérgenos e ingredientes de los platos del catálogo. Como en
+# fithome.search, cada plato ocupa una posición (su orden en el catálogo) y
+# cada clave guarda un bitset (un int) con los platos que la tienen:
+#   - ingrediente -> platos que lo llevan como obligatorio;
+#   - alérgeno -> platos con algún ingrediente obligatorio que lo contiene;
+#   - franja (meal_type) -> platos de esa franja.
+# "Platos sin gluten ni lactosa" es un NOT del OR de dos bitsets.
+#
+# Los sustitutos de meal_ingredients forman un grafo dirigido entre
+# ingredientes. Para adaptar un plato se usan primero los sustitutos de su
+# propia fila y, si no sirven, el sustituto sin esos alérgenos más cercano
+# en el grafo (BFS); si no se puede adaptar, se propone el plato seguro de
+# la misma franja que más ingredientes comparte. Las búsquedas se guardan
+# en caché por (plato o ingrediente, alérgenos).
+#
+# Cambiar los alérgenos de un ingrediente solo recalcula los bitsets de
+# esos alérgenos (OR de los platos que lo llevan como obligatorio) y vacía
+# la caché de búsquedas.
+
+# Búsquedas guardadas antes de vaciar la caché
+MAX_LOOKUPS = 10_000
+
+def set_positions(mask: int) -> Iterator[int]:
+    # Posiciones de los bits a uno, byte a byte: quitar el bit más bajo del
+    # int en cada paso copiaría el número entero
+    for offset, byte in enumerate(mask.to_bytes((mask.bit_length() + 7) // 8, 'little')):
+        while byte:
+            lowest = byte & -byte
+            yield (offset << 3) + lowest.bit_length() - 1
+            byte ^= lowest
+
+@dataclass(frozen=True, slots=True)
+class Substitution:
+    # El plato pedido con los cambios (ingrediente, sustituto) o, si no se
+    # puede adaptar, el plato seguro más parecido sin cambios
+    meal: Meal
+    swaps: Tuple[Tuple[int, int], ...] = ()
+
+    @property
+    def adapted(self) -> bool:
+        return bool(self.swaps)
+
+class MealIndex:
+    def __init__(self, ingredients: Iterable[Ingredient], meals: Sequence[Meal]):
+        self.meals = tuple(meals)
+        self.ingredients: Dict[int, Ingredient] = {ingredient.id: ingredient for ingredient in ingredients}
+        size = len(self.meals)
+        self.all = (1 << size) - 1
+        self._meal_pos = {meal.id: position for position, meal in enumerate(self.meals)}
+
+        uses: Dict[int, List[int]] = {}
+        required: Dict[int, List[int]] = {}
+        types: Dict[str, List[int]] = {}
+        graph: Dict[int, Set[int]] = {}
+        for position, meal in enumerate(self.meals):
+            types.setdefault(meal.meal_type, []).append(position)
+            for item in meal.ingredients:
+                uses.setdefault(item.ingredient_id, []).append(position)
+                if not item.is_optional:
+                    required.setdefault(item.ingredient_id, []).append(position)
+                if item.substitutes:
+                    graph.setdefault(item.ingredient_id, set()).update(item.substitutes)
+        self.required_meals = {ingredient_id: bitset(positions, size) for ingredient_id, positions in required.items()}
+        self.type_meals = {meal_type: bitset(positions, size) for meal_type, positions in types.items()}
+        self.substitutes = {ingredient_id: tuple(sorted(targets)) for ingredient_id, targets in graph.items()}
+
+        # Ingredientes de cada plato como bitset (para medir el parecido)
+        bits = {ingredient_id: bit for bit, ingredient_id in enumerate(sorted(uses))}
+        self._meal_ingredients = [
+            bitset({bits[item.ingredient_id] for item in meal.ingredients}, len(bits)) for meal in self.meals
+        ]
+
+        self.allergen_ingredients: Dict[str, Set[int]] = {code: set() for code in ALLERGENS}
+        for ingredient in self.ingredients.values():
+            for code in ingredient.allergens:
+                self.allergen_ingredients.setdefault(code, set()).add(ingredient.id)
+        self.allergen_meals = {code: self._allergen_mask(code) for code in self.allergen_ingredients}
+
+        self._lookups: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _allergen_mask(self, code: str) -> int:
+        mask = 0
+        for ingredient_id in self.allergen_ingredients.get(code, ()):
+            mask |= self.required_meals.get(ingredient_id, 0)
+        return mask
+
+    def containing(self, allergens: Iterable[str]) -> int:
+        # Platos con alguno de los alérgenos en un ingrediente obligatorio
+        mask = 0
+        for code in allergens:
+            mask |= self.allergen_meals.get(code, 0)
+        return mask
+
+    def safe(self, allergens: Iterable[str]) -> int:
+        return self.all & ~self.containing(allergens)
+
+    def of_type(self, meal_type: str) -> int:
+        return self.type_meals.get(meal_type, 0)
+
+    def meals_in(self, mask: int) -> List[Meal]:
+        return [self.meals[position] for position in set_positions(mask)]
+
+    def position(self, meal_id: int) -> int:
+        return self._meal_pos[meal_id]
+
+    def _is_free(self, ingredient_id: int, allergens: FrozenSet[str]) -> bool:
+        ingredient = self.ingredients.get(ingredient_id)
+        return ingredient is not None and not allergens.intersection(ingredient.allergens)
+
+    def _cached(self, key: Tuple, compute):
+        try:
+            return self._lookups[key]
+        except KeyError:
+            pass
+        value = compute()
+        with self._lock:
+            if len(self._lookups) >= MAX_LOOKUPS:
+                self._lookups.clear()
+            self._lookups[key] = value
+        return value
+
+    def substitute(self, ingredient_id: int, allergens: Iterable[str]) -> Optional[int]:
+        # Sustituto sin esos alérgenos más cercano en el grafo (BFS)
+        allergens = frozenset(allergens)
+
+        def search() -> Optional[int]:
+            seen = {ingredient_id}
+            queue = deque(self.substitutes.get(ingredient_id, ()))
+            while queue:
+                candidate = queue.popleft()
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                if self._is_free(candidate, allergens):
+                    return candidate
+                queue.extend(self.substitutes.get(candidate, ()))
+            return None
+
+        return self._cached(('ingredient', ingredient_id, allergens), search)
+
+    def nearest_safe(self, meal_id: int, allergens: Iterable[str]) -> Optional[Substitution]:
+        allergens = frozenset(allergens)
+
+        def search() -> Optional[Substitution]:
+            position = self._meal_pos[meal_id]
+            meal = self.meals[position]
+            if not (self.containing(allergens) >> position) & 1:
+                return Substitution(meal)
+            swaps = []
+            for item in meal.ingredients:
+                if item.is_optional or self._is_free(item.ingredient_id, allergens):
+                    continue
+                replacement = next(
+                    (candidate for candidate in item.substitutes if self._is_free(candidate, allergens)), None
+                )
+                if replacement is None:
+                    replacement = self.substitute(item.ingredient_id, allergens)
+                if replacement is None:
+                    break
+                swaps.append((item.ingredient_id, replacement))
+            else:
+                return Substitution(meal, tuple(swaps))
+            # Sin adaptación posible: el plato seguro de la franja que más
+            # ingredientes comparte (el primero del catálogo si empatan)
+            ingredients = self._meal_ingredients[position]
+            best, best_shared = None, -1
+            for candidate in set_positions(self.safe(allergens) & self.of_type(meal.meal_type)):
+                shared = (ingredients & self._meal_ingredients[candidate]).bit_count()
+                if shared > best_shared:
+                    best, best_shared = candidate, shared
+            return Substitution(self.meals[best]) if best is not None else None
+
+        return self._cached(('meal', meal_id, allergens), search)
+
+    def update_ingredient(self, ingredient: Ingredient) -> int:
+        # Recalcula solo los alérgenos que cambian; devuelve cuántos
+        with self._lock:
+            previous = self.ingredients.get(ingredient.id)
+            self.ingredients[ingredient.id] = ingredient
+            changed = set(previous.allergens if previous else ()) ^ set(ingredient.allergens)
+            for code in changed:
+                holders = self.allergen_ingredients.setdefault(code, set())
+                if code in ingredient.allergens:
+                    holders.add(ingredient.id)
+                else:
+                    holders.discard(ingredient.id)
+                self.allergen_meals[code] = self._allergen_mask(code)
+            if changed or previous is None:
+                # Las búsquedas dependen de los alérgenos de cada ingrediente
+                self._lookups.clear()
+            return len(changed)
+
+# Un índice por catálogo. Si al recargar el catálogo solo cambiaron
+# ingredientes (mismos platos), se actualiza el índice existente con
+# update_ingredient en vez de reconstruirlo.
+_index: Optional[Tuple[object, MealIndex]] = None
+_index_lock = threading.Lock()
+
+def meal_index() -> MealIndex:
+    global _index
+    from fithome.catalog import get_catalog
+    catalog = get_catalog()
+    cached = _index
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+    with _index_lock:
+        cached = _index
+        if cached is None or cached[0] is not catalog:
+            index = cached[1] if cached is not None else None
+            if index is not None and index.meals == catalog.meals:
+                for ingredient in catalog.ingredients:
+                    if index.ingredients.get(ingredient.id) != ingredient:
+                        index.update_ingredient(ingredient)
+            else:
+                index = MealIndex(catalog.ingredients, catalog.meals)
+            cached = _index = (catalog, index)
+    return cached[1]
@@ -0,0 +1,334 @@
+import argparse
+import datetime
+import itertools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fithome.mealindex import MealIndex, meal_index
+from fithome.models import MEAL_TYPES, NutritionPlan
+from fithome.nutrition import (
+    CALORIES, CARBS, FAT, KCAL_PER_GRAM_CARBS, KCAL_PER_GRAM_FAT, KCAL_PER_GRAM_PROTEIN, PROTEIN, Macros,
+    NutritionEngine, nutrition_engine
+)
+
+# Generador del plan de comidas de cada usuario. Para cada franja
+# (meal_types) las opciones son combinaciones de 1 a MAX_COMPONENTS platos
+# de esa franja por una ración común; se descartan los platos con algún
+# ingrediente obligatorio que contenga un alérgeno del usuario (bitset de
+# fithome.mealindex). El día se
+# resuelve con búsqueda en haz sobre las franjas en orden: cada estado
+# lleva los totales acumulados (matriz NumPy) y en cada paso se evalúan
+# todos los estados x todas las opciones de la franja a la vez.
+#
+# Coste de un día:
+#   - por franja, desviación de sus calorías respecto a su % del objetivo
+#     (typical_calories_percentage del centro del rango del plan);
+#   - calorías del día fuera de [daily_calories_min, daily_calories_max];
+#   - desviación del reparto de la energía (carbohidratos, proteínas y
+#     grasas) respecto al del plan;
+#   - platos ya usados esa semana (variedad).
+#
+# El resultado solo depende del plan y de las alergias, así que el lote
+# para todos los usuarios resuelve una vez cada grupo (plan, alergias).
+
+logger = logging.getLogger(__name__)
+
+# Raciones posibles de cada opción
+SERVINGS = (0.5, 0.75, 1.0, 1.25, 1.5, 2.0)
+# Platos como mucho por franja y candidatos por franja (los de reparto de
+# energía más cercano al del plan)
+MAX_COMPONENTS = 3
+POOL_SIZE = 12
+BEAM_WIDTH = 32
+WEEK_DAYS = 7
+
+SLOT_WEIGHT = 1.0
+RANGE_WEIGHT = 50.0
+SPLIT_WEIGHT = 10.0
+REPEAT_WEIGHT = 0.15
+# Preferencia por opciones con menos platos
+COMPONENT_WEIGHT = 0.02
+
+# Objetivos del perfil (tabla goals) -> target_goal de nutrition_plans
+GOAL_PLANS = {
+    'perder peso': 'perder_peso',
+    'ganar músculo': 'ganar_musculo',
+    'mantenerse en forma': 'mantener',
+}
+DEFAULT_GOAL = 'mantener'
+
+BATCH_USERS = 500
+
+@dataclass(frozen=True, slots=True)
+class SlotChoice:
+    meal_type: str
+    meal_ids: Tuple[int, ...]
+    servings: float
+    macros: Macros
+
+@dataclass(frozen=True, slots=True)
+class DayPlan:
+    slots: Tuple[SlotChoice, ...]
+    macros: Macros
+
+def plan_for(goals: Sequence[str], plans: Sequence[NutritionPlan]) -> NutritionPlan:
+    # Plan del primer objetivo (por prioridad) que tenga uno
+    by_goal: Dict[str, NutritionPlan] = {}
+    for plan in plans:
+        by_goal.setdefault(plan.target_goal, plan)
+    for goal in goals:
+        plan = by_goal.get(GOAL_PLANS.get(goal, ''))
+        if plan is not None:
+            return plan
+    return by_goal.get(DEFAULT_GOAL, plans[0])
+
+def macro_energy(totals: np.ndarray) -> np.ndarray:
+    # kcal de carbohidratos, proteínas y grasas de cada fila de totals
+    return np.column_stack([
+        totals[:, CARBS] * KCAL_PER_GRAM_CARBS,
+        totals[:, PROTEIN] * KCAL_PER_GRAM_PROTEIN,
+        totals[:, FAT] * KCAL_PER_GRAM_FAT,
+    ])
+
+def energy_split(totals: np.ndarray) -> np.ndarray:
+    # % de la energía de carbohidratos, proteínas y grasas por fila
+    energy = macro_energy(totals)
+    return 100 * energy / np.maximum(energy.sum(axis=1, keepdims=True), 1e-9)
+
+def split_cost(state_energy: np.ndarray, option_energy: np.ndarray, wanted: np.ndarray) -> np.ndarray:
+    # Σ (e_i / E - w_i)² de cada estado + cada opción, con e = a + b, sin
+    # materializar la matriz estados x opciones x macronutrientes: los
+    # términos cruzados salen de un producto matricial a @ b.T
+    a, b = state_energy, option_energy
+    total = np.maximum(a.sum(axis=1)[:, None] + b.sum(axis=1)[None, :], 1e-9)
+    squares = (a * a).sum(axis=1)[:, None] + 2 * (a @ b.T) + (b * b).sum(axis=1)[None, :]
+    weighted = (a @ wanted)[:, None] + (b @ wanted)[None, :]
+    return squares / (total * total) - 2 * weighted / total + wanted @ wanted
+
+class SlotOptions:
+    # Opciones de una franja: platos (posiciones en engine.meals, -1 de
+    # relleno), ración, totales y coste propio de la franja
+    def __init__(self, meal_type: str, combos: np.ndarray, servings: np.ndarray, totals: np.ndarray, cost: np.ndarray):
+        self.meal_type = meal_type
+        self.combos = combos
+        self.servings = servings
+        self.totals = totals
+        self.energy = macro_energy(totals)
+        self.cost = cost
+
+    def __len__(self):
+        return len(self.cost)
+
+def mask_array(mask: int, size: int) -> np.ndarray:
+    # Bitset (int) -> array de booleanos por posición
+    packed = np.frombuffer(mask.to_bytes((size + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(packed, bitorder='little')[:size].astype(bool)
+
+class MealPlanner:
+    def __init__(self, engine: NutritionEngine, index: MealIndex):
+        # index debe tener los mismos platos, en el mismo orden, que engine
+        self.engine = engine
+        self.index = index
+        self.meal_types = np.array([meal.meal_type for meal in engine.meals])
+        self._meal_pos = {meal.id: position for position, meal in enumerate(engine.meals)}
+        # Totales por plato con una fila de ceros al final para el relleno -1
+        self._meal_totals = np.vstack([engine.meal_totals, np.zeros((1, engine.meal_totals.shape[1]))])
+        self._options: Dict[Tuple[int, FrozenSet[str]], List[SlotOptions]] = {}
+        self._weeks: Dict[Tuple[int, FrozenSet[str], int], List[DayPlan]] = {}
+        self._lock = threading.Lock()
+
+    def options(self, plan: NutritionPlan, allergies: FrozenSet[str]) -> List[SlotOptions]:
+        key = (plan.id, allergies)
+        options = self._options.get(key)
+        if options is None:
+            options = self._build_options(plan, allergies)
+            with self._lock:
+                self._options[key] = options
+        return options
+
+    def _build_options(self, plan: NutritionPlan, allergies: FrozenSet[str]) -> List[SlotOptions]:
+        target = (plan.calories_min + plan.calories_max) / 2
+        wanted = np.array([plan.carb_percentage, plan.protein_percentage, plan.fat_percentage], dtype=np.float64)
+        allowed = mask_array(self.index.safe(allergies), len(self.engine.meals))
+        splits = energy_split(self.engine.meal_totals)
+        servings = np.array(SERVINGS)
+        result = []
+        for meal_type, _, _, percentage in MEAL_TYPES:
+            pool = np.flatnonzero(allowed & (self.meal_types == meal_type))
+            if not len(pool):
+                continue
+            if len(pool) > POOL_SIZE:
+                distance = ((splits[pool] - wanted) ** 2).sum(axis=1)
+                pool = pool[np.argsort(distance, kind='stable')[:POOL_SIZE]]
+            combos = np.array([
+                combo + (-1,) * (MAX_COMPONENTS - size)
+                for size in range(1, min(MAX_COMPONENTS, len(pool)) + 1)
+                for combo in itertools.combinations(pool.tolist(), size)
+            ], dtype=np.int64)
+            base = self._meal_totals[combos].sum(axis=1)
+            # Cada combinación con cada ración
+            totals = (base[:, None, :] * servings[None, :, None]).reshape(-1, base.shape[1])
+            combos = np.repeat(combos, len(servings), axis=0)
+            portions = np.tile(servings, len(base))
+            slot_target = target * percentage / 100
+            cost = SLOT_WEIGHT * ((totals[:, CALORIES] - slot_target) / slot_target) ** 2
+            cost += COMPONENT_WEIGHT * ((combos >= 0).sum(axis=1) - 1)
+            result.append(SlotOptions(meal_type, combos, portions, totals, cost))
+        return result
+
+    def solve_day(self, plan: NutritionPlan, options: List[SlotOptions], usage: np.ndarray) -> DayPlan:
+        # usage: veces que se ha usado cada plato (más un 0 para el relleno)
+        if not options:
+            return DayPlan((), Macros())
+        wanted = np.array([plan.carb_percentage, plan.protein_percentage, plan.fat_percentage], dtype=np.float64) / 100
+        target = (plan.calories_min + plan.calories_max) / 2
+        costs = np.zeros(1)
+        totals = np.zeros((1, self._meal_totals.shape[1]))
+        energy = np.zeros((1, 3))
+        picks = np.zeros((1, 0), dtype=np.int64)
+        for step, slot in enumerate(options):
+            slot_cost = slot.cost + REPEAT_WEIGHT * usage[slot.combos].sum(axis=1)
+            candidate_costs = costs[:, None] + slot_cost[None, :]
+            rank = candidate_costs + SPLIT_WEIGHT * split_cost(energy, slot.energy, wanted)
+            if step == len(options) - 1:
+                calories = totals[:, CALORIES][:, None] + slot.totals[:, CALORIES][None, :]
+                outside = np.maximum(plan.calories_min - calories, 0) + np.maximum(calories - plan.calories_max, 0)
+                # Lineal: salirse del rango por poco ya pesa más que repetir un plato
+                rank += RANGE_WEIGHT * outside / target
+            rank = rank.ravel()
+            if len(rank) > BEAM_WIDTH:
+                keep = np.argpartition(rank, BEAM_WIDTH)[:BEAM_WIDTH]
+            else:
+                keep = np.arange(len(rank))
+            states, choices = np.divmod(keep, len(slot))
+            costs = candidate_costs.ravel()[keep]
+            totals = totals[states] + slot.totals[choices]
+            energy = energy[states] + slot.energy[choices]
+            picks = np.column_stack([picks[states], choices])
+            final_rank = rank[keep]
+        best = int(np.argmin(final_rank))
+        slots = []
+        for slot, choice in zip(options, picks[best]):
+            combo = slot.combos[choice]
+            slots.append(SlotChoice(
+                meal_type=slot.meal_type,
+                meal_ids=tuple(self.engine.meals[position].id for position in combo if position >= 0),
+                servings=float(slot.servings[choice]),
+                macros=Macros.from_row(slot.totals[choice])
+            ))
+        return DayPlan(tuple(slots), Macros.from_row(totals[best]))
+
+    def week(self, plan: NutritionPlan, allergies: Iterable[str] = (), days: int = WEEK_DAYS) -> List[DayPlan]:
+        allergies = frozenset(allergies)
+        key = (plan.id, allergies, days)
+        week = self._weeks.get(key)
+        if week is not None:
+            return week
+        options = self.options(plan, allergies)
+        usage = np.zeros(len(self.engine.meals) + 1)
+        week = []
+        for _ in range(days):
+            day = self.solve_day(plan, options, usage)
+            for choice in day.slots:
+                for meal_id in choice.meal_ids:
+                    usage[self._meal_pos[meal_id]] += 1
+            week.append(day)
+        with self._lock:
+            self._weeks[key] = week
+        return week
+
+    def stored_days(self, rows: Iterable[Tuple[datetime.date, str, int, int, float]], plan: NutritionPlan,
+                    allergies: Iterable[str] = ()) -> Dict[datetime.date, DayPlan]:
+        # Días guardados por generate_all (filas de load_meal_plan) que
+        # siguen valiendo: del mismo plan, con todos los platos en el
+        # catálogo y ninguno con un alérgeno del usuario
+        unsafe = self.index.containing(allergies)
+        days: Dict[datetime.date, Dict[str, Tuple[List[int], float]]] = {}
+        stale = set()
+        for day, meal_type, plan_id, meal_id, servings in rows:
+            position = self._meal_pos.get(meal_id)
+            if plan_id != plan.id or position is None or (unsafe >> position) & 1:
+                stale.add(day)
+            days.setdefault(day, {}).setdefault(meal_type, ([], servings))[0].append(meal_id)
+        order = {meal_type: i for i, (meal_type, *_) in enumerate(MEAL_TYPES)}
+        result = {}
+        for day, slots in days.items():
+            if day in stale:
+                continue
+            choices = []
+            day_totals = np.zeros(self._meal_totals.shape[1])
+            for meal_type in sorted(slots, key=order.__getitem__):
+                meal_ids, servings = slots[meal_type]
+                totals = self._meal_totals[[self._meal_pos[meal_id] for meal_id in meal_ids]].sum(axis=0) * servings
+                day_totals += totals
+                choices.append(SlotChoice(meal_type, tuple(meal_ids), servings, Macros.from_row(totals)))
+            result[day] = DayPlan(tuple(choices), Macros.from_row(day_totals))
+        return result
+
+# Un generador por catálogo (las opciones y semanas resueltas se guardan
+# en él por plan y alergias)
+_planner: Optional[Tuple[object, MealPlanner]] = None
+_planner_lock = threading.Lock()
+
+def meal_planner() -> MealPlanner:
+    global _planner
+    from fithome.catalog import get_catalog
+    catalog = get_catalog()
+    cached = _planner
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+    with _planner_lock:
+        cached = _planner
+        if cached is None or cached[0] is not catalog:
+            cached = _planner = (catalog, MealPlanner(nutrition_engine(), meal_index()))
+    return cached[1]
+
+def plan_rows(user_id: int, plan: NutritionPlan, week: List[DayPlan],
+              start: datetime.date) -> List[Tuple[int, datetime.date, str, int, int, int, float]]:
+    # Filas de user_meal_plans
+    return [
+        (user_id, start + datetime.timedelta(days=offset), choice.meal_type, position, plan.id, meal_id, choice.servings)
+        for offset, day in enumerate(week)
+        for choice in day.slots
+        for position, meal_id in enumerate(choice.meal_ids)
+    ]
+
+# Generación para todos los usuarios (tarea semanal):
+#     python -m fithome.mealplan --start 2026-10-19
+def generate_all(backend=None, start: Optional[datetime.date] = None, days: int = WEEK_DAYS,
+                 batch_users: int = BATCH_USERS) -> int:
+    from fithome.catalog import get_catalog
+    from fithome.storage import get_backend
+    backend = backend or get_backend()
+    start = start or datetime.date.today()
+    end = start + datetime.timedelta(days=days - 1)
+    plans = get_catalog().nutrition_plans
+    planner = meal_planner()
+    total = 0
+    for chunk in backend.iter_nutrition_profiles(batch_size=batch_users):
+        rows = []
+        for user_id, goals, allergies in chunk:
+            plan = plan_for(goals, plans)
+            rows.extend(plan_rows(user_id, plan, planner.week(plan, allergies, days), start))
+        backend.save_meal_plans([user_id for user_id, _, _ in chunk], start, end, rows)
+        total += len(chunk)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera el plan de comidas de todos los usuarios")
+    parser.add_argument("--start", type=datetime.date.fromisoformat, default=datetime.date.today())
+    parser.add_argument("--days", type=int, default=WEEK_DAYS)
+    parser.add_argument("--batch-users", type=int, default=BATCH_USERS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    users = generate_all(start=args.start, days=args.days, batch_users=args.batch_users)
+    logger.info("Planes de comidas de %d usuarios en %.1f s", users, time.perf_counter() - started)
+
+if __name__ == "__main__":
+    main()
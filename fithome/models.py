@@ -0,0 +1,225 @@
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+# Estado del usuario (mutable, vive en st.session_state)
+@dataclass
+class UserProfile:
+    name: str = ""
+    email: str = ""
+    password: str = ""
+    age: str = ""
+    gender: str = ""
+    goals: List[str] = field(default_factory=list)
+    fitness_level: str = ""
+    is_premium: bool = False
+    weight: str = ""
+    height: str = ""
+    target_weight: str = ""
+    # Códigos de ALLERGENS que el plan de comidas debe evitar
+    allergies: List[str] = field(default_factory=list)
+
+@dataclass
+class UserStats:
+    streak_days: int = 0
+    longest_streak: int = 0
+    total_workouts: int = 0
+    total_calories: int = 0
+    total_minutes: int = 0
+    today_calories: int = 0
+    today_minutes: int = 0
+    # Calorías registradas hoy en user_nutrition_log
+    today_consumed: int = 0
+    # Minutos de lunes a domingo de la semana actual y actividad del mes
+    weekly_progress: List[int] = field(default_factory=lambda: [0] * 7)
+    month_workouts: int = 0
+    month_minutes: int = 0
+    month_calories: int = 0
+    achievements: List[str] = field(default_factory=list)
+    last_workout_date: Optional[str] = None
+
+# Registros inmutables del catálogo. Son frozen + slots para poder
+# compartirse entre todas las sesiones del proceso sin copias y usarse como
+# claves de caché (son hashables).
+#
+# Duraciones, calorías y series se guardan como enteros (las columnas de
+# workouts y workout_exercises en sql/fithome_database.sql); el texto que se
+# muestra ("20 min", "180-220", "3x12") se deriva de ellos.
+
+def format_seconds(seconds: int) -> str:
+    # 45 -> "45s", 60 -> "60s", 300 -> "5 min"
+    if seconds >= 120 and seconds % 60 == 0:
+        return f"{seconds // 60} min"
+    return f"{seconds}s"
+
+@dataclass(frozen=True, slots=True)
+class ExerciseInfo:
+    # Fila de data/exercises.csv (tabla exercises)
+    id: int
+    name: str
+    muscle_groups: Tuple[str, ...]
+    met: Optional[float] = None
+
+@dataclass(frozen=True, slots=True)
+class Exercise:
+    name: str
+    duration_seconds: Optional[int] = None
+    sets: Optional[int] = None
+    reps: Optional[int] = None
+    rest_seconds: Optional[int] = None
+    # La duración es por lado ("30s cada lado")
+    per_side: bool = False
+    # exercises.exercise_id y su MET (data/exercises.csv); None si el
+    # ejercicio no está en la tabla
+    exercise_id: Optional[int] = None
+    met: Optional[float] = None
+
+    @property
+    def work_seconds(self) -> Optional[int]:
+        # Tiempo total del ejercicio; None si va por series
+        if self.duration_seconds is None:
+            return None
+        return self.duration_seconds * (2 if self.per_side else 1)
+
+    @property
+    def duration(self) -> Optional[str]:
+        if self.duration_seconds is None:
+            return None
+        text = format_seconds(self.duration_seconds)
+        return f"{text} cada lado" if self.per_side else text
+
+    @property
+    def rest(self) -> Optional[str]:
+        return format_seconds(self.rest_seconds) if self.rest_seconds else None
+
+    @property
+    def detail(self) -> str:
+        if self.duration_seconds is not None:
+            return self.duration
+        if self.sets is not None:
+            return f"{self.sets}x{self.reps}"
+        return ""
+
+@dataclass(frozen=True, slots=True)
+class Workout:
+    id: int
+    name: str
+    duration_minutes: int
+    level: str
+    calories_min: int
+    calories_max: int
+    image: str
+    category: str
+    description: str
+    exercises: Tuple[Exercise, ...]
+    rating: float
+    completions: int
+
+    @property
+    def duration(self) -> str:
+        return f"{self.duration_minutes} min"
+
+    @property
+    def calories(self) -> str:
+        if self.calories_min == self.calories_max:
+            return str(self.calories_max)
+        return f"{self.calories_min}-{self.calories_max}"
+
+@dataclass(frozen=True, slots=True)
+class KidsActivity:
+    id: int
+    name: str
+    type: str
+    duration: str
+    age: str
+    image: str
+    difficulty: str
+    materials: Tuple[str, ...]
+    steps: Tuple[str, ...]
+    benefits: Tuple[str, ...]
+    adult_supervision: bool = False
+
+@dataclass(frozen=True, slots=True)
+class Movie:
+    id: int
+    title: str
+    genre: str
+    duration: str
+    rating: float
+    image: str
+    description: str
+    year: int
+    cast: Tuple[str, ...]
+
+# Nutrición: ingredientes con sus valores por 100 g, comidas con las
+# cantidades de cada ingrediente (meal_ingredients) y planes con sus metas
+# de calorías y reparto de macronutrientes. Los totales de cada comida y
+# plan no se guardan: los calcula fithome.nutrition.
+
+# (tipo, etiqueta, franja horaria, % de las calorías del día) en el orden
+# del día, como meal_types (typical_calories_percentage)
+MEAL_TYPES = (
+    ("desayuno", "Desayuno", "07:00 - 09:00", 25),
+    ("snack_morning", "Media mañana", "10:30 - 11:30", 10),
+    ("almuerzo", "Almuerzo", "12:00 - 14:00", 35),
+    ("snack_afternoon", "Merienda", "16:00 - 17:00", 10),
+    ("cena", "Cena", "19:00 - 21:00", 20),
+)
+
+# Códigos de allergen_types de los ingredientes y su etiqueta
+ALLERGENS = {
+    "gluten": "Gluten",
+    "lactosa": "Lactosa",
+    "frutos_secos": "Frutos secos",
+    "pescado": "Pescado",
+    "huevo": "Huevo",
+    "soja": "Soja",
+}
+
+@dataclass(frozen=True, slots=True)
+class Ingredient:
+    id: int
+    name: str
+    category: str
+    # Por 100 g
+    calories: float
+    protein: float
+    carbs: float
+    fat: float
+    fiber: float
+    allergens: Tuple[str, ...] = ()
+
+@dataclass(frozen=True, slots=True)
+class MealIngredient:
+    ingredient_id: int
+    grams: float
+    is_optional: bool = False
+    substitutes: Tuple[int, ...] = ()
+
+@dataclass(frozen=True, slots=True)
+class Meal:
+    id: int
+    name: str
+    meal_type: str
+    plan_id: int
+    preparation_minutes: Optional[int]
+    difficulty: str
+    instructions: str
+    ingredients: Tuple[MealIngredient, ...]
+
+@dataclass(frozen=True, slots=True)
+class NutritionPlan:
+    id: int
+    name: str
+    description: str
+    target_goal: str
+    calories_min: int
+    calories_max: int
+    # Reparto objetivo de la energía (%)
+    carb_percentage: int
+    protein_percentage: int
+    fat_percentage: int
+    tips: Tuple[str, ...]
+
+    @property
+    def calories(self) -> str:
+        return f"{self.calories_min}-{self.calories_max} kcal/día"
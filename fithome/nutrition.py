@@ -0,0 +1,174 @@
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fithome.models import Ingredient, Meal, NutritionPlan
+
+# Motor de nutrición. La tabla de ingredientes se carga una vez en una
+# matriz (ingrediente x nutriente, por gramo) y las comidas se guardan como
+# matriz dispersa comidas x ingredientes en formato COO (fila, columna,
+# gramos). Los totales de todas las comidas salen de un único producto
+# disperso: gramos x valores del ingrediente por entrada y suma por fila
+# con bincount; los de los planes, sumando las filas de sus comidas.
+#
+# Editar un ingrediente no recalcula nada más: la diferencia por gramo se
+# multiplica por las entradas que lo usan (índice por columna) y se suma a
+# esas comidas y a sus planes. Los ingredientes opcionales no cuentan.
+
+NUTRIENTS = ('calories', 'protein', 'carbs', 'fat', 'fiber')
+CALORIES, PROTEIN, CARBS, FAT, FIBER = range(len(NUTRIENTS))
+
+# Energía por gramo de cada macronutriente (reparto en % de la energía)
+KCAL_PER_GRAM_CARBS = 4
+KCAL_PER_GRAM_PROTEIN = 4
+KCAL_PER_GRAM_FAT = 9
+
+@dataclass(frozen=True, slots=True)
+class Macros:
+    calories: float = 0.0
+    protein: float = 0.0
+    carbs: float = 0.0
+    fat: float = 0.0
+    fiber: float = 0.0
+
+    @classmethod
+    def from_row(cls, row) -> "Macros":
+        return cls(*(float(value) for value in row))
+
+    @property
+    def energy_split(self) -> Tuple[int, int, int]:
+        # % de la energía de carbohidratos, proteínas y grasas
+        carbs = self.carbs * KCAL_PER_GRAM_CARBS
+        protein = self.protein * KCAL_PER_GRAM_PROTEIN
+        fat = self.fat * KCAL_PER_GRAM_FAT
+        total = carbs + protein + fat
+        if not total:
+            return 0, 0, 0
+        return round(100 * carbs / total), round(100 * protein / total), round(100 * fat / total)
+
+def per_gram(ingredient: Ingredient) -> Tuple[float, ...]:
+    return tuple(getattr(ingredient, name) / 100 for name in NUTRIENTS)
+
+class NutritionEngine:
+    def __init__(self, ingredients: Sequence[Ingredient], meals: Sequence[Meal], plans: Sequence[NutritionPlan]):
+        self.ingredients: Dict[int, Ingredient] = {ingredient.id: ingredient for ingredient in ingredients}
+        self.meals = tuple(meals)
+        self.plans = tuple(plans)
+        self._ingredient_pos = {ingredient_id: i for i, ingredient_id in enumerate(self.ingredients)}
+        self._meal_pos = {meal.id: i for i, meal in enumerate(self.meals)}
+        self._plan_pos = {plan.id: i for i, plan in enumerate(self.plans)}
+        self._lock = threading.Lock()
+
+        self.values = np.array(
+            [per_gram(ingredient) for ingredient in self.ingredients.values()], dtype=np.float64
+        ).reshape(len(self.ingredients), len(NUTRIENTS))
+
+        # Entradas COO de la matriz comidas x ingredientes
+        entries = [
+            (row, self._ingredient_pos[item.ingredient_id], item.grams)
+            for row, meal in enumerate(self.meals)
+            for item in meal.ingredients
+            if not item.is_optional and item.ingredient_id in self._ingredient_pos
+        ]
+        self.rows = np.fromiter((entry[0] for entry in entries), dtype=np.int64, count=len(entries))
+        self.cols = np.fromiter((entry[1] for entry in entries), dtype=np.int64, count=len(entries))
+        self.grams = np.fromiter((entry[2] for entry in entries), dtype=np.float64, count=len(entries))
+
+        # Índice por columna: entradas de cada ingrediente, contiguas
+        self._by_ingredient = np.argsort(self.cols, kind='stable')
+        self._ingredient_starts = np.searchsorted(
+            self.cols[self._by_ingredient], np.arange(len(self.ingredients) + 1)
+        )
+
+        # Plan de cada comida (-1 si el plan no existe)
+        self.meal_plan = np.array([self._plan_pos.get(meal.plan_id, -1) for meal in self.meals], dtype=np.int64)
+
+        self.meal_totals = self._meal_product()
+        self.plan_totals = self._plan_sum(self.meal_totals)
+
+    def _meal_product(self) -> np.ndarray:
+        contributions = self.grams[:, None] * self.values[self.cols]
+        return np.column_stack([
+            np.bincount(self.rows, weights=contributions[:, k], minlength=len(self.meals))
+            for k in range(len(NUTRIENTS))
+        ]).reshape(len(self.meals), len(NUTRIENTS))
+
+    def _plan_sum(self, meal_totals: np.ndarray) -> np.ndarray:
+        planned = self.meal_plan >= 0
+        return np.column_stack([
+            np.bincount(self.meal_plan[planned], weights=meal_totals[planned, k], minlength=len(self.plans))
+            for k in range(len(NUTRIENTS))
+        ]).reshape(len(self.plans), len(NUTRIENTS))
+
+    def update_ingredient(self, ingredient: Ingredient) -> int:
+        # Sustituye los valores de un ingrediente y corrige solo las
+        # comidas y planes que lo usan; devuelve cuántas comidas cambiaron
+        with self._lock:
+            position = self._ingredient_pos.get(ingredient.id)
+            if position is None:
+                # Ingrediente nuevo: ninguna comida lo usa todavía
+                self._ingredient_pos[ingredient.id] = len(self.ingredients)
+                self.ingredients[ingredient.id] = ingredient
+                self.values = np.vstack([self.values, per_gram(ingredient)])
+                self._ingredient_starts = np.append(self._ingredient_starts, self._ingredient_starts[-1])
+                return 0
+            new_values = np.array(per_gram(ingredient))
+            delta = new_values - self.values[position]
+            self.values[position] = new_values
+            self.ingredients[ingredient.id] = ingredient
+            entries = self._by_ingredient[self._ingredient_starts[position]:self._ingredient_starts[position + 1]]
+            if not len(entries) or not delta.any():
+                return 0
+            rows = self.rows[entries]
+            change = self.grams[entries][:, None] * delta
+            np.add.at(self.meal_totals, rows, change)
+            plans = self.meal_plan[rows]
+            planned = plans >= 0
+            np.add.at(self.plan_totals, plans[planned], change[planned])
+            return len(np.unique(rows))
+
+    def meal(self, meal_id: int) -> Macros:
+        return Macros.from_row(self.meal_totals[self._meal_pos[meal_id]])
+
+    def plan(self, plan_id: int) -> Macros:
+        return Macros.from_row(self.plan_totals[self._plan_pos[plan_id]])
+
+    def plan_meals(self, plan_id: int) -> List[Meal]:
+        return [meal for meal in self.meals if meal.plan_id == plan_id]
+
+    def ingredient_lines(self, meal: Meal) -> List[Tuple[Ingredient, float, bool]]:
+        # (ingrediente, gramos, opcional) para mostrar la receta
+        return [
+            (self.ingredients[item.ingredient_id], item.grams, item.is_optional)
+            for item in meal.ingredients
+            if item.ingredient_id in self.ingredients
+        ]
+
+# Un motor por catálogo. Si al recargar el catálogo solo cambiaron
+# ingredientes (mismas comidas y planes), se actualiza el motor existente
+# con update_ingredient en vez de reconstruirlo.
+_engine: Optional[Tuple[object, NutritionEngine]] = None
+_engine_lock = threading.Lock()
+
+def nutrition_engine() -> NutritionEngine:
+    global _engine
+    from fithome.catalog import get_catalog
+    catalog = get_catalog()
+    cached = _engine
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+    with _engine_lock:
+        cached = _engine
+        if cached is None or cached[0] is not catalog:
+            engine = cached[1] if cached is not None else None
+            if engine is not None and engine.meals == catalog.meals and engine.plans == catalog.nutrition_plans \
+                    and engine.ingredients.keys() <= {ingredient.id for ingredient in catalog.ingredients}:
+                for ingredient in catalog.ingredients:
+                    if engine.ingredients.get(ingredient.id) != ingredient:
+                        engine.update_ingredient(ingredient)
+            else:
+                engine = NutritionEngine(catalog.ingredients, catalog.meals, catalog.nutrition_plans)
+            cached = _engine = (catalog, engine)
+    return cached[1]
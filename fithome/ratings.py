@@ -0,0 +1,64 @@
+import argparse
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+# Valoración media de cada entrenamiento guardada como suma y número de
+# valoraciones (workout_ratings): cada sesión valorada suma en O(1) en vez
+# de recalcular AVG() sobre todas las sesiones del entrenamiento.
+
+logger = logging.getLogger(__name__)
+
+@dataclass(frozen=True, slots=True)
+class RatingAggregate:
+    rating_sum: int = 0
+    rating_count: int = 0
+
+    @property
+    def average(self) -> Optional[float]:
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    def add(self, rating: int) -> "RatingAggregate":
+        return RatingAggregate(self.rating_sum + rating, self.rating_count + 1)
+
+class RatingAggregator:
+    # Acumula las valoraciones de un lote por entrenamiento; el resultado se
+    # suma a las filas existentes con un único upsert por entrenamiento
+    def __init__(self):
+        self.ratings: Dict[int, RatingAggregate] = {}
+
+    def add(self, workout_id: int, rating: Optional[int]):
+        if rating is None:
+            return
+        self.ratings[workout_id] = self.ratings.get(workout_id, RatingAggregate()).add(rating)
+
+    def __bool__(self):
+        return bool(self.ratings)
+
+def from_history(rows: Iterable[Tuple[int, Optional[int]]]) -> Dict[int, RatingAggregate]:
+    # Reconstrucción completa (migraciones o backfill) a partir de pares
+    # (workout_id, difficulty_rating); admite un cursor sin cargarlo entero
+    aggregator = RatingAggregator()
+    for workout_id, rating in rows:
+        aggregator.add(workout_id, rating)
+    return aggregator.ratings
+
+# Backfill tras importar sesiones por fuera de apply():
+#     python -m fithome.ratings --rebuild
+def main():
+    from fithome.storage import get_backend
+    parser = argparse.ArgumentParser(description="Valoraciones de los entrenamientos (workout_ratings)")
+    parser.add_argument("--rebuild", action="store_true", help="reconstruye workout_ratings desde workout_sessions")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    if not args.rebuild:
+        parser.error("indica --rebuild")
+    started = time.perf_counter()
+    workouts = get_backend().rebuild_ratings()
+    logger.info("Valoraciones de %d entrenamientos en %.1f s", workouts, time.perf_counter() - started)
+
+if __name__ == "__main__":
+    main()
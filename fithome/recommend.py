@@ -0,0 +1,290 @@
+import argparse
+import datetime
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from fithome.models import UserProfile, Workout
+from fithome.ratings import RatingAggregate
+from fithome.search import normalize
+
+# Recomendación de entrenamientos. El catálogo se convierte una vez en
+# vectores NumPy (nivel, categoría y una puntuación base con valoración y
+# popularidad) y cada usuario se puntúa contra todo el catálogo con
+# operaciones vectorizadas; el top-k sale de argpartition, sin ordenar el
+# catálogo entero. El mismo código puntúa un usuario (pestaña de inicio) o
+# un bloque de usuarios (precálculo nocturno en user_recommendations, que la
+# pestaña de inicio lee mientras siga vigente).
+
+logger = logging.getLogger(__name__)
+
+LEVELS = ('principiante', 'intermedio', 'avanzado')
+UNKNOWN_LEVEL = len(LEVELS)
+
+# Relevancia por [nivel del usuario, nivel del entrenamiento], con la misma
+# escala que GetWorkoutRecommendations: 3 mismo nivel, 2 uno por debajo,
+# 1 principiante para quien ya no lo es; más difícil que el usuario queda
+# excluido. Sin nivel conocido (fila/columna 3) todo vale 2.
+_EXCLUDED = -np.inf
+LEVEL_RELEVANCE = np.array([
+    [3, _EXCLUDED, _EXCLUDED, 2],
+    [1, 3, _EXCLUDED, 2],
+    [1, 2, 3, 2],
+    [2, 2, 2, 2],
+], dtype=np.float32) / 3
+
+# Objetivos del onboarding -> peso de cada categoría del catálogo
+GOAL_CATEGORIES: Dict[str, Dict[str, float]] = {
+    'perder peso': {'cardio': 1.0, 'core': 0.5, 'fuerza': 0.5},
+    'ganar musculo': {'fuerza': 1.0, 'core': 0.5},
+    'mantenerse en forma': {'cardio': 0.5, 'fuerza': 0.5, 'flexibilidad': 0.5, 'core': 0.5},
+    'mejorar resistencia': {'cardio': 1.0, 'core': 0.3},
+    'rehabilitacion': {'flexibilidad': 1.0, 'core': 0.3},
+    'competir': {'cardio': 0.7, 'fuerza': 0.7, 'core': 0.5},
+}
+
+# Historial que se tiene en cuenta y vida media de la penalización por
+# repetir un entrenamiento reciente
+HISTORY_DAYS = 28
+REPEAT_HALF_LIFE_DAYS = 3.0
+
+# Valoraciones: media bayesiana que parte de la valoración del catálogo
+# como si fueran RATING_PRIOR_COUNT votos
+RATING_PRIOR_COUNT = 5
+MAX_RATING = 5.0
+
+# Usuarios puntuados a la vez en el precálculo (matriz usuarios x catálogo)
+BATCH_USERS = 64
+
+@dataclass(frozen=True, slots=True)
+class ScoreWeights:
+    level: float = 3.0
+    goals: float = 2.0
+    rating: float = 1.0
+    popularity: float = 0.5
+    affinity: float = 0.75
+    repeat: float = 1.5
+
+WEIGHTS = ScoreWeights()
+
+@dataclass(frozen=True, slots=True)
+class UserPreferences:
+    user_id: Optional[int]
+    fitness_level: str = ""
+    goals: Tuple[str, ...] = ()
+    # (workout_id, días desde la sesión) de las sesiones recientes
+    recent: Tuple[Tuple[int, float], ...] = ()
+
+def preferences_for(user_id: Optional[int], profile: UserProfile,
+                    recent: Iterable[Tuple[int, datetime.datetime]] = (),
+                    now: Optional[datetime.datetime] = None) -> UserPreferences:
+    now = now or datetime.datetime.now()
+    return UserPreferences(
+        user_id=user_id,
+        fitness_level=profile.fitness_level,
+        goals=tuple(profile.goals),
+        recent=tuple(
+            (workout_id, max(0.0, (now - completed_at).total_seconds() / 86400))
+            for workout_id, completed_at in recent
+        ),
+    )
+
+def level_index(level: str) -> int:
+    try:
+        return LEVELS.index(normalize(level or ""))
+    except ValueError:
+        return UNKNOWN_LEVEL
+
+class WorkoutFeatures:
+    # Vectores del catálogo, alineados por posición con `workouts`
+    def __init__(self, workouts: Sequence[Workout], ratings: Mapping[int, RatingAggregate],
+                 weights: ScoreWeights = WEIGHTS):
+        self.workouts = tuple(workouts)
+        self.weights = weights
+        count = len(self.workouts)
+
+        self.categories: List[str] = []
+        category_codes: Dict[str, int] = {}
+        self.ids = np.empty(count, dtype=np.int64)
+        self.level = np.empty(count, dtype=np.int8)
+        self.category = np.empty(count, dtype=np.int32)
+        prior = np.empty(count, dtype=np.float32)
+        completions = np.empty(count, dtype=np.float32)
+        rating_sum = np.zeros(count, dtype=np.float32)
+        rating_count = np.zeros(count, dtype=np.float32)
+
+        for position, workout in enumerate(self.workouts):
+            category = normalize(workout.category)
+            if category not in category_codes:
+                category_codes[category] = len(self.categories)
+                self.categories.append(category)
+            self.ids[position] = workout.id
+            self.level[position] = level_index(workout.level)
+            self.category[position] = category_codes[category]
+            prior[position] = workout.rating
+            completions[position] = workout.completions
+            aggregate = ratings.get(workout.id)
+            if aggregate is not None:
+                rating_sum[position] = aggregate.rating_sum
+                rating_count[position] = aggregate.rating_count
+
+        self.category_codes = category_codes
+        # Búsqueda de posiciones por id (ids del historial -> columnas)
+        self._id_order = np.argsort(self.ids, kind="stable")
+        self._sorted_ids = self.ids[self._id_order]
+
+        rating = (prior * RATING_PRIOR_COUNT + rating_sum) / (RATING_PRIOR_COUNT + rating_count)
+        popularity = np.log1p(completions + rating_count)
+        if count and popularity.max() > 0:
+            popularity /= popularity.max()
+        self.base = (weights.rating * rating / MAX_RATING + weights.popularity * popularity).astype(np.float32)
+
+    def __len__(self):
+        return len(self.workouts)
+
+    def positions(self, workout_ids: np.ndarray) -> np.ndarray:
+        # Posición de cada id en el catálogo, -1 si ya no existe
+        if not len(self._sorted_ids):
+            return np.full(len(workout_ids), -1, dtype=np.int64)
+        found = np.minimum(np.searchsorted(self._sorted_ids, workout_ids), len(self._sorted_ids) - 1)
+        positions = self._id_order[found]
+        return np.where(self._sorted_ids[found] == workout_ids, positions, -1)
+
+    def goal_vector(self, goals: Iterable[str]) -> np.ndarray:
+        vector = np.zeros(len(self.categories), dtype=np.float32)
+        for goal in goals:
+            for category, weight in GOAL_CATEGORIES.get(normalize(goal), {}).items():
+                code = self.category_codes.get(category)
+                if code is not None:
+                    vector[code] = max(vector[code], weight)
+        return vector
+
+    def scores(self, users: Sequence[UserPreferences]) -> np.ndarray:
+        # Matriz usuarios x catálogo; los entrenamientos excluidos valen -inf
+        weights = self.weights
+        user_levels = np.array([level_index(user.fitness_level) for user in users], dtype=np.int8)
+        goals = np.stack([self.goal_vector(user.goals) for user in users]) if users else \
+            np.zeros((0, len(self.categories)), dtype=np.float32)
+
+        scores = weights.level * LEVEL_RELEVANCE[user_levels[:, None], self.level[None, :]]
+        scores += self.base
+        scores += weights.goals * goals[:, self.category]
+
+        # Historial: afinidad por las categorías que el usuario hace y
+        # penalización (con decaimiento) por repetir entrenamientos recientes
+        rows, workout_ids, ages = [], [], []
+        for row, user in enumerate(users):
+            for workout_id, days in user.recent:
+                rows.append(row)
+                workout_ids.append(workout_id)
+                ages.append(days)
+        if rows:
+            rows = np.asarray(rows, dtype=np.int64)
+            columns = self.positions(np.asarray(workout_ids, dtype=np.int64))
+            known = columns >= 0
+            rows, columns = rows[known], columns[known]
+            decay = np.power(0.5, np.asarray(ages, dtype=np.float32)[known] / REPEAT_HALF_LIFE_DAYS)
+
+            affinity = np.zeros((len(users), len(self.categories)), dtype=np.float32)
+            np.add.at(affinity, (rows, self.category[columns]), 1.0)
+            sessions = affinity.sum(axis=1, keepdims=True)
+            np.divide(affinity, sessions, out=affinity, where=sessions > 0)
+            scores += weights.affinity * affinity[:, self.category]
+
+            np.add.at(scores, (rows, columns), -weights.repeat * decay)
+        return scores
+
+    def top_k(self, users: Sequence[UserPreferences], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        # (posiciones, puntuaciones) de los k mejores por usuario, de mayor a
+        # menor; las posiciones excluidas se devuelven como -1
+        scores = self.scores(users)
+        k = min(k, len(self))
+        if k <= 0:
+            return np.empty((len(users), 0), dtype=np.int64), np.empty((len(users), 0), dtype=np.float32)
+        if k < len(self):
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        else:
+            candidates = np.broadcast_to(np.arange(len(self)), scores.shape)
+        candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+        order = np.argsort(-candidate_scores, axis=1, kind="stable")
+        positions = np.take_along_axis(candidates, order, axis=1)
+        top_scores = np.take_along_axis(candidate_scores, order, axis=1)
+        positions = np.where(np.isfinite(top_scores), positions, -1)
+        return positions, top_scores
+
+    def recommend(self, user: UserPreferences, k: int) -> List[Workout]:
+        positions, _ = self.top_k([user], k)
+        return [self.workouts[position] for position in positions[0] if position >= 0]
+
+# Vectores del catálogo compartidos por el proceso. Se reconstruyen cuando
+# cambia el catálogo o cuando las valoraciones tienen más de
+# FEATURES_MAX_AGE segundos (las sesiones nuevas solo mueven la media).
+FEATURES_MAX_AGE = 600
+
+_features: Optional[Tuple[object, float, WorkoutFeatures]] = None
+_features_lock = threading.Lock()
+
+def workout_features() -> WorkoutFeatures:
+    global _features
+    from fithome.catalog import get_catalog
+    from fithome.storage import get_backend
+    catalog = get_catalog()
+    cached = _features
+    if cached is not None and cached[0] is catalog and time.monotonic() - cached[1] < FEATURES_MAX_AGE:
+        return cached[2]
+    with _features_lock:
+        cached = _features
+        if cached is None or cached[0] is not catalog or time.monotonic() - cached[1] >= FEATURES_MAX_AGE:
+            features = WorkoutFeatures(catalog.workouts, get_backend().load_workout_ratings())
+            cached = _features = (catalog, time.monotonic(), features)
+    return cached[2]
+
+def recommend_workouts(user: UserPreferences, k: int = 2) -> List[Workout]:
+    return workout_features().recommend(user, k)
+
+# Precálculo para todos los usuarios (tarea nocturna):
+#     python -m fithome.recommend --top 10
+def precompute_all(backend=None, k: int = 10, batch_users: int = BATCH_USERS,
+                   now: Optional[datetime.datetime] = None) -> int:
+    from fithome.storage import get_backend
+    backend = backend or get_backend()
+    now = now or datetime.datetime.now()
+    since = now - datetime.timedelta(days=HISTORY_DAYS)
+    features = workout_features()
+    total = 0
+    for chunk in backend.iter_user_preferences(batch_size=batch_users):
+        recent = backend.load_recent_sessions([user_id for user_id, _, _ in chunk], since)
+        users = [
+            preferences_for(user_id, UserProfile(fitness_level=level, goals=goals), recent.get(user_id, ()), now)
+            for user_id, level, goals in chunk
+        ]
+        positions, scores = features.top_k(users, k)
+        backend.save_recommendations(
+            [user.user_id for user in users],
+            [
+                (user.user_id, rank, int(features.ids[position]), float(score))
+                for user, user_positions, user_scores in zip(users, positions, scores)
+                for rank, (position, score) in enumerate(zip(user_positions, user_scores))
+                if position >= 0
+            ],
+            now,
+        )
+        total += len(users)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description="Precalcula las recomendaciones de todos los usuarios")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--batch-users", type=int, default=BATCH_USERS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    users = precompute_all(k=args.top, batch_users=args.batch_users)
+    logger.info("Recomendaciones de %d usuarios en %.1f s", users, time.perf_counter() - started)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import datetime
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Tuple
+
+# Actividad por usuario agrupada por día, semana (lunes) y mes en
+# activity_rollups. Cada lote de sesiones suma sus cubos con un upsert
+# aditivo en la misma transacción que las registra, así que la gráfica
+# semanal y la meta del mes leen unas pocas filas en vez de reagrupar
+# daily_stats o workout_sessions.
+#
+# Como las sumas son aditivas, un cubo puede escribirse en varias veces: la
+# reconstrucción (backfill) recorre el historial por bloques y vuelca los
+# cubos acumulados cada `max_buckets`, con memoria acotada aunque el
+# historial sea de años.
+
+logger = logging.getLogger(__name__)
+
+DAY = 'day'
+WEEK = 'week'
+MONTH = 'month'
+PERIODS = (DAY, WEEK, MONTH)
+
+# Cubos en memoria antes de volcarlos durante la reconstrucción
+MAX_BUCKETS = 20_000
+
+def period_start(period: str, day: datetime.date) -> datetime.date:
+    if period == WEEK:
+        return day - datetime.timedelta(days=day.weekday())
+    if period == MONTH:
+        return day.replace(day=1)
+    return day
+
+@dataclass(frozen=True, slots=True)
+class ActivityBucket:
+    workouts: int = 0
+    minutes: int = 0
+    calories: int = 0
+
+class RollupAggregator:
+    # Acumula un lote por (usuario, periodo, inicio); el resultado se suma a
+    # las filas existentes con un único upsert por cubo
+    def __init__(self):
+        self.buckets: Dict[Tuple[int, str, datetime.date], List[int]] = {}
+
+    def add(self, user_id: int, day: datetime.date, workouts: int = 0, minutes: int = 0, calories: int = 0):
+        for period in PERIODS:
+            totals = self.buckets.setdefault((user_id, period, period_start(period, day)), [0, 0, 0])
+            totals[0] += workouts
+            totals[1] += minutes
+            totals[2] += calories
+
+    def rows(self) -> List[Tuple[int, str, str, int, int, int]]:
+        # En orden de clave primaria: el upsert recorre el índice en orden
+        # en vez de saltar por todo el árbol
+        return sorted(
+            (user_id, period, start.isoformat(), *totals)
+            for (user_id, period, start), totals in self.buckets.items()
+        )
+
+    def __len__(self):
+        return len(self.buckets)
+
+    def __bool__(self):
+        return bool(self.buckets)
+
+def stream_rollups(rows: Iterable[Tuple[int, datetime.date, int, int]],
+                   flush: Callable[[RollupAggregator], None], max_buckets: int = MAX_BUCKETS) -> int:
+    # Reconstrucción a partir de (user_id, día, minutos, calorías) por
+    # sesión; admite un cursor sin cargarlo entero. Devuelve las sesiones leídas
+    aggregator = RollupAggregator()
+    sessions = 0
+    for user_id, day, minutes, calories in rows:
+        aggregator.add(user_id, day, 1, minutes, calories)
+        sessions += 1
+        if len(aggregator) >= max_buckets:
+            flush(aggregator)
+            aggregator = RollupAggregator()
+    if aggregator:
+        flush(aggregator)
+    return sessions
+
+def week_minutes(days: Dict[datetime.date, ActivityBucket], week_start: datetime.date) -> List[int]:
+    # Minutos de lunes a domingo a partir de los cubos diarios de la semana
+    return [
+        days.get(week_start + datetime.timedelta(days=offset), ActivityBucket()).minutes
+        for offset in range(7)
+    ]
+
+def main():
+    from fithome.storage import get_backend
+    parser = argparse.ArgumentParser(description="Reconstruye activity_rollups desde workout_sessions")
+    parser.add_argument("--max-buckets", type=int, default=MAX_BUCKETS)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    started = time.perf_counter()
+    sessions = get_backend().rebuild_rollups(max_buckets=args.max_buckets)
+    logger.info("Cubos de actividad de %d sesiones en %.1f s", sessions, time.perf_counter() - started)
+
+if __name__ == "__main__":
+    main()
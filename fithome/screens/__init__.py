@@ -0,0 +1,3 @@
+# Pantallas de fitness_app.py, una por módulo. fitness_app.py las importa
+# solo cuando se muestran, así que el arranque no carga código (ni
+# dependencias) de pantallas que la sesión todavía no ha visitado.
@@ -0,0 +1,56 @@
+import streamlit as st
+
+from fithome.screens.persistence import load_user_state
+from fithome.storage import EmailAlreadyRegistered, get_backend
+
+# Inicio de sesión y registro
+
+def auth_screen():
+    st.markdown("""
+    <div style="text-align: center; margin-bottom: 3rem;">
+        <div style="font-size: 3rem; margin-bottom: 1rem;">💪</div>
+        <h1 style="color: #667eea;">FitHome Pro</h1>
+        <p style="color: #666;">Tu entrenador personal en casa</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    tab1, tab2 = st.tabs(["Iniciar Sesión", "Registrarse"])
+    
+    with tab1:
+        st.subheader("Bienvenido de vuelta")
+        email = st.text_input("Correo electrónico", key="login_email")
+        password = st.text_input("Contraseña", type="password", key="login_password")
+        
+        if st.button("Iniciar Sesión", key="login_btn"):
+            if email and password:
+                user_id = get_backend().authenticate(email, password)
+                if user_id is None:
+                    st.error("Correo o contraseña incorrectos")
+                    return
+                st.session_state.user = {"email": email, "user_id": user_id}
+                load_user_state(user_id)
+                
+                if st.session_state.user_profile.gender:
+                    st.session_state.current_screen = 'dashboard'
+                else:
+                    st.session_state.current_screen = 'onboarding'
+                st.rerun()
+    
+    with tab2:
+        st.subheader("Únete a la familia fitness")
+        name = st.text_input("Nombre completo", key="register_name")
+        email = st.text_input("Correo electrónico", key="register_email")
+        password = st.text_input("Contraseña", type="password", key="register_password")
+        
+        if st.button("Registrarse", key="register_btn"):
+            if name and email and password:
+                try:
+                    user_id = get_backend().create_user(name, email, password)
+                except EmailAlreadyRegistered:
+                    st.error("Ya existe una cuenta con ese correo")
+                    return
+                st.session_state.user = {"email": email, "user_id": user_id}
+                st.session_state.user_profile.name = name
+                st.session_state.user_profile.email = email
+                st.session_state.current_screen = 'onboarding'
+                st.rerun()
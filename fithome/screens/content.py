@@ -0,0 +1,19 @@
+from fithome.catalog import get_catalog
+
+# Datos de la aplicación (catálogo compartido entre sesiones). El catálogo
+# se carga la primera vez que una pantalla lo pide.
+
+def get_workouts():
+    return get_catalog().workouts
+
+def get_kids_activities():
+    return get_catalog().kids_activities
+
+def get_movies():
+    return get_catalog().movies
+
+def get_nutrition_plans():
+    return get_catalog().nutrition_plans
+
+def get_nutrition_meals():
+    return get_catalog().meals
@@ -0,0 +1,34 @@
+import importlib
+
+import streamlit as st
+
+# Dashboard: barra lateral de navegación y pestañas
+
+PAGES = {
+    "🏠 Inicio": ("fithome.screens.home", "home_tab"),
+    "💪 Entrenamientos": ("fithome.screens.workouts", "workouts_tab"),
+    "🍎 Nutrición": ("fithome.screens.nutrition", "nutrition_tab"),
+    "👶 Zona Infantil": ("fithome.screens.kids", "kids_tab"),
+    "🎬 Películas": ("fithome.screens.movies", "movies_tab"),
+    "📊 Progreso": ("fithome.screens.stats", "stats_tab"),
+}
+
+def dashboard():
+    # Sidebar para navegación
+    with st.sidebar:
+        st.markdown(f"""
+        <div style="text-align: center; padding: 1rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); border-radius: 1rem; color: white; margin-bottom: 1rem;">
+            <h3>¡Hola {st.session_state.user_profile.name or 'Usuario'}! 👋</h3>
+            <p>Racha: {st.session_state.user_stats.streak_days} días 🔥</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        page = st.selectbox(
+            "Navegación",
+            list(PAGES)
+        )
+    
+    # Contenido principal basado en la página seleccionada; cada pestaña se
+    # importa la primera vez que se abre
+    module_name, function_name = PAGES[page]
+    getattr(importlib.import_module(module_name), function_name)()
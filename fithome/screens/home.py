@@ -0,0 +1,138 @@
+import datetime
+
+import streamlit as st
+
+from fithome.catalog import get_catalog
+from fithome.screens.content import get_workouts
+from fithome.screens.persistence import save_water_intake, session_store
+from fithome.screens.state import current_user_id, ui_theme
+from fithome.ui import fragments
+
+# Pestaña de inicio: resumen del día, hidratación y recomendaciones
+
+RECOMMENDATIONS = 2
+
+# Vigencia de las recomendaciones precalculadas (python -m fithome.recommend)
+PRECOMPUTED_MAX_AGE = datetime.timedelta(days=1)
+
+def precomputed_workouts(user_id):
+    # Las del precálculo nocturno si siguen vigentes: de menos de un día y
+    # sin entrenamientos posteriores (cambian la penalización por repetir).
+    # Guardar el perfil las borra
+    store = session_store()
+    computed_at, workout_ids = store.recommendations(user_id)
+    if computed_at is None or datetime.datetime.now() - computed_at > PRECOMPUTED_MAX_AGE:
+        return None
+    if any(completed_at > computed_at for _, completed_at in store.recent_sessions(user_id, computed_at.date())):
+        return None
+    catalog = get_catalog()
+    workouts = [workout for workout in map(catalog.workout, workout_ids) if workout is not None]
+    return workouts[:RECOMMENDATIONS] if len(workouts) >= RECOMMENDATIONS else None
+
+def recommended_workouts():
+    user_id = current_user_id()
+    if user_id is not None:
+        precomputed = precomputed_workouts(user_id)
+        if precomputed is not None:
+            return precomputed
+    # Puntuación en vivo: nivel y objetivos del perfil más el historial
+    # reciente (cacheado por sesión; lo que completa en la sesión se añade
+    # al registrarlo)
+    try:
+        from fithome.recommend import HISTORY_DAYS, preferences_for, recommend_workouts
+    except ImportError:
+        # Sin NumPy: los primeros del catálogo
+        return get_workouts()[:RECOMMENDATIONS]
+    recent = []
+    if user_id is not None:
+        since = datetime.date.today() - datetime.timedelta(days=HISTORY_DAYS)
+        recent = session_store().recent_sessions(user_id, since)
+    preferences = preferences_for(user_id, st.session_state.user_profile, recent)
+    return recommend_workouts(preferences, k=RECOMMENDATIONS)
+
+def home_tab():
+    st.title("Dashboard Principal")
+    
+    # Header con estadísticas
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3>{st.session_state.user_stats.streak_days}</h3>
+            <p>Racha (días)</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3>{st.session_state.user_stats.today_calories}</h3>
+            <p>Kcal hoy</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col3:
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3>{st.session_state.user_stats.today_minutes}</h3>
+            <p>Min hoy</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col4:
+        st.markdown(f"""
+        <div class="metric-container">
+            <h3>{st.session_state.user_stats.total_workouts}</h3>
+            <p>Entrenamientos</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    # Hidratación diaria
+    st.subheader("💧 Hidratación Diaria")
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        water_progress = st.session_state.water_intake / 8
+        st.progress(water_progress)
+        st.write(f"{st.session_state.water_intake}/8 vasos")
+    
+    with col2:
+        if st.button("+ Vaso"):
+            if st.session_state.water_intake < 8:
+                st.session_state.water_intake += 1
+                save_water_intake()
+                st.rerun()
+        if st.button("- Vaso"):
+            if st.session_state.water_intake > 0:
+                st.session_state.water_intake -= 1
+                save_water_intake()
+                st.rerun()
+    
+    # Entrenamientos recomendados
+    st.subheader("🔥 Entrenamientos Recomendados")
+    workouts = recommended_workouts()
+    
+    for workout in workouts:
+        with st.container():
+            st.markdown(fragments.workout_summary(workout, ui_theme()), unsafe_allow_html=True)
+            
+            if st.button(f"▶️ Iniciar {workout.name}", key=f"start_{workout.id}"):
+                st.session_state.selected_workout = workout
+                st.rerun()
+    
+    # Logros recientes
+    if st.session_state.user_stats.achievements:
+        st.subheader("🏆 Logros Recientes")
+        for achievement in st.session_state.user_stats.achievements[-3:]:
+            st.success(achievement)
+    
+    # Estado inicial sin entrenamientos
+    if st.session_state.user_stats.total_workouts == 0:
+        st.markdown("""
+        <div style="text-align: center; padding: 2rem; background: white; border-radius: 1rem; margin: 2rem 0;">
+            <div style="font-size: 3rem; margin-bottom: 1rem;">🏃‍♀️</div>
+            <h3>¡Comienza tu Viaje Fitness!</h3>
+            <p>Completa tu primer entrenamiento para empezar a ver tus estadísticas</p>
+        </div>
+        """, unsafe_allow_html=True)
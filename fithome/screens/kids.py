@@ -0,0 +1,82 @@
+import streamlit as st
+
+from fithome.kidsmatch import kids_matcher
+from fithome.screens import paging
+from fithome.screens.state import ui_theme
+from fithome.search import kids_index
+from fithome.ui import fragments
+
+# Zona infantil
+
+PAGE_SIZE = 10
+
+# Etiqueta del botón -> tipo de actividad en data/kids.csv
+TYPE_FILTERS = [
+    ("Todos", None),
+    ("DIY", "Construcción"),
+    ("Ejercicio", "Ejercicio"),
+    ("Manualidades", "Manualidad"),
+]
+
+AGES = range(1, 16)
+TIME_OPTIONS = [None, 15, 30, 45, 60, 90, 120]
+
+def family_filters(matcher):
+    # Edades, tiempo y materiales del momento; cambiar cualquiera vuelve a
+    # la primera página
+    with st.expander("👨‍👩‍👧 ¿Qué podemos hacer ahora?"):
+        col1, col2 = st.columns(2)
+        with col1:
+            ages = st.multiselect("Edades de los niños", AGES, key="kids_ages",
+                                  on_change=paging.reset_page, args=("kids",))
+        with col2:
+            minutes = st.select_slider(
+                "Tiempo disponible", TIME_OPTIONS, key="kids_minutes",
+                format_func=lambda minutes: "Sin límite" if minutes is None else f"{minutes} min",
+                on_change=paging.reset_page, args=("kids",)
+            )
+        materials = st.multiselect(
+            "Materiales que tenéis en casa", list(matcher.materials), key="kids_materials",
+            format_func=matcher.materials.get, on_change=paging.reset_page, args=("kids",)
+        )
+        adult = st.checkbox("Hay un adulto para supervisar", value=True, key="kids_adult",
+                            on_change=paging.reset_page, args=("kids",))
+    return ages, minutes, materials or None, adult
+
+def kids_tab():
+    st.title("👶 Zona Infantil")
+
+    # Filtros
+    activity_type = paging.filter_buttons("kids", TYPE_FILTERS)
+    text = paging.search_box("kids", "Nombre, materiales o beneficios")
+    matcher = kids_matcher()
+    ages, minutes, materials, adult = family_filters(matcher)
+
+    match = matcher.match(
+        ages, minutes, materials, adult,
+        base=kids_index().query(facets={'type': activity_type} if activity_type else None, text=text),
+    )
+    page = matcher.page(match, paging.current_page("kids"), PAGE_SIZE)
+
+    for activity in page.items:
+        with st.container():
+            st.markdown(fragments.kids_card(activity, ui_theme()), unsafe_allow_html=True)
+            if materials and (missing := matcher.missing(activity, materials)):
+                st.caption(f"🛒 Te falta: {', '.join(missing)}")
+
+            with st.expander(f"Ver detalles de {activity.name}"):
+                if activity.adult_supervision:
+                    st.warning("Necesita la supervisión de un adulto")
+                st.write("**Materiales necesarios:**")
+                for material in activity.materials:
+                    st.write(f"• {material}")
+
+                st.write("**Pasos a seguir:**")
+                for i, step in enumerate(activity.steps, 1):
+                    st.write(f"{i}. {step}")
+
+                st.write("**Beneficios:**")
+                for benefit in activity.benefits:
+                    st.success(benefit)
+
+    paging.pagination("kids", page)
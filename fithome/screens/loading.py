@@ -0,0 +1,39 @@
+import streamlit as st
+
+from fithome.warmup import is_done as warmup_done, start_warmup
+
+# Pantalla de carga: espera el warm-up del proceso sin bloquear el hilo
+
+def loading_screen():
+    st.markdown("""
+    <div style="text-align: center; padding: 4rem 0;">
+        <div style="font-size: 4rem; margin-bottom: 2rem;">💪</div>
+        <h1 style="color: #667eea; margin-bottom: 1rem;">FitHome Pro</h1>
+        <p style="color: #666; margin-bottom: 2rem;">Tu entrenador personal en casa</p>
+        <div style="display: flex; justify-content: center; gap: 0.5rem;">
+            <div style="width: 12px; height: 12px; background: #667eea; border-radius: 50%; animation: pulse 1.5s infinite;"></div>
+            <div style="width: 12px; height: 12px; background: #667eea; border-radius: 50%; animation: pulse 1.5s infinite 0.3s;"></div>
+            <div style="width: 12px; height: 12px; background: #667eea; border-radius: 50%; animation: pulse 1.5s infinite 0.6s;"></div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # El warm-up corre en otro hilo; mientras tanto solo se consulta su estado
+    warmup = start_warmup()
+    if not warmup.done():
+        wait_for_warmup()
+        return
+    if warmup.exception() is not None:
+        st.error("No se pudo preparar la aplicación. Inténtalo de nuevo en unos segundos.")
+        if st.button("🔄 Reintentar"):
+            start_warmup(retry=True)
+            st.rerun()
+        return
+    st.session_state.current_screen = 'auth'
+    st.rerun()
+
+@st.fragment(run_every=0.25)
+def wait_for_warmup():
+    # Se reejecuta solo este fragmento hasta que el warm-up termina
+    if warmup_done():
+        st.rerun(scope="app")
@@ -0,0 +1,48 @@
+import streamlit as st
+
+from fithome.screens.content import get_movies
+from fithome.screens.persistence import save_user_profile
+from fithome.screens.state import ui_theme
+from fithome.ui import fragments
+
+# Películas (contenido premium)
+
+def movies_tab():
+    st.title("🎬 Películas Premium")
+    
+    if not st.session_state.user_profile.is_premium:
+        st.markdown("""
+        <div class="premium-card">
+            <div style="font-size: 3rem; margin-bottom: 1rem;">👑</div>
+            <h3>Contenido Premium</h3>
+            <p>Accede a nuestra biblioteca completa de películas motivacionales y documentales educativos</p>
+            <div style="margin: 1rem 0;">
+                <p>✨ Más de 50 documentales</p>
+                <p>🎬 Contenido exclusivo</p>
+                <p>📱 Sin anuncios</p>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if st.button("🔓 Obtener Premium - $9.99/mes", key="get_premium"):
+            st.session_state.user_profile.is_premium = True
+            save_user_profile()
+            st.success("¡Bienvenido a Premium! 🎉")
+            st.rerun()
+    else:
+        movies = get_movies()
+        
+        for movie in movies:
+            with st.container():
+                st.markdown(fragments.movie_card(movie, ui_theme()), unsafe_allow_html=True)
+                
+                col1, col2, col3 = st.columns([2, 1, 1])
+                with col1:
+                    if st.button(f"▶️ Reproducir", key=f"play_{movie.id}"):
+                        st.success(f"Reproduciendo: {movie.title}")
+                with col2:
+                    if st.button("📥", key=f"download_{movie.id}"):
+                        st.info("Descarga iniciada")
+                with col3:
+                    if st.button("📤", key=f"share_{movie.id}"):
+                        st.info("Enlace copiado")
@@ -0,0 +1,198 @@
+import datetime
+
+import streamlit as st
+
+from fithome.mealindex import meal_index
+from fithome.models import ALLERGENS, MEAL_TYPES
+from fithome.screens.content import get_nutrition_meals, get_nutrition_plans
+from fithome.screens.persistence import log_food, save_user_profile, session_store
+from fithome.screens.state import current_user_id
+
+# Pestaña de nutrición: plan de comidas de la semana generado para el
+# usuario (objetivo y alergias del perfil) por fithome.mealplan. Los días
+# ya guardados por la tarea semanal (python -m fithome.mealplan) se leen de
+# user_meal_plans; el resto se genera al mostrarlos
+
+DAY_NAMES = ("Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo")
+
+def get_planner():
+    try:
+        from fithome.mealplan import meal_planner
+    except ImportError:
+        # Sin NumPy: los platos del plan, sin generar la semana
+        return None
+    return meal_planner()
+
+def stored_day(planner, plan, allergies, day: datetime.date):
+    # Día guardado del plan de la semana, si sigue valiendo para el plan y
+    # las alergias elegidos
+    user_id = current_user_id()
+    if user_id is None:
+        return None
+    monday = day - datetime.timedelta(days=day.weekday())
+    rows = session_store().meal_plan(user_id, monday, monday + datetime.timedelta(days=len(DAY_NAMES) - 1))
+    return planner.stored_days(rows, plan, allergies).get(day)
+
+def macro_box(value: str, label: str) -> str:
+    return f"""
+        <div style="background: rgba(255,255,255,0.2); padding: 1rem; border-radius: 0.5rem; text-align: center;">
+            <div style="font-weight: bold;">{value}</div>
+            <div style="font-size: 0.9rem;">{label}</div>
+        </div>"""
+
+def plan_header(plan, macros=None):
+    targets = (plan.carb_percentage, plan.protein_percentage, plan.fat_percentage)
+    labels = ("Carbohidratos", "Proteínas", "Grasas")
+    if macros is not None:
+        boxes = [macro_box(f"{actual}% <small>(objetivo {target}%)</small>", label)
+                 for actual, target, label in zip(macros.energy_split, targets, labels)]
+        calories = f"{macros.calories:.0f} kcal (objetivo {plan.calories})"
+    else:
+        boxes = [macro_box(f"{target}%", label) for target, label in zip(targets, labels)]
+        calories = plan.calories
+    st.markdown(f"""
+    <div style="background: linear-gradient(135deg, #10b981 0%, #059669 100%); padding: 2rem; border-radius: 1rem; color: white; margin-bottom: 2rem;">
+        <h3>{plan.name}</h3>
+        <p>{plan.description}</p>
+        <p>{calories}</p>
+        <div style="display: grid; grid-template-columns: 1fr 1fr 1fr; gap: 1rem; margin-top: 1rem;">{''.join(boxes)}
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+def allergy_selector():
+    profile = st.session_state.user_profile
+    selected = st.multiselect(
+        "Alergias e intolerancias",
+        list(ALLERGENS),
+        default=[code for code in profile.allergies if code in ALLERGENS],
+        format_func=ALLERGENS.get
+    )
+    if sorted(selected) != sorted(profile.allergies):
+        profile.allergies = selected
+        save_user_profile()
+    return selected
+
+def meal_lines(engine, meal, servings: float):
+    for ingredient, grams, optional in engine.ingredient_lines(meal):
+        st.write(f"• {ingredient.name}: {grams * servings:g} g" + (" (opcional)" if optional else ""))
+
+def substitutions(plan, allergies):
+    # Platos del plan con alguno de los alérgenos y cómo adaptarlos
+    if not allergies:
+        return
+    index = meal_index()
+    plan_meals = [meal for meal in get_nutrition_meals() if meal.plan_id == plan.id]
+    unsafe = index.containing(allergies)
+    affected = [meal for meal in plan_meals if (unsafe >> index.position(meal.id)) & 1]
+    if not affected:
+        return
+    names = {ingredient_id: ingredient.name for ingredient_id, ingredient in index.ingredients.items()}
+    with st.expander(f"🔄 Sustituciones para tus alergias ({len(affected)})"):
+        for meal in affected:
+            option = index.nearest_safe(meal.id, allergies)
+            if option is None:
+                st.write(f"• **{meal.name}**: sin alternativa en el catálogo")
+            elif option.adapted:
+                swaps = ", ".join(f"{names[old]} → {names[new]}" for old, new in option.swaps)
+                st.write(f"• **{meal.name}**: {swaps}")
+            else:
+                st.write(f"• **{meal.name}**: prueba {option.meal.name}")
+
+def food_log_form(engine=None, day_plan=None):
+    # Registro de lo comido hoy: una franja del plan del día u otra comida
+    st.subheader("📝 Registrar comida")
+    st.metric("Consumidas hoy", f"{st.session_state.user_stats.today_consumed} kcal")
+    labels = {meal_type: label for meal_type, label, *_ in MEAL_TYPES}
+    planned = list(day_plan.slots) if day_plan is not None else []
+    with st.form("food_form", clear_on_submit=True):
+        choice = st.selectbox(
+            "Comida", [None, *planned],
+            format_func=lambda choice: "Otra comida" if choice is None
+            else f"{labels[choice.meal_type]} del plan ({choice.macros.calories:.0f} kcal)"
+        )
+        meal_type = st.selectbox("Franja (otra comida)", list(labels), format_func=labels.get)
+        name = st.text_input("Nombre (otra comida)")
+        calories = st.number_input("Calorías (otra comida)", min_value=0, max_value=5000, step=10)
+        if st.form_submit_button("🍽️ Registrar"):
+            if choice is not None:
+                entries = [
+                    (choice.meal_type, round(engine.meal(meal_id).calories * choice.servings), meal_id, None)
+                    for meal_id in choice.meal_ids
+                ]
+            elif calories > 0:
+                entries = [(meal_type, int(calories), None, name.strip() or "Comida personalizada")]
+            else:
+                st.warning("Indica las calorías de la comida.")
+                return
+            log_food(entries)
+            st.session_state.flash_message = f"Comida registrada: {sum(entry[1] for entry in entries)} kcal"
+            st.rerun()
+
+def nutrition_tab():
+    st.title("🍎 Nutrición")
+
+    plans = get_nutrition_plans()
+    if not plans:
+        st.info("No hay planes nutricionales disponibles por ahora.")
+        return
+    planner = get_planner()
+    if planner is None:
+        plan = plans[0]
+        allergies = allergy_selector()
+        plan_header(plan)
+        for meal_type, label, hours, _ in MEAL_TYPES:
+            names = [meal.name for meal in get_nutrition_meals() if meal.plan_id == plan.id and meal.meal_type == meal_type]
+            if names:
+                with st.expander(f"🍽️ {label} ({hours})"):
+                    for name in names:
+                        st.write(f"• {name}")
+        substitutions(plan, allergies)
+        food_log_form()
+    else:
+        from fithome.mealplan import plan_for
+        profile = st.session_state.user_profile
+        suggested = plan_for(profile.goals, plans)
+        plan = st.selectbox(
+            "Plan nutricional", plans, index=plans.index(suggested), format_func=lambda plan: plan.name
+        )
+        allergies = allergy_selector()
+
+        # Semana de lunes a domingo; por defecto, hoy
+        today = datetime.date.today()
+        day = st.selectbox(
+            "Día", range(len(DAY_NAMES)), index=today.weekday(), format_func=DAY_NAMES.__getitem__
+        )
+        day_plan = stored_day(planner, plan, allergies, today + datetime.timedelta(days=day - today.weekday()))
+        if day_plan is None:
+            day_plan = planner.week(plan, allergies)[day]
+        plan_header(plan, day_plan.macros)
+
+        engine = planner.engine
+        meals = {meal.id: meal for meal in engine.meals}
+        labels = {meal_type: (label, hours) for meal_type, label, hours, _ in MEAL_TYPES}
+        if not day_plan.slots:
+            st.warning("No hay platos compatibles con tus alergias en este plan.")
+        for choice in day_plan.slots:
+            label, hours = labels[choice.meal_type]
+            with st.expander(f"🍽️ {label} ({hours}) - {choice.macros.calories:.0f} kcal"):
+                st.caption(
+                    f"{choice.servings:g} ración(es) · {choice.macros.protein:.0f} g proteínas · "
+                    f"{choice.macros.carbs:.0f} g carbohidratos · {choice.macros.fat:.0f} g grasas · "
+                    f"{choice.macros.fiber:.0f} g fibra"
+                )
+                for meal_id in choice.meal_ids:
+                    meal = meals[meal_id]
+                    st.write(f"**{meal.name}**")
+                    meal_lines(engine, meal, choice.servings)
+                    if meal.preparation_minutes:
+                        st.write(f"⏱️ {meal.preparation_minutes} min · {meal.difficulty}")
+                    if meal.instructions:
+                        st.info(meal.instructions)
+        substitutions(plan, allergies)
+        food_log_form(engine, day_plan)
+
+    # Tips nutricionales
+    st.subheader("💡 Tips del Día")
+    for tip in plan.tips:
+        st.info(f"• {tip}")
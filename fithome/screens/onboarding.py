@@ -0,0 +1,108 @@
+import streamlit as st
+
+from fithome.screens.persistence import save_user_profile
+
+# Cuestionario inicial del perfil
+
+def onboarding_screen():
+    questions = [
+        {
+            "title": "¿Cuál es tu género?",
+            "type": "gender",
+            "options": ["masculino", "femenino", "otro"]
+        },
+        {
+            "title": "¿Cuál es tu edad?",
+            "type": "age",
+            "input": True
+        },
+        {
+            "title": "¿Cuánto pesas actualmente?",
+            "type": "weight",
+            "input": True,
+            "unit": "kg"
+        },
+        {
+            "title": "¿Cuál es tu estatura?",
+            "type": "height",
+            "input": True,
+            "unit": "cm"
+        },
+        {
+            "title": "¿Cuál es tu nivel de fitness?",
+            "type": "fitness_level",
+            "options": ["principiante", "intermedio", "avanzado"]
+        },
+        {
+            "title": "¿Cuáles son tus objetivos principales?",
+            "type": "goals",
+            "options": ["perder peso", "ganar músculo", "mantenerse en forma", "mejorar resistencia", "rehabilitación", "competir"],
+            "multiple": True
+        }
+    ]
+    
+    current_question = questions[st.session_state.onboarding_step]
+    
+    st.markdown(f"""
+    <div style="text-align: center; margin-bottom: 2rem;">
+        <h2>Configuración</h2>
+        <p>Paso {st.session_state.onboarding_step + 1} de {len(questions)}</p>
+        <div style="background: #e5e7eb; height: 8px; border-radius: 4px; margin: 1rem 0;">
+            <div style="background: #667eea; height: 8px; border-radius: 4px; width: {((st.session_state.onboarding_step + 1) / len(questions)) * 100}%;"></div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    st.subheader(current_question["title"])
+    
+    if current_question.get("input"):
+        value = st.number_input(
+            f"Tu {current_question['type']}",
+            min_value=0,
+            key=f"onboarding_{current_question['type']}"
+        )
+        if value > 0:
+            setattr(st.session_state.user_profile, current_question["type"], str(value))
+    
+    elif current_question.get("multiple"):
+        selected_options = st.multiselect(
+            "Selecciona tus objetivos:",
+            current_question["options"],
+            default=st.session_state.user_profile.goals
+        )
+        st.session_state.user_profile.goals = selected_options
+    
+    else:
+        selected = st.radio(
+            "Selecciona una opción:",
+            current_question["options"],
+            key=f"onboarding_{current_question['type']}"
+        )
+        setattr(st.session_state.user_profile, current_question["type"], selected)
+    
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        if st.session_state.onboarding_step > 0:
+            if st.button("Anterior"):
+                st.session_state.onboarding_step -= 1
+                st.rerun()
+    
+    with col2:
+        # Verificar si la pregunta actual está respondida
+        current_value = getattr(st.session_state.user_profile, current_question["type"])
+        is_answered = (
+            (current_question.get("multiple") and len(current_value) > 0) or
+            (not current_question.get("multiple") and current_value)
+        )
+        
+        if is_answered:
+            if st.session_state.onboarding_step < len(questions) - 1:
+                if st.button("Siguiente"):
+                    st.session_state.onboarding_step += 1
+                    st.rerun()
+            else:
+                if st.button("Empezar mi Viaje"):
+                    save_user_profile()
+                    st.session_state.current_screen = 'dashboard'
+                    st.rerun()
@@ -0,0 +1,50 @@
+import streamlit as st
+
+# Filtros y paginación de los listados del catálogo (fithome.search). El
+# filtro, el texto y la página viven en session_state bajo un prefijo por
+# pestaña; cambiar el filtro o el texto vuelve a la primera página.
+
+def filter_buttons(prefix, options):
+    # options: [(etiqueta, valor de la faceta o None para "Todos")]
+    filter_key, page_key = f"{prefix}_filter", f"{prefix}_page"
+    if filter_key not in st.session_state:
+        st.session_state[filter_key] = None
+    if page_key not in st.session_state:
+        st.session_state[page_key] = 0
+
+    for column, (label, value) in zip(st.columns(len(options)), options):
+        with column:
+            selected = st.session_state[filter_key] == value
+            if st.button(label, key=f"{prefix}_filter_{label}", type="primary" if selected else "secondary"):
+                st.session_state[filter_key] = value
+                st.session_state[page_key] = 0
+                st.rerun()
+    return st.session_state[filter_key]
+
+def reset_page(prefix):
+    st.session_state[f"{prefix}_page"] = 0
+
+def search_box(prefix, placeholder):
+    return st.text_input("Buscar", key=f"{prefix}_text", placeholder=placeholder, on_change=reset_page, args=(prefix,))
+
+def current_page(prefix):
+    return st.session_state[f"{prefix}_page"]
+
+def pagination(prefix, page):
+    if page.total == 0:
+        st.info("No hay resultados con estos filtros")
+        return
+    if page.pages == 1:
+        return
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if st.button("⬅️ Anterior", key=f"{prefix}_previous", disabled=not page.has_previous):
+            st.session_state[f"{prefix}_page"] = page.page - 1
+            st.rerun()
+    with col2:
+        st.caption(f"Página {page.page + 1} de {page.pages} · {page.total} resultados")
+    with col3:
+        if st.button("Siguiente ➡️", key=f"{prefix}_next", disabled=not page.has_next):
+            st.session_state[f"{prefix}_page"] = page.page + 1
+            st.rerun()
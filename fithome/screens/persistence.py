@@ -0,0 +1,111 @@
+import dataclasses
+import datetime
+
+import streamlit as st
+
+from fithome.bodyweight import WeightSeries
+from fithome.calories import schedule_reestimate
+from fithome.journal import WATER_SET, WORKOUT_COMPLETED, get_journal
+from fithome.screens.state import current_user_id
+from fithome.storage import FoodLogEntry, SessionStore, WriteBatch, get_backend
+
+# Persistencia del usuario desde las pantallas: lecturas cacheadas por
+# sesión (SessionStore) y escrituras directas o a través del journal.
+
+def session_store():
+    if 'store' not in st.session_state:
+        st.session_state.store = SessionStore(get_backend())
+    return st.session_state.store
+
+# Lecturas cacheadas por sesión
+def load_user_state(user_id):
+    store = session_store()
+    today = datetime.date.today()
+    profile = store.profile(user_id)
+    if profile is not None:
+        # Las pantallas editan una copia: save_user_profile compara con la
+        # de la caché (lo guardado) para saber si cambió el peso
+        st.session_state.user_profile = dataclasses.replace(
+            profile, goals=list(profile.goals), allergies=list(profile.allergies)
+        )
+    st.session_state.user_stats = store.stats(user_id, today)
+    st.session_state.water_intake = store.water(user_id, today)
+
+def save_user_profile():
+    user_id = current_user_id()
+    if user_id is None:
+        return
+    store = session_store()
+    previous = store.profile(user_id)
+    profile = st.session_state.user_profile
+    batch = WriteBatch()
+    batch.save_profile(user_id, profile)
+    store.write(batch)
+    # Un peso nuevo cambia las calorías estimadas de todo el historial
+    if previous is not None and previous.weight != profile.weight:
+        schedule_reestimate(user_id)
+
+def weight_series() -> WeightSeries:
+    user_id = current_user_id()
+    if user_id is not None:
+        return session_store().weights(user_id)
+    # Sin cuenta, las lecturas solo viven en la sesión
+    if 'weight_series' not in st.session_state:
+        st.session_state.weight_series = WeightSeries()
+    return st.session_state.weight_series
+
+def save_weight(kg: float):
+    today = datetime.date.today()
+    st.session_state.user_profile.weight = f"{kg:g}"
+    user_id = current_user_id()
+    if user_id is None:
+        weight_series().append(today, kg)
+        return
+    session_store().record_weight(user_id, today, kg)
+    schedule_reestimate(user_id)
+
+def log_food(entries):
+    # entries: (franja, calorías, meal_id o None, nombre personalizado o None)
+    today = datetime.date.today()
+    st.session_state.user_stats.today_consumed += sum(calories for _, calories, _, _ in entries)
+    user_id = current_user_id()
+    if user_id is None:
+        return
+    batch = WriteBatch()
+    for meal_type, calories, meal_id, custom_name in entries:
+        batch.log_food(FoodLogEntry(
+            user_id=user_id,
+            day=today,
+            meal_type=meal_type,
+            calories=calories,
+            meal_id=meal_id,
+            custom_meal_name=custom_name,
+            custom_calories=calories if custom_name else None
+        ))
+    session_store().write(batch)
+
+# Las acciones frecuentes van al journal y se escriben en segundo plano
+def record_event(event_type, **data):
+    user_id = current_user_id()
+    if user_id is None:
+        return
+    get_journal().append(event_type, user_id=user_id, **data)
+    # El evento llega a la base cuando el journal lo aplica: invalidar ahora
+    # releería y cachearía los datos sin él. Las estadísticas de la sesión ya
+    # se actualizaron en pantalla (son el mismo objeto que hay en caché)
+    store = session_store()
+    if event_type == WORKOUT_COMPLETED:
+        store.add_session(
+            user_id, data['workout_id'],
+            datetime.datetime.fromisoformat(data['started_at']),
+            datetime.datetime.fromisoformat(data['completed_at'])
+        )
+    elif event_type == WATER_SET:
+        store.set_water(user_id, datetime.date.fromisoformat(data['date']), data['glasses'])
+
+def save_water_intake():
+    record_event(
+        WATER_SET,
+        date=datetime.date.today().isoformat(),
+        glasses=st.session_state.water_intake
+    )
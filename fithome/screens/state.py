@@ -0,0 +1,42 @@
+import streamlit as st
+
+from fithome.models import UserProfile, UserStats
+from fithome.ui.fragments import theme_for
+
+# Estado de la sesión compartido por todas las pantallas. Este módulo se
+# importa en cada ejecución del script: solo depende de los modelos.
+
+# Inicialización del estado de la sesión
+def init_session_state():
+    if 'current_screen' not in st.session_state:
+        st.session_state.current_screen = 'loading'
+    if 'user' not in st.session_state:
+        st.session_state.user = None
+    if 'user_profile' not in st.session_state:
+        st.session_state.user_profile = UserProfile()
+    if 'user_stats' not in st.session_state:
+        st.session_state.user_stats = UserStats()
+    if 'onboarding_step' not in st.session_state:
+        st.session_state.onboarding_step = 0
+    if 'water_intake' not in st.session_state:
+        st.session_state.water_intake = 0
+    if 'selected_workout' not in st.session_state:
+        st.session_state.selected_workout = None
+    if 'workout_in_progress' not in st.session_state:
+        st.session_state.workout_in_progress = False
+    if 'current_exercise' not in st.session_state:
+        st.session_state.current_exercise = 0
+    if 'timer_seq' not in st.session_state:
+        st.session_state.timer_seq = 0
+    if 'workout_started_at' not in st.session_state:
+        st.session_state.workout_started_at = None
+    if 'workout_telemetry' not in st.session_state:
+        st.session_state.workout_telemetry = None
+    if 'flash_message' not in st.session_state:
+        st.session_state.flash_message = None
+
+def current_user_id():
+    return (st.session_state.user or {}).get('user_id')
+
+def ui_theme():
+    return theme_for(st.session_state.user_profile.gender)
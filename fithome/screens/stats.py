@@ -0,0 +1,94 @@
+import datetime
+
+import streamlit as st
+
+from fithome.charts import weekly_activity_chart, weight_trend_chart
+from fithome.screens.persistence import save_weight, weight_series
+
+# Pestaña de progreso. Es la única que dibuja gráficas (fithome.charts); los
+# datos salen de los cubos precalculados de fithome.rollups.
+
+MONTHLY_WORKOUT_GOAL = 20
+# Puntos de la gráfica de peso y días de la tendencia
+CHART_POINTS = 120
+TREND_DAYS = 30
+MONTH_NAMES = (
+    "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+    "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
+)
+
+def stats_tab():
+    st.title("📊 Progreso")
+    
+    if st.session_state.user_stats.total_workouts == 0:
+        st.markdown("""
+        <div style="text-align: center; padding: 3rem; background: white; border-radius: 1rem;">
+            <div style="font-size: 4rem; margin-bottom: 1rem;">📊</div>
+            <h3>Sin datos aún</h3>
+            <p>Completa algunos entrenamientos para ver tus estadísticas y gráficas de progreso</p>
+        </div>
+        """, unsafe_allow_html=True)
+        
+        if st.button("💪 Empezar Entrenando"):
+            st.session_state.current_screen = 'workouts'
+            st.rerun()
+    else:
+        # Estadísticas generales
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.markdown(f"""
+            <div class="stats-card">
+                <h2>{st.session_state.user_stats.total_workouts}</h2>
+                <p>Entrenamientos</p>
+                <small>Total completados</small>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown(f"""
+            <div style="background: linear-gradient(135deg, #10b981 0%, #059669 100%); padding: 1.5rem; border-radius: 1rem; color: white; text-align: center;">
+                <h2>{st.session_state.user_stats.total_calories:,}</h2>
+                <p>Calorías</p>
+                <small>Quemadas</small>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        # Progreso semanal
+        st.subheader("📈 Actividad Semanal")
+        weekly_data = st.session_state.user_stats.weekly_progress
+        st.image(weekly_activity_chart(weekly_data), width="stretch")
+        
+        # Metas del mes (cubo mensual de activity_rollups)
+        stats = st.session_state.user_stats
+        st.subheader(f"🎯 Metas de {MONTH_NAMES[datetime.date.today().month - 1]}")
+        
+        # Meta de entrenamientos
+        workout_progress = min(100, (stats.month_workouts / MONTHLY_WORKOUT_GOAL) * 100)
+        st.write(f"Entrenamientos ({stats.month_workouts}/{MONTHLY_WORKOUT_GOAL})")
+        st.progress(workout_progress / 100)
+        st.write(f"{workout_progress:.0f}% completado · {stats.month_minutes} min · {stats.month_calories:,} kcal este mes")
+        
+        # Peso: serie de body_measurements con media móvil y tendencia
+        st.subheader("⚖️ Peso")
+        series = weight_series()
+        latest = series.latest()
+        if latest:
+            day, kg = latest
+            trend = series.trend(start=day - datetime.timedelta(days=TREND_DAYS))
+            col1, col2 = st.columns(2)
+            col1.metric("Último registro", f"{kg:.1f} kg", help=f"Registrado el {day:%d/%m/%Y}")
+            col2.metric(f"Tendencia ({TREND_DAYS} días)", f"{trend:+.2f} kg/semana" if trend is not None else "—")
+            if len(series) > 1:
+                points = series.downsample(CHART_POINTS)
+                averages = [series.mean(point - datetime.timedelta(days=6), point) for point, _ in points]
+                st.image(weight_trend_chart(points, averages), width="stretch")
+        
+        # El formulario mantiene el valor entre reruns hasta pulsar el botón
+        with st.form("weight_form", clear_on_submit=True):
+            weight = st.number_input("Peso actual (kg):", min_value=0.0, max_value=400.0, step=0.1,
+                                     value=latest[1] if latest else 0.0)
+            if st.form_submit_button("⚖️ Registrar Peso Actual") and weight > 0:
+                save_weight(weight)
+                st.session_state.flash_message = f"Peso registrado: {weight:.1f} kg"
+                st.rerun()
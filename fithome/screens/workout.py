@@ -0,0 +1,141 @@
+import datetime
+
+import streamlit as st
+
+from fithome.achievements import CALORIES, STREAK, WORKOUTS
+from fithome.calories import body_from_profile, session_calories
+from fithome.components.timer import EXERCISE_DONE, FINISHED, workout_timer
+from fithome.journal import WORKOUT_COMPLETED
+from fithome.screens.persistence import record_event
+from fithome.screens.state import ui_theme
+from fithome.storage import get_backend
+from fithome.streaks import StreakState, advance as advance_streak
+from fithome.telemetry import WorkoutTelemetry
+from fithome.ui import fragments
+
+# Pantalla de entrenamiento: vista previa, entrenamiento en progreso y
+# registro de la sesión completada
+
+def complete_workout(workout):
+    # Calorías estimadas con los METs de cada ejercicio, el peso del perfil
+    # y los segundos reales medidos por el temporizador
+    telemetry = st.session_state.workout_telemetry
+    details = telemetry.details() if telemetry else []
+    calories = session_calories(workout, details, body_from_profile(st.session_state.user_profile))
+    active_seconds = telemetry.active_seconds() if telemetry else 0
+    minutes = max(1, round(active_seconds / 60)) if active_seconds else workout.duration_minutes
+    
+    # Actualizar estadísticas
+    st.session_state.user_stats.total_workouts += 1
+    st.session_state.user_stats.total_calories += calories
+    st.session_state.user_stats.total_minutes += minutes
+    st.session_state.user_stats.today_calories += calories
+    st.session_state.user_stats.today_minutes += minutes
+    st.session_state.user_stats.weekly_progress[datetime.date.today().weekday()] += minutes
+    st.session_state.user_stats.month_workouts += 1
+    st.session_state.user_stats.month_minutes += minutes
+    st.session_state.user_stats.month_calories += calories
+    
+    # Actualizar racha
+    today = datetime.date.today()
+    stats = st.session_state.user_stats
+    last_date = datetime.date.fromisoformat(stats.last_workout_date) if stats.last_workout_date else None
+    streak = advance_streak(StreakState(stats.streak_days, stats.longest_streak, last_date), today)
+    stats.streak_days = streak.current_streak
+    stats.longest_streak = streak.longest_streak
+    stats.last_workout_date = today.isoformat()
+    
+    # Desbloquear logros según las reglas de la tabla achievements
+    engine = get_backend().achievement_engine
+    progress = {WORKOUTS: stats.total_workouts, CALORIES: stats.total_calories, STREAK: stats.streak_days}
+    for rule in engine.evaluate(progress, engine.unlocked_ids(stats.achievements)):
+        stats.achievements.append(rule.name)
+    
+    # Guardar la sesión de entrenamiento con la telemetría por ejercicio
+    completed_at = datetime.datetime.now()
+    record_event(
+        WORKOUT_COMPLETED,
+        workout_id=workout.id,
+        started_at=(st.session_state.workout_started_at or completed_at).isoformat(),
+        completed_at=completed_at.isoformat(),
+        calories_burned=calories,
+        duration_minutes=minutes,
+        exercises=[detail.to_dict() for detail in details]
+    )
+    st.session_state.workout_telemetry = None
+    return calories
+
+def workout_screen():
+    workout = st.session_state.selected_workout
+    
+    if not st.session_state.workout_in_progress:
+        # Vista previa del entrenamiento
+        st.markdown(fragments.workout_hero(workout, ui_theme()), unsafe_allow_html=True)
+        
+        # Información del entrenamiento
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("Duración", workout.duration)
+        with col2:
+            st.metric("Calorías", workout.calories)
+        with col3:
+            st.metric("Nivel", workout.level)
+        with col4:
+            st.metric("Rating", f"⭐ {workout.rating}")
+        
+        # Lista de ejercicios
+        st.subheader(f"Ejercicios ({len(workout.exercises)})")
+        st.markdown(fragments.exercise_list(workout, ui_theme()), unsafe_allow_html=True)
+        
+        # Botones de acción
+        telemetry = st.session_state.workout_telemetry
+        paused = telemetry is not None and telemetry.workout == workout
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            if st.button("⬅️ Volver"):
+                st.session_state.selected_workout = None
+                st.session_state.workout_telemetry = None
+                st.rerun()
+        
+        with col2:
+            if paused and st.button(f"▶️ Reanudar (ejercicio {st.session_state.current_exercise + 1})"):
+                # Misma sesión: se conservan el inicio y la telemetría; el
+                # temporizador vuelve a montarse y numera sus eventos desde 1
+                st.session_state.workout_in_progress = True
+                st.session_state.timer_seq = 0
+                st.rerun()
+            if st.button("🔄 Empezar de nuevo" if paused else "▶️ Comenzar Entrenamiento"):
+                st.session_state.workout_in_progress = True
+                st.session_state.current_exercise = 0
+                st.session_state.workout_started_at = datetime.datetime.now()
+                st.session_state.workout_telemetry = WorkoutTelemetry(workout)
+                st.session_state.timer_seq = 0
+                st.rerun()
+    
+    else:
+        # Entrenamiento en progreso: la cuenta atrás corre en el navegador y
+        # solo llegan aquí las transiciones de fase
+        event = workout_timer(
+            workout,
+            session_id=st.session_state.workout_started_at.isoformat(),
+            start_exercise=st.session_state.current_exercise,
+            key=f"workout_timer_{st.session_state.workout_started_at.isoformat()}"
+        )
+        
+        if event and event['seq'] > st.session_state.timer_seq:
+            st.session_state.timer_seq = event['seq']
+            st.session_state.workout_telemetry.update(event.get('exercises', ()))
+            if event['event'] == EXERCISE_DONE:
+                st.session_state.current_exercise = min(event['exercise'] + 1, len(workout.exercises) - 1)
+            elif event['event'] == FINISHED:
+                calories = complete_workout(workout)
+                st.session_state.workout_in_progress = False
+                st.session_state.selected_workout = None
+                st.session_state.current_exercise = 0
+                st.session_state.flash_message = f"¡Felicitaciones! Has completado '{workout.name}'. +{calories} kcal quemadas."
+                st.rerun()
+        
+        if st.button("⏸️ Pausar"):
+            st.session_state.workout_telemetry.pause(st.session_state.current_exercise)
+            st.session_state.workout_in_progress = False
+            st.rerun()
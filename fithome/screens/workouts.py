@@ -0,0 +1,43 @@
+import streamlit as st
+
+from fithome.screens import paging
+from fithome.screens.state import ui_theme
+from fithome.search import workout_index
+from fithome.ui import fragments
+
+# Pestaña de entrenamientos
+
+PAGE_SIZE = 10
+
+CATEGORY_FILTERS = [
+    ("Todos", None),
+    ("Cardio", "Cardio"),
+    ("Fuerza", "Fuerza"),
+    ("Flexibilidad", "Flexibilidad"),
+]
+
+def workouts_tab():
+    st.title("💪 Mis Entrenamientos")
+    
+    # Filtros
+    category = paging.filter_buttons("workouts", CATEGORY_FILTERS)
+    text = paging.search_box("workouts", "Nombre o descripción")
+    
+    page = workout_index().search(
+        facets={'category': category} if category else None,
+        text=text,
+        page=paging.current_page("workouts"),
+        page_size=PAGE_SIZE,
+    )
+    
+    for workout in page.items:
+        with st.container():
+            st.markdown(fragments.workout_card(workout, ui_theme()), unsafe_allow_html=True)
+            
+            col1, col2 = st.columns([3, 1])
+            with col2:
+                if st.button(f"▶️ Iniciar", key=f"workout_{workout.id}"):
+                    st.session_state.selected_workout = workout
+                    st.rerun()
+    
+    paging.pagination("workouts", page)
@@ -0,0 +1,349 @@
+import bisect
+import re
+import threading
+import unicodedata
+from dataclasses import dataclass
+from typing import Callable, Dict, Generic, Iterable, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from fithome.models import KidsActivity, Workout
+
+# Índice invertido en memoria para filtrar el catálogo. Cada registro ocupa
+# una posición (su orden en el catálogo) y cada valor de faceta guarda un
+# bitset (un int de Python) con las posiciones que lo tienen. Una consulta
+# combinada es un AND de bitsets, así que su coste depende del número de
+# filtros y no del número de registros.
+#
+# Los rangos (duración, calorías, edad) guardan máscaras acumuladas por
+# valor distinto: "mínimo <= x" y "máximo < x" se resuelven con un bisect y
+# un AND/NOT, sin recorrer registros.
+
+T = TypeVar("T")
+
+Range = Tuple[int, int]
+
+# Por debajo de esta fracción de registros un token guarda la lista de
+# posiciones en vez del bitset (un bitset ocupa n/8 bytes aunque tenga un
+# solo bit)
+SPARSE_FRACTION = 1 / 64
+
+_TOKEN_RE = re.compile(r"\w+")
+_NUMBER_RE = re.compile(r"\d+")
+
+def normalize(text: str) -> str:
+    # "Fácil" -> "facil", "Intermedio" -> "intermedio"
+    decomposed = unicodedata.normalize("NFKD", text.strip().lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+def parse_range(value: str) -> Optional[Range]:
+    # "180-220" -> (180, 220), "20 min" -> (20, 20), "6-12 años" -> (6, 12)
+    numbers = [int(number) for number in _NUMBER_RE.findall(value or "")[:2]]
+    if not numbers:
+        return None
+    return min(numbers), max(numbers)
+
+def bitset(positions: Iterable[int], size: int) -> int:
+    # Construir el int de una vez: OR bit a bit sobre un int que crece
+    # copiaría el número entero en cada registro
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+class _RangeIndex:
+    # Para cada registro con rango [lo, hi] hay dos listas ordenadas de
+    # valores distintos con la máscara acumulada de los registros cuyo lo
+    # (o hi) es menor o igual que cada valor
+    def __init__(self, ranges: Sequence[Optional[Range]]):
+        lows: Dict[int, List[int]] = {}
+        highs: Dict[int, List[int]] = {}
+        for position, value in enumerate(ranges):
+            if value is None:
+                continue
+            lows.setdefault(value[0], []).append(position)
+            highs.setdefault(value[1], []).append(position)
+        self.low_values, self.low_masks = self._cumulative(lows, len(ranges))
+        self.high_values, self.high_masks = self._cumulative(highs, len(ranges))
+
+    @staticmethod
+    def _cumulative(positions: Dict[int, List[int]], size: int) -> Tuple[List[int], List[int]]:
+        values = sorted(positions)
+        cumulative = []
+        running = 0
+        for value in values:
+            running |= bitset(positions[value], size)
+            cumulative.append(running)
+        return values, cumulative
+
+    def starting_by(self, value: int) -> int:
+        # Registros con lo <= value
+        index = bisect.bisect_right(self.low_values, value)
+        return self.low_masks[index - 1] if index else 0
+
+    def ending_by(self, value: int) -> int:
+        # Registros con hi <= value
+        index = bisect.bisect_right(self.high_values, value)
+        return self.high_masks[index - 1] if index else 0
+
+    def overlapping(self, low: int, high: int) -> int:
+        # Registros cuyo rango se solapa con [low, high]: lo <= high y hi >= low
+        return self.starting_by(high) & ~self.ending_by(low - 1)
+
+@dataclass(frozen=True, slots=True)
+class SearchPage(Generic[T]):
+    items: Tuple[T, ...]
+    total: int
+    page: int
+    page_size: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.page_size))
+
+    @property
+    def has_previous(self) -> bool:
+        return self.page > 0
+
+    @property
+    def has_next(self) -> bool:
+        return (self.page + 1) * self.page_size < self.total
+
+class FacetIndex(Generic[T]):
+    def __init__(self, items: Sequence[T],
+                 facets: Mapping[str, Callable[[T], str]],
+                 ranges: Mapping[str, Callable[[T], Optional[Range]]],
+                 text: Callable[[T], str]):
+        self.items = tuple(items)
+        self.all = (1 << len(self.items)) - 1
+        size = len(self.items)
+        facet_positions: Dict[str, Dict[str, List[int]]] = {name: {} for name in facets}
+        token_positions: Dict[str, List[int]] = {}
+
+        for position, item in enumerate(self.items):
+            for name, key in facets.items():
+                facet_positions[name].setdefault(normalize(key(item)), []).append(position)
+            for token in set(tokenize(text(item))):
+                token_positions.setdefault(token, []).append(position)
+
+        self.facets: Dict[str, Dict[str, int]] = {
+            name: {value: bitset(positions, size) for value, positions in values.items()}
+            for name, values in facet_positions.items()
+        }
+        self.ranges: Dict[str, _RangeIndex] = {}
+
+        for name, key in ranges.items():
+            self.ranges[name] = _RangeIndex([key(item) for item in self.items])
+
+        # Tokens ordenados: los que empiezan por un prefijo son contiguos
+        self._size = size
+        sparse_limit = max(1, int(size * SPARSE_FRACTION))
+        self._tokens = sorted(token_positions)
+        self._postings: List[object] = [
+            bitset(positions, size) if len(positions) > sparse_limit else tuple(positions)
+            for positions in (token_positions[token] for token in self._tokens)
+        ]
+
+    def _text_mask(self, query: str) -> int:
+        # Cada palabra de la consulta se trata como prefijo ("cardi" ->
+        # "cardio") y todas deben aparecer
+        mask = self.all
+        for word in tokenize(query):
+            start = bisect.bisect_left(self._tokens, word)
+            end = bisect.bisect_left(self._tokens, word + "\uffff", lo=start)
+            matches = 0
+            sparse: List[int] = []
+            for posting in self._postings[start:end]:
+                if isinstance(posting, int):
+                    matches |= posting
+                else:
+                    sparse.extend(posting)
+            if sparse:
+                matches |= bitset(sparse, self._size)
+            mask &= matches
+            if not mask:
+                break
+        return mask
+
+    def query(self, facets: Optional[Mapping[str, Iterable[str]]] = None,
+              ranges: Optional[Mapping[str, Range]] = None,
+              text: Optional[str] = None) -> int:
+        # Dentro de una faceta los valores se combinan con OR; entre
+        # facetas, rangos y texto, con AND
+        mask = self.all
+        for name, values in (facets or {}).items():
+            if isinstance(values, str):
+                values = (values,)
+            postings = self.facets[name]
+            selected = 0
+            for value in values:
+                selected |= postings.get(normalize(value), 0)
+            mask &= selected
+        for name, (low, high) in (ranges or {}).items():
+            mask &= self.ranges[name].overlapping(low, high)
+        if text and text.strip():
+            mask &= self._text_mask(text)
+        return mask
+
+    def page(self, mask: int, page: int = 0, page_size: int = 20) -> SearchPage[T]:
+        return SearchPage(tuple(self.take(mask, page * page_size, page_size)), mask.bit_count(), page, page_size)
+
+    def take(self, mask: int, skip: int, count: int) -> List[T]:
+        # Los registros del resultado desde el número skip, como mucho count
+        if skip >= mask.bit_count():
+            return []
+
+        # Primera posición: búsqueda binaria sobre el número de bits a uno
+        # por debajo de cada posición
+        low, high = 0, len(self.items)
+        while low < high:
+            middle = (low + high) // 2
+            if (mask & ((1 << middle) - 1)).bit_count() <= skip:
+                low = middle + 1
+            else:
+                high = middle
+        start = low - 1
+
+        remaining = mask >> start
+        items = []
+        while remaining and len(items) < count:
+            lowest = remaining & -remaining
+            offset = lowest.bit_length() - 1
+            items.append(self.items[start + offset])
+            remaining ^= lowest
+        return items
+
+    def search(self, page: int = 0, page_size: int = 20, **query) -> SearchPage[T]:
+        return self.page(self.query(**query), page, page_size)
+
+# Índices del catálogo
+def build_workout_index(workouts: Sequence[Workout]) -> FacetIndex[Workout]:
+    return FacetIndex(
+        workouts,
+        facets={
+            'category': lambda w: w.category,
+            'level': lambda w: w.level,
+        },
+        ranges={
+            'duration': lambda w: (w.duration_minutes, w.duration_minutes),
+            'calories': lambda w: (w.calories_min, w.calories_max),
+        },
+        text=lambda w: f"{w.name} {w.description}",
+    )
+
+def build_kids_index(activities: Sequence[KidsActivity]) -> FacetIndex[KidsActivity]:
+    return FacetIndex(
+        activities,
+        facets={
+            'type': lambda a: a.type,
+            'difficulty': lambda a: a.difficulty,
+        },
+        ranges={
+            'duration': lambda a: parse_range(a.duration),
+            'age': lambda a: parse_range(a.age),
+        },
+        text=lambda a: f"{a.name} {' '.join(a.materials)} {' '.join(a.benefits)}",
+    )
+
+# Un índice por catálogo: se reconstruye solo cuando get_catalog() devuelve
+# un catálogo nuevo (recarga de los CSV)
+_indexes: Dict[str, Tuple[object, FacetIndex]] = {}
+_indexes_lock = threading.Lock()
+
+def _catalog_index(name: str, records: Callable, builder: Callable) -> FacetIndex:
+    from fithome.catalog import get_catalog
+    catalog = get_catalog()
+    cached = _indexes.get(name)
+    if cached is not None and cached[0] is catalog:
+        return cached[1]
+    with _indexes_lock:
+        cached = _indexes.get(name)
+        if cached is None or cached[0] is not catalog:
+            cached = (catalog, builder(records(catalog)))
+            _indexes[name] = cached
+    return cached[1]
+
+def workout_index() -> FacetIndex[Workout]:
+    return _catalog_index('workouts', lambda catalog: catalog.workouts, build_workout_index)
+
+def kids_index() -> FacetIndex[KidsActivity]:
+    return _catalog_index('kids', lambda catalog: catalog.kids_activities, build_kids_index)
+
+# Consultas equivalentes por SQL: sql/fithome_database.sql (MySQL,
+# parámetros %s) o las tablas de catálogo de sql/fithome_sqlite.sql
+# (placeholder="?", SQLiteBackend.search_workouts / search_kids_activities).
+# Los filtros se escriben sobre las columnas de los índices para que el
+# optimizador los use: idx_workouts_category_difficulty (category_id,
+# difficulty_level) e idx_kids_activities_age (age_min, age_max).
+def _placeholders(values: Sequence, placeholder: str) -> str:
+    return ", ".join([placeholder] * len(values))
+
+def workout_search_sql(categories: Sequence[str] = (), levels: Sequence[str] = (),
+                       duration: Optional[Range] = None, calories: Optional[Range] = None,
+                       text: Optional[str] = None, page: int = 0, page_size: int = 20,
+                       placeholder: str = "%s") -> Tuple[str, List]:
+    p = placeholder
+    conditions: List[str] = []
+    params: List = []
+    if categories:
+        conditions.append(
+            f"w.category_id IN (SELECT category_id FROM workout_categories WHERE category_name IN ({_placeholders(categories, p)}))"
+        )
+        params.extend(categories)
+    if levels:
+        conditions.append(f"w.difficulty_level IN ({_placeholders(levels, p)})")
+        params.extend(normalize(level) for level in levels)
+    if duration:
+        conditions.append(f"w.duration_minutes BETWEEN {p} AND {p}")
+        params.extend(duration)
+    if calories:
+        conditions.append(f"w.calories_min <= {p} AND w.calories_max >= {p}")
+        params.extend((calories[1], calories[0]))
+    for word in tokenize(text or ""):
+        conditions.append(f"(w.name LIKE {p} OR w.description LIKE {p})")
+        params.extend((f"%{word}%", f"%{word}%"))
+
+    sql = (
+        "SELECT w.workout_id, w.name, w.description, wc.category_name, w.duration_minutes, "
+        "w.difficulty_level, w.calories_min, w.calories_max, w.rating, w.total_completions, w.image_emoji "
+        "FROM workouts w JOIN workout_categories wc ON wc.category_id = w.category_id"
+    )
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += f" ORDER BY w.workout_id LIMIT {p} OFFSET {p}"
+    params.extend((page_size, page * page_size))
+    return sql, params
+
+def kids_search_sql(types: Sequence[str] = (), age: Optional[Range] = None,
+                    duration: Optional[Range] = None, text: Optional[str] = None,
+                    page: int = 0, page_size: int = 20, placeholder: str = "%s") -> Tuple[str, List]:
+    p = placeholder
+    conditions: List[str] = []
+    params: List = []
+    if age:
+        # Rango sobre la primera columna del índice y filtro sobre la segunda
+        conditions.append(f"ka.age_min <= {p} AND ka.age_max >= {p}")
+        params.extend((age[1], age[0]))
+    if types:
+        conditions.append(f"kac.category_name IN ({_placeholders(types, p)})")
+        params.extend(types)
+    if duration:
+        conditions.append(f"ka.duration_minutes BETWEEN {p} AND {p}")
+        params.extend(duration)
+    for word in tokenize(text or ""):
+        conditions.append(f"(ka.activity_name LIKE {p} OR ka.description LIKE {p})")
+        params.extend((f"%{word}%", f"%{word}%"))
+
+    sql = (
+        "SELECT ka.activity_id, ka.activity_name, kac.category_name, ka.description, ka.age_min, ka.age_max, "
+        "ka.duration_minutes, ka.difficulty_level, ka.image_emoji "
+        "FROM kids_activities ka JOIN kids_activity_categories kac ON kac.category_id = ka.category_id"
+    )
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    # En el orden del índice (que termina en la clave primaria): ordenar por
+    # activity_id haría que SQLite recorriera la tabla entera en su lugar
+    sql += f" ORDER BY ka.age_min, ka.age_max, ka.activity_id LIMIT {p} OFFSET {p}"
+    params.extend((page_size, page * page_size))
+    return sql, params
@@ -0,0 +1,176 @@
+from fithome.models import Exercise, KidsActivity, Movie, Workout
+
+# Contenido incluido con la aplicación. Se construye una única vez al
+# importar el módulo y se comparte entre todas las sesiones.
+
+WORKOUTS = (
+    Workout(
+        id=1,
+        name="Cardio HIIT Matutino",
+        duration_minutes=20,
+        level="Intermedio",
+        calories_min=180,
+        calories_max=220,
+        image="🔥",
+        category="Cardio",
+        description="Quema grasa rápidamente con intervalos de alta intensidad",
+        exercises=(
+            Exercise("Saltos de tijera", duration_seconds=45, rest_seconds=15, exercise_id=7, met=7.7),
+            Exercise("Burpees", duration_seconds=30, rest_seconds=30, exercise_id=4, met=8.0),
+            Exercise("Mountain climbers", duration_seconds=45, rest_seconds=15, exercise_id=5, met=8.0),
+            Exercise("Rodillas al pecho", duration_seconds=45, rest_seconds=15, exercise_id=8, met=8.0),
+        ),
+        rating=4.8,
+        completions=1250
+    ),
+    Workout(
+        id=2,
+        name="Fuerza Total Body",
+        duration_minutes=35,
+        level="Avanzado",
+        calories_min=250,
+        calories_max=300,
+        image="💪",
+        category="Fuerza",
+        description="Rutina completa para todo el cuerpo sin equipos",
+        exercises=(
+            Exercise("Push-ups", sets=3, reps=12, rest_seconds=60, exercise_id=1, met=3.8),
+            Exercise("Squats", sets=3, reps=15, rest_seconds=60, exercise_id=2, met=5.0),
+            Exercise("Plancha", duration_seconds=60, rest_seconds=30, exercise_id=3, met=3.8),
+            Exercise("Lunges", sets=3, reps=10, rest_seconds=45, exercise_id=6, met=4.0),
+        ),
+        rating=4.9,
+        completions=890
+    ),
+    Workout(
+        id=3,
+        name="Yoga Flow Relajante",
+        duration_minutes=25,
+        level="Principiante",
+        calories_min=80,
+        calories_max=120,
+        image="🧘‍♀️",
+        category="Flexibilidad",
+        description="Mejora tu flexibilidad y encuentra paz interior",
+        exercises=(
+            Exercise("Saludo al sol", duration_seconds=300, exercise_id=9, met=3.3),
+            Exercise("Guerrero I y II", duration_seconds=480, exercise_id=10, met=3.0),
+            Exercise("Postura del niño", duration_seconds=180, exercise_id=11, met=2.0),
+            Exercise("Savasana", duration_seconds=540, exercise_id=12, met=1.3),
+        ),
+        rating=4.7,
+        completions=2100
+    ),
+    Workout(
+        id=4,
+        name="Abs Definidos",
+        duration_minutes=15,
+        level="Intermedio",
+        calories_min=100,
+        calories_max=140,
+        image="🎯",
+        category="Core",
+        description="Fortalece tu core con ejercicios específicos",
+        exercises=(
+            Exercise("Crunches", sets=3, reps=20, rest_seconds=30, exercise_id=13, met=3.8),
+            Exercise("Plancha lateral", duration_seconds=30, rest_seconds=30, per_side=True, exercise_id=14, met=3.8),
+            Exercise("Bicicleta", sets=3, reps=15, rest_seconds=30, exercise_id=15, met=3.8),
+            Exercise("Dead bug", sets=3, reps=10, rest_seconds=30, exercise_id=16, met=3.0),
+        ),
+        rating=4.6,
+        completions=1680
+    ),
+)
+
+KIDS_ACTIVITIES = (
+    KidsActivity(
+        id=1,
+        name="Torre de Bloques Gigante",
+        type="Construcción",
+        duration="30-45 min",
+        age="6-12 años",
+        image="🏗️",
+        difficulty="Fácil",
+        materials=("Cajas de cartón", "Cinta adhesiva", "Marcadores", "Tijeras"),
+        steps=(
+            "Reúne cajas de diferentes tamaños",
+            "Decora cada caja con colores y patrones",
+            "Apila las cajas de mayor a menor",
+            "Prueba diferentes combinaciones",
+            "¡Crea la torre más alta!",
+        ),
+        benefits=("Coordinación", "Creatividad", "Paciencia", "Planificación")
+    ),
+    KidsActivity(
+        id=2,
+        name="Baile de los Animales",
+        type="Ejercicio",
+        duration="15-20 min",
+        age="3-10 años",
+        image="💃",
+        difficulty="Fácil",
+        materials=("Música divertida", "Espacio libre"),
+        steps=(
+            "Elige un animal (oso, rana, pájaro)",
+            "Imita sus movimientos",
+            "Añade música de fondo",
+            "Cambia de animal cada 2 minutos",
+            "¡Inventa nuevos movimientos!",
+        ),
+        benefits=("Ejercicio cardiovascular", "Coordinación", "Imaginación", "Diversión")
+    ),
+    KidsActivity(
+        id=3,
+        name="Origami Mariposa",
+        type="Manualidad",
+        duration="20-30 min",
+        age="8-14 años",
+        image="🦋",
+        difficulty="Intermedio",
+        materials=("Papel cuadrado colorido", "Marcadores (opcional)"),
+        steps=(
+            "Dobla el papel por la mitad en diagonal",
+            "Abre y dobla por la otra diagonal",
+            "Forma un triángulo base",
+            "Crea las alas con pliegues",
+            "¡Decora tu mariposa!",
+        ),
+        benefits=("Concentración", "Precisión", "Paciencia", "Habilidades motoras finas")
+    ),
+)
+
+MOVIES = (
+    Movie(
+        id=1,
+        title="El Poder de la Mente",
+        genre="Documental Motivacional",
+        duration="95 min",
+        rating=4.8,
+        image="🧠",
+        description="Descubre cómo atletas de élite utilizan la mentalidad para superar límites",
+        year=2023,
+        cast=("Dr. Michael Johnson", "Serena Williams", "LeBron James")
+    ),
+    Movie(
+        id=2,
+        title="Cocina Mediterránea Saludable",
+        genre="Educativo Gastronómico",
+        duration="120 min",
+        rating=4.6,
+        image="🍽️",
+        description="Aprende secretos de la cocina mediterránea para una vida más saludable",
+        year=2023,
+        cast=("Chef María González", "Dr. Antonio López")
+    ),
+    Movie(
+        id=3,
+        title="Mindfulness: El Arte de Vivir",
+        genre="Bienestar y Meditación",
+        duration="80 min",
+        rating=4.9,
+        image="🧘",
+        description="Una guía completa para incorporar mindfulness en tu vida diaria",
+        year=2024,
+        cast=("Monje Thich Nhat Hanh", "Dr. Jon Kabat-Zinn")
+    ),
+)
@@ -0,0 +1,1396 @@
+import datetime
+import hashlib
+import hmac
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from fithome.achievements import CALORIES, STREAK, WORKOUTS, AchievementEngine, AchievementRule
+from fithome.aggregates import AggregateCache, UserTotals
+from fithome.bodyweight import WeightSeries
+from fithome.models import KidsActivity, UserProfile, UserStats, Workout
+from fithome.ratings import RatingAggregate, RatingAggregator, from_history as ratings_from_history
+from fithome.rollups import (
+    DAY, MAX_BUCKETS, MONTH, WEEK, ActivityBucket, RollupAggregator, period_start, stream_rollups, week_minutes
+)
+from fithome.search import Range, kids_search_sql, normalize, parse_range, workout_search_sql
+from fithome.streaks import StreakState, advance, current_streak
+from fithome.telemetry import ExerciseDetail
+
+# Persistencia del estado de usuario. StorageBackend define las operaciones
+# sobre las tablas users, user_profiles, daily_stats y workout_sessions de
+# sql/fithome_database.sql; SQLiteBackend es el sustituto local de MySQL.
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+SCHEMA_PATH = ROOT_DIR / "sql" / "fithome_sqlite.sql"
+DEFAULT_DB_PATH = Path(os.environ.get("FITHOME_DB_PATH", ROOT_DIR / "fithome.db"))
+
+PASSWORD_ITERATIONS = 200_000
+
+# Límite de parámetros por consulta IN (...) en SQLite
+MAX_QUERY_PARAMS = 500
+
+# Versión del esquema local (PRAGMA user_version). CREATE TABLE IF NOT
+# EXISTS no toca las tablas de una base ya creada, así que las columnas
+# añadidas después se agregan con ALTER TABLE al abrir una base con una
+# versión anterior: (versión, tabla, columna, definición). ADD COLUMN no
+# admite DEFAULT CURRENT_TIMESTAMP: updated_at se añade sin valor por defecto
+# y lo rellenan los upserts
+SCHEMA_VERSION = 1
+ADDED_COLUMNS = (
+    (1, "daily_stats", "calories_consumed", "INTEGER DEFAULT 0"),
+    (1, "session_exercise_details", "extra_seconds", "INTEGER NOT NULL DEFAULT 0"),
+    (1, "session_exercise_details", "pauses", "INTEGER NOT NULL DEFAULT 0"),
+    (1, "session_exercise_details", "skipped", "BOOLEAN DEFAULT 0"),
+    (1, "user_streaks", "current_streak", "INTEGER NOT NULL DEFAULT 0"),
+    (1, "user_streaks", "longest_streak", "INTEGER NOT NULL DEFAULT 0"),
+    (1, "user_streaks", "last_active_date", "DATE"),
+    (1, "user_streaks", "updated_at", "TIMESTAMP"),
+    (1, "user_stats_summary", "total_achievements", "INTEGER NOT NULL DEFAULT 0"),
+    (1, "user_stats_summary", "last_workout_at", "TIMESTAMP NULL"),
+    (1, "user_stats_summary", "updated_at", "TIMESTAMP"),
+    (1, "workout_ratings", "rating_sum", "INTEGER NOT NULL DEFAULT 0"),
+    (1, "workout_ratings", "rating_count", "INTEGER NOT NULL DEFAULT 0"),
+    (1, "workout_ratings", "updated_at", "TIMESTAMP"),
+)
+
+class StorageError(Exception):
+    pass
+
+class EmailAlreadyRegistered(StorageError):
+    pass
+
+class PoolTimeout(StorageError):
+    pass
+
+# Contraseñas
+def hash_password(password: str, salt: Optional[bytes] = None) -> str:
+    salt = salt or os.urandom(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, PASSWORD_ITERATIONS)
+    return f"pbkdf2_sha256${PASSWORD_ITERATIONS}${salt.hex()}${digest.hex()}"
+
+def verify_password(password: str, stored: str) -> bool:
+    try:
+        _, iterations, salt, expected = stored.split('$')
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), bytes.fromhex(salt), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), expected)
+
+def _select_in(conn: sqlite3.Connection, query: str, ids: List[int], params: Tuple = ()) -> Iterator[sqlite3.Row]:
+    # `query` lleva {ids} donde va la lista de parámetros del IN (...);
+    # `params` son los parámetros que van después
+    for start in range(0, len(ids), MAX_QUERY_PARAMS):
+        chunk = ids[start:start + MAX_QUERY_PARAMS]
+        yield from conn.execute(query.format(ids=', '.join('?' * len(chunk))), (*chunk, *params))
+
+def _to_int(value: str) -> Optional[int]:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+def _to_float(value: str) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+# Escrituras agrupadas: una acción de la interfaz acumula sus cambios en un
+# WriteBatch y el backend los aplica en una sola transacción
+@dataclass
+class WorkoutRecord:
+    user_id: int
+    workout_id: int
+    started_at: datetime.datetime
+    completed_at: datetime.datetime
+    calories_burned: int
+    duration_minutes: int
+    difficulty_rating: Optional[int] = None
+    enjoyment_rating: Optional[int] = None
+    exercises: List[ExerciseDetail] = field(default_factory=list)
+
+@dataclass
+class FoodLogEntry:
+    user_id: int
+    day: datetime.date
+    meal_type: str
+    # Calorías que suma a daily_stats.calories_consumed
+    calories: int
+    meal_id: Optional[int] = None
+    custom_meal_name: Optional[str] = None
+    custom_calories: Optional[int] = None
+    notes: Optional[str] = None
+
+@dataclass
+class WriteBatch:
+    workouts: List[WorkoutRecord] = field(default_factory=list)
+    water: Dict[Tuple[int, datetime.date], int] = field(default_factory=dict)
+    profiles: Dict[int, UserProfile] = field(default_factory=dict)
+    # (user_id, fecha, kg) para body_measurements, solo se añaden
+    weights: List[Tuple[int, datetime.date, float]] = field(default_factory=list)
+    # Entradas de user_nutrition_log, solo se añaden
+    food: List[FoodLogEntry] = field(default_factory=list)
+    # (nombre del journal, último seq incluido) cuando el lote viene de fithome.journal
+    journal: Optional[Tuple[str, int]] = None
+
+    def record_workout(self, record: WorkoutRecord):
+        self.workouts.append(record)
+
+    def set_water(self, user_id: int, day: datetime.date, glasses: int):
+        self.water[(user_id, day)] = glasses
+
+    def save_profile(self, user_id: int, profile: UserProfile):
+        self.profiles[user_id] = profile
+
+    def record_weight(self, user_id: int, day: datetime.date, kg: float):
+        self.weights.append((user_id, day, kg))
+
+    def log_food(self, entry: FoodLogEntry):
+        self.food.append(entry)
+
+    def user_ids(self) -> set:
+        ids = {record.user_id for record in self.workouts}
+        ids.update(user_id for user_id, _ in self.water)
+        ids.update(self.profiles)
+        ids.update(user_id for user_id, _, _ in self.weights)
+        ids.update(entry.user_id for entry in self.food)
+        return ids
+
+    def __bool__(self):
+        return bool(self.workouts or self.water or self.profiles or self.weights or self.food)
+
+class StorageBackend(ABC):
+    @abstractmethod
+    def create_user(self, name: str, email: str, password: str) -> int: ...
+
+    @abstractmethod
+    def authenticate(self, email: str, password: str) -> Optional[int]: ...
+
+    @abstractmethod
+    def load_profile(self, user_id: int) -> Optional[UserProfile]: ...
+
+    @abstractmethod
+    def load_stats(self, user_id: int, today: datetime.date) -> UserStats: ...
+
+    @abstractmethod
+    def load_totals(self, user_id: int) -> UserTotals: ...
+
+    @abstractmethod
+    def load_water(self, user_id: int, day: datetime.date) -> int: ...
+
+    @abstractmethod
+    def load_rollups(self, user_id: int, period: str, since: datetime.date,
+                     until: datetime.date) -> Dict[datetime.date, ActivityBucket]: ...
+
+    @abstractmethod
+    def load_achievement_rules(self) -> List[AchievementRule]: ...
+
+    @abstractmethod
+    def load_workout_ratings(self) -> Dict[int, RatingAggregate]: ...
+
+    @abstractmethod
+    def load_recent_sessions(self, user_ids: List[int],
+                             since: datetime.datetime) -> Dict[int, List[Tuple[int, datetime.datetime]]]: ...
+
+    @abstractmethod
+    def iter_user_preferences(self, batch_size: int = 500) -> Iterator[List[Tuple[int, str, List[str]]]]: ...
+
+    @abstractmethod
+    def save_recommendations(self, user_ids: List[int], rows: List[Tuple[int, int, int, float]],
+                             computed_at: datetime.datetime): ...
+
+    @abstractmethod
+    def load_recommendations(self, user_id: int) -> Tuple[Optional[datetime.datetime], List[int]]: ...
+
+    @abstractmethod
+    def iter_nutrition_profiles(self, batch_size: int = 500) -> Iterator[List[Tuple[int, List[str], List[str]]]]: ...
+
+    @abstractmethod
+    def save_meal_plans(self, user_ids: List[int], start: datetime.date, end: datetime.date,
+                        rows: List[Tuple[int, datetime.date, str, int, int, int, float]]): ...
+
+    @abstractmethod
+    def load_meal_plan(self, user_id: int, start: datetime.date,
+                       end: datetime.date) -> List[Tuple[datetime.date, str, int, int, float]]: ...
+
+    @abstractmethod
+    def save_catalog(self, workouts: Sequence[Workout], activities: Sequence[KidsActivity]): ...
+
+    @abstractmethod
+    def search_workouts(self, categories: Sequence[str] = (), levels: Sequence[str] = (),
+                        duration: Optional[Range] = None, calories: Optional[Range] = None,
+                        text: Optional[str] = None, page: int = 0, page_size: int = 20) -> List[int]: ...
+
+    @abstractmethod
+    def search_kids_activities(self, types: Sequence[str] = (), age: Optional[Range] = None,
+                               duration: Optional[Range] = None, text: Optional[str] = None,
+                               page: int = 0, page_size: int = 20) -> List[int]: ...
+
+    @abstractmethod
+    def load_weight_history(self, user_id: int) -> List[Tuple[datetime.date, float]]: ...
+
+    @abstractmethod
+    def load_calorie_history(self, user_id: int) -> Tuple[List[Tuple], List[Tuple]]: ...
+
+    @abstractmethod
+    def apply_calorie_corrections(self, user_id: int, calories: Dict[int, int]): ...
+
+    @abstractmethod
+    def apply(self, batch: WriteBatch): ...
+
+    @abstractmethod
+    def journal_checkpoint(self, name: str) -> Optional[int]: ...
+
+class ConnectionPool:
+    # Reutiliza hasta `size` conexiones entre hilos; si todas están en uso,
+    # espera hasta `timeout` segundos a que se libere una
+    def __init__(self, factory: Callable[[], sqlite3.Connection], size: int = 5, timeout: float = 10.0):
+        self._factory = factory
+        self._size = size
+        self._timeout = timeout
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self._size:
+                self._created += 1
+                try:
+                    return self._factory()
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self._timeout)
+        except queue.Empty:
+            raise PoolTimeout(f"Sin conexiones libres tras {self._timeout}s") from None
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+class SQLiteBackend(StorageBackend):
+    def __init__(self, path: Path = DEFAULT_DB_PATH, pool_size: int = 5):
+        self.path = Path(path)
+        self.pool = ConnectionPool(self._connect, size=pool_size)
+        self.totals_cache = AggregateCache()
+        with self.pool.connection() as conn:
+            self._migrate(conn)
+        self.achievement_engine = AchievementEngine(self.load_achievement_rules())
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    def _migrate(self, conn: sqlite3.Connection):
+        # Las columnas nuevas van antes del esquema: sus índices y datos
+        # iniciales pueden usarlas. Las tablas que aún no existen las crea
+        # el esquema completas
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        has_summary = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'user_stats_summary'"
+        ).fetchone() is not None
+        with conn:
+            for added_in, table, column, definition in ADDED_COLUMNS:
+                if added_in <= version:
+                    continue
+                columns = {row['name'] for row in conn.execute(f"PRAGMA table_info({table})")}
+                if columns and column not in columns:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        conn.executescript(SCHEMA_PATH.read_text(encoding='utf-8'))
+        if not has_summary:
+            # Tabla nueva en una base con historial: apply() solo suma lo
+            # que se registre a partir de ahora
+            with conn:
+                self._rebuild_totals(conn)
+        if version < SCHEMA_VERSION:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        with self.pool.connection() as conn:
+            with conn:
+                yield conn
+
+    # Usuarios
+    def create_user(self, name: str, email: str, password: str) -> int:
+        try:
+            with self.transaction() as conn:
+                cursor = conn.execute(
+                    "INSERT INTO users (email, password_hash, name) VALUES (?, ?, ?)",
+                    (email, hash_password(password), name)
+                )
+                user_id = cursor.lastrowid
+                conn.execute("INSERT INTO user_profiles (user_id) VALUES (?)", (user_id,))
+                return user_id
+        except sqlite3.IntegrityError as exc:
+            raise EmailAlreadyRegistered(email) from exc
+
+    def authenticate(self, email: str, password: str) -> Optional[int]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT user_id, password_hash FROM users WHERE email = ? AND is_active = 1",
+                (email,)
+            ).fetchone()
+        if row is None or not verify_password(password, row['password_hash']):
+            return None
+        with self.transaction() as conn:
+            conn.execute("UPDATE users SET last_login = CURRENT_TIMESTAMP WHERE user_id = ?", (row['user_id'],))
+        return row['user_id']
+
+    def load_profile(self, user_id: int) -> Optional[UserProfile]:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                """
+                SELECT u.name, u.email, up.age, up.gender, up.fitness_level, up.is_premium,
+                       up.current_weight, up.height, up.target_weight
+                FROM users u
+                LEFT JOIN user_profiles up ON up.user_id = u.user_id
+                WHERE u.user_id = ?
+                """,
+                (user_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            goals = [
+                goal_row['goal_name'] for goal_row in conn.execute(
+                    """
+                    SELECT g.goal_name FROM user_goals ug
+                    JOIN goals g ON g.goal_id = ug.goal_id
+                    WHERE ug.user_id = ?
+                    ORDER BY ug.priority, ug.user_goal_id
+                    """,
+                    (user_id,)
+                )
+            ]
+            allergies = [
+                allergy_row['allergen'] for allergy_row in conn.execute(
+                    "SELECT allergen FROM user_allergies WHERE user_id = ? ORDER BY allergen", (user_id,)
+                )
+            ]
+        return UserProfile(
+            name=row['name'],
+            email=row['email'],
+            age=_to_text(row['age']),
+            gender=row['gender'] or "",
+            goals=goals,
+            fitness_level=row['fitness_level'] or "",
+            is_premium=bool(row['is_premium']),
+            weight=_to_text(row['current_weight']),
+            height=_to_text(row['height']),
+            target_weight=_to_text(row['target_weight']),
+            allergies=allergies
+        )
+
+    def load_stats(self, user_id: int, today: datetime.date) -> UserStats:
+        totals = self.load_totals(user_id)
+        with self.pool.connection() as conn:
+            today_row = conn.execute(
+                """
+                SELECT calories_burned, total_exercise_minutes, calories_consumed FROM daily_stats
+                WHERE user_id = ? AND stat_date = ?
+                """,
+                (user_id, today.isoformat())
+            ).fetchone()
+            streak = self._load_streaks(conn, [user_id]).get(user_id, StreakState())
+            week_start = period_start(WEEK, today)
+            days = self._read_rollups(conn, user_id, DAY, week_start, week_start + datetime.timedelta(days=6))
+            month_start = period_start(MONTH, today)
+            month = self._read_rollups(conn, user_id, MONTH, month_start, month_start).get(month_start, ActivityBucket())
+            achievements = [
+                row['achievement_name'] for row in conn.execute(
+                    """
+                    SELECT a.achievement_name FROM user_achievements ua
+                    JOIN achievements a ON a.achievement_id = ua.achievement_id
+                    WHERE ua.user_id = ? AND ua.is_completed = 1
+                    ORDER BY ua.unlocked_at, ua.user_achievement_id
+                    """,
+                    (user_id,)
+                )
+            ]
+
+        return UserStats(
+            streak_days=current_streak(streak, today),
+            longest_streak=streak.longest_streak,
+            total_workouts=totals.total_workouts,
+            total_calories=totals.total_calories,
+            total_minutes=totals.total_minutes,
+            today_calories=today_row['calories_burned'] if today_row else 0,
+            today_minutes=today_row['total_exercise_minutes'] if today_row else 0,
+            today_consumed=today_row['calories_consumed'] or 0 if today_row else 0,
+            weekly_progress=week_minutes(days, week_start),
+            month_workouts=month.workouts,
+            month_minutes=month.minutes,
+            month_calories=month.calories,
+            achievements=achievements,
+            last_workout_date=streak.last_active_date.isoformat() if streak.last_active_date else None
+        )
+
+    def load_totals(self, user_id: int) -> UserTotals:
+        return self.totals_cache.get(user_id, self._read_totals)
+
+    def _read_totals(self, user_id: int) -> UserTotals:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                """
+                SELECT total_workouts, total_calories, total_minutes, total_achievements
+                FROM user_stats_summary WHERE user_id = ?
+                """,
+                (user_id,)
+            ).fetchone()
+        if row is None:
+            return UserTotals()
+        return UserTotals(
+            total_workouts=row['total_workouts'],
+            total_calories=row['total_calories'],
+            total_minutes=row['total_minutes'],
+            total_achievements=row['total_achievements']
+        )
+
+    def rebuild_totals(self):
+        # Mantenimiento: recalcula user_stats_summary desde el historial
+        # completo (p. ej. tras importar sesiones por fuera de apply())
+        with self.transaction() as conn:
+            self._rebuild_totals(conn)
+        self.totals_cache.invalidate()
+
+    def _rebuild_totals(self, conn: sqlite3.Connection):
+        conn.execute(
+            """
+            INSERT INTO user_stats_summary (user_id, total_workouts, total_calories, total_minutes, last_workout_at)
+            SELECT user_id, COUNT(*), COALESCE(SUM(calories_burned), 0),
+                   COALESCE(SUM(duration_minutes), 0), MAX(completed_at)
+            FROM workout_sessions
+            WHERE is_completed = 1
+            GROUP BY user_id
+            ON CONFLICT (user_id) DO UPDATE SET
+                total_workouts = excluded.total_workouts,
+                total_calories = excluded.total_calories,
+                total_minutes = excluded.total_minutes,
+                last_workout_at = excluded.last_workout_at,
+                updated_at = CURRENT_TIMESTAMP
+            """
+        )
+        conn.execute(
+            """
+            UPDATE user_stats_summary SET total_achievements = (
+                SELECT COUNT(*) FROM user_achievements ua
+                WHERE ua.user_id = user_stats_summary.user_id AND ua.is_completed = 1
+            )
+            """
+        )
+
+    def load_rollups(self, user_id: int, period: str, since: datetime.date,
+                     until: datetime.date) -> Dict[datetime.date, ActivityBucket]:
+        with self.pool.connection() as conn:
+            return self._read_rollups(conn, user_id, period, since, until)
+
+    def _read_rollups(self, conn: sqlite3.Connection, user_id: int, period: str, since: datetime.date,
+                      until: datetime.date) -> Dict[datetime.date, ActivityBucket]:
+        # Cubos de `period` cuyo inicio está entre since y until (incluidos)
+        return {
+            datetime.date.fromisoformat(row['period_start']): ActivityBucket(
+                row['workouts_completed'], row['total_minutes'], row['calories_burned']
+            )
+            for row in conn.execute(
+                """
+                SELECT period_start, workouts_completed, total_minutes, calories_burned
+                FROM activity_rollups
+                WHERE user_id = ? AND period = ? AND period_start BETWEEN ? AND ?
+                """,
+                (user_id, period, since.isoformat(), until.isoformat())
+            )
+        }
+
+    def rebuild_rollups(self, max_buckets: int = MAX_BUCKETS, page_size: int = 5_000) -> int:
+        # Mantenimiento: recalcula activity_rollups desde workout_sessions.
+        # Las sesiones se leen por bloques de session_id (sin OFFSET) y los
+        # cubos se vuelcan cada `max_buckets`, así que la memoria no crece
+        # con el historial
+        def sessions(conn: sqlite3.Connection):
+            last_id = 0
+            while True:
+                rows = conn.execute(
+                    """
+                    SELECT session_id, user_id, completed_at, duration_minutes, calories_burned
+                    FROM workout_sessions
+                    WHERE session_id > ? AND is_completed = 1
+                    ORDER BY session_id LIMIT ?
+                    """,
+                    (last_id, page_size)
+                ).fetchall()
+                if not rows:
+                    return
+                for row in rows:
+                    yield (
+                        row['user_id'], datetime.datetime.fromisoformat(row['completed_at']).date(),
+                        row['duration_minutes'] or 0, row['calories_burned'] or 0
+                    )
+                last_id = rows[-1]['session_id']
+
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM activity_rollups")
+            return stream_rollups(
+                sessions(conn), lambda aggregator: self._write_rollups(conn, aggregator), max_buckets
+            )
+
+    def load_workout_ratings(self) -> Dict[int, RatingAggregate]:
+        with self.pool.connection() as conn:
+            return {
+                row['workout_id']: RatingAggregate(row['rating_sum'], row['rating_count'])
+                for row in conn.execute("SELECT workout_id, rating_sum, rating_count FROM workout_ratings")
+            }
+
+    def rebuild_ratings(self) -> int:
+        # Mantenimiento: recalcula workout_ratings recorriendo el historial
+        # una sola vez (p. ej. tras importar sesiones por fuera de apply());
+        # devuelve cuántos entrenamientos tienen valoración
+        with self.transaction() as conn:
+            ratings = ratings_from_history(
+                (row['workout_id'], row['difficulty_rating']) for row in conn.execute(
+                    """
+                    SELECT workout_id, difficulty_rating FROM workout_sessions
+                    WHERE is_completed = 1 AND difficulty_rating IS NOT NULL
+                    """
+                )
+            )
+            conn.execute("DELETE FROM workout_ratings")
+            conn.executemany(
+                "INSERT INTO workout_ratings (workout_id, rating_sum, rating_count) VALUES (?, ?, ?)",
+                [(workout_id, rating.rating_sum, rating.rating_count) for workout_id, rating in ratings.items()]
+            )
+            return len(ratings)
+
+    def _load_streaks(self, conn: sqlite3.Connection, user_ids: List[int]) -> Dict[int, StreakState]:
+        return {
+            row['user_id']: StreakState(
+                current_streak=row['current_streak'],
+                longest_streak=row['longest_streak'],
+                last_active_date=datetime.date.fromisoformat(row['last_active_date']) if row['last_active_date'] else None
+            )
+            for row in _select_in(
+                conn,
+                """
+                SELECT user_id, current_streak, longest_streak, last_active_date
+                FROM user_streaks WHERE user_id IN ({ids})
+                """,
+                user_ids
+            )
+        }
+
+    def load_recent_sessions(self, user_ids: List[int],
+                             since: datetime.datetime) -> Dict[int, List[Tuple[int, datetime.datetime]]]:
+        # (workout_id, completed_at) por usuario desde `since`; usa
+        # idx_workout_sessions_user_date
+        sessions: Dict[int, List[Tuple[int, datetime.datetime]]] = {}
+        with self.pool.connection() as conn:
+            for row in _select_in(
+                conn,
+                """
+                SELECT user_id, workout_id, completed_at FROM workout_sessions
+                WHERE user_id IN ({ids}) AND started_at >= ? AND is_completed = 1
+                ORDER BY user_id, started_at
+                """,
+                user_ids,
+                (since.isoformat(sep=' '),)
+            ):
+                sessions.setdefault(row['user_id'], []).append(
+                    (row['workout_id'], datetime.datetime.fromisoformat(row['completed_at']))
+                )
+        return sessions
+
+    def iter_user_preferences(self, batch_size: int = 500) -> Iterator[List[Tuple[int, str, List[str]]]]:
+        # (user_id, fitness_level, objetivos) de todos los usuarios activos,
+        # en bloques por clave (sin OFFSET)
+        last_id = 0
+        while True:
+            with self.pool.connection() as conn:
+                rows = conn.execute(
+                    """
+                    SELECT u.user_id, up.fitness_level FROM users u
+                    LEFT JOIN user_profiles up ON up.user_id = u.user_id
+                    WHERE u.user_id > ? AND u.is_active = 1
+                    ORDER BY u.user_id LIMIT ?
+                    """,
+                    (last_id, batch_size)
+                ).fetchall()
+                if not rows:
+                    return
+                user_ids = [row['user_id'] for row in rows]
+                goals: Dict[int, List[str]] = {}
+                for row in _select_in(
+                    conn,
+                    """
+                    SELECT ug.user_id, g.goal_name FROM user_goals ug
+                    JOIN goals g ON g.goal_id = ug.goal_id
+                    WHERE ug.user_id IN ({ids})
+                    ORDER BY ug.user_id, ug.priority, ug.user_goal_id
+                    """,
+                    user_ids
+                ):
+                    goals.setdefault(row['user_id'], []).append(row['goal_name'])
+            yield [(row['user_id'], row['fitness_level'] or "", goals.get(row['user_id'], [])) for row in rows]
+            last_id = user_ids[-1]
+
+    def save_recommendations(self, user_ids: List[int], rows: List[Tuple[int, int, int, float]],
+                             computed_at: datetime.datetime):
+        # Sustituye las recomendaciones de esos usuarios por
+        # (user_id, posición, workout_id, puntuación), calculadas en computed_at
+        with self.transaction() as conn:
+            for start in range(0, len(user_ids), MAX_QUERY_PARAMS):
+                chunk = user_ids[start:start + MAX_QUERY_PARAMS]
+                conn.execute(
+                    f"DELETE FROM user_recommendations WHERE user_id IN ({', '.join('?' * len(chunk))})", chunk
+                )
+            conn.executemany(
+                """
+                INSERT INTO user_recommendations (user_id, rank_position, workout_id, score, computed_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                [(*row, computed_at.isoformat(sep=' ')) for row in rows]
+            )
+
+    def load_recommendations(self, user_id: int) -> Tuple[Optional[datetime.datetime], List[int]]:
+        # (momento del cálculo, workout_ids en orden); (None, []) si no hay
+        with self.pool.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT workout_id, computed_at FROM user_recommendations
+                WHERE user_id = ? ORDER BY rank_position
+                """,
+                (user_id,)
+            ).fetchall()
+        if not rows:
+            return None, []
+        return datetime.datetime.fromisoformat(rows[0]['computed_at']), [row['workout_id'] for row in rows]
+
+    def iter_nutrition_profiles(self, batch_size: int = 500) -> Iterator[List[Tuple[int, List[str], List[str]]]]:
+        # (user_id, objetivos, alergias) de los usuarios activos, por bloques
+        last_id = 0
+        while True:
+            with self.pool.connection() as conn:
+                user_ids = [
+                    row['user_id'] for row in conn.execute(
+                        "SELECT user_id FROM users WHERE user_id > ? AND is_active = 1 ORDER BY user_id LIMIT ?",
+                        (last_id, batch_size)
+                    )
+                ]
+                if not user_ids:
+                    return
+                goals: Dict[int, List[str]] = {}
+                for row in _select_in(
+                    conn,
+                    """
+                    SELECT ug.user_id, g.goal_name FROM user_goals ug
+                    JOIN goals g ON g.goal_id = ug.goal_id
+                    WHERE ug.user_id IN ({ids})
+                    ORDER BY ug.user_id, ug.priority, ug.user_goal_id
+                    """,
+                    user_ids
+                ):
+                    goals.setdefault(row['user_id'], []).append(row['goal_name'])
+                allergies: Dict[int, List[str]] = {}
+                for row in _select_in(
+                    conn,
+                    "SELECT user_id, allergen FROM user_allergies WHERE user_id IN ({ids}) ORDER BY user_id, allergen",
+                    user_ids
+                ):
+                    allergies.setdefault(row['user_id'], []).append(row['allergen'])
+            yield [(user_id, goals.get(user_id, []), allergies.get(user_id, [])) for user_id in user_ids]
+            last_id = user_ids[-1]
+
+    def save_meal_plans(self, user_ids: List[int], start: datetime.date, end: datetime.date,
+                        rows: List[Tuple[int, datetime.date, str, int, int, int, float]]):
+        # Sustituye los días [start, end] del plan de esos usuarios por
+        # (user_id, día, franja, posición, plan, meal_id, raciones)
+        with self.transaction() as conn:
+            for chunk_start in range(0, len(user_ids), MAX_QUERY_PARAMS - 2):
+                chunk = user_ids[chunk_start:chunk_start + MAX_QUERY_PARAMS - 2]
+                conn.execute(
+                    f"""
+                    DELETE FROM user_meal_plans
+                    WHERE user_id IN ({', '.join('?' * len(chunk))}) AND plan_date BETWEEN ? AND ?
+                    """,
+                    (*chunk, start.isoformat(), end.isoformat())
+                )
+            conn.executemany(
+                """
+                INSERT INTO user_meal_plans (
+                    user_id, plan_date, meal_type, position, nutrition_plan_id, meal_id, servings
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (user_id, day.isoformat(), meal_type, position, plan_id, meal_id, servings)
+                    for user_id, day, meal_type, position, plan_id, meal_id, servings in rows
+                ]
+            )
+
+    def load_meal_plan(self, user_id: int, start: datetime.date,
+                       end: datetime.date) -> List[Tuple[datetime.date, str, int, int, float]]:
+        # (día, franja, plan, meal_id, raciones) en orden de clave primaria
+        with self.pool.connection() as conn:
+            return [
+                (datetime.date.fromisoformat(row['plan_date']), row['meal_type'], row['nutrition_plan_id'],
+                 row['meal_id'], row['servings'])
+                for row in conn.execute(
+                    """
+                    SELECT plan_date, meal_type, nutrition_plan_id, meal_id, servings FROM user_meal_plans
+                    WHERE user_id = ? AND plan_date BETWEEN ? AND ?
+                    ORDER BY plan_date, meal_type, position
+                    """,
+                    (user_id, start.isoformat(), end.isoformat())
+                )
+            ]
+
+    def save_catalog(self, workouts: Sequence[Workout], activities: Sequence[KidsActivity]):
+        # Copia el catálogo (CSV) en las tablas de búsqueda por SQL, con los
+        # niveles normalizados y los rangos de texto ("6-12 años") en columnas
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM workouts")
+            conn.execute("DELETE FROM kids_activities")
+            conn.executemany(
+                "INSERT OR IGNORE INTO workout_categories (category_name) VALUES (?)",
+                [(category,) for category in sorted({workout.category for workout in workouts})]
+            )
+            conn.executemany(
+                """
+                INSERT INTO workouts (
+                    workout_id, name, description, category_id, duration_minutes, difficulty_level,
+                    calories_min, calories_max, rating, total_completions, image_emoji
+                )
+                SELECT ?, ?, ?, category_id, ?, ?, ?, ?, ?, ?, ? FROM workout_categories WHERE category_name = ?
+                """,
+                [
+                    (workout.id, workout.name, workout.description, workout.duration_minutes,
+                     normalize(workout.level), workout.calories_min, workout.calories_max, workout.rating,
+                     workout.completions, workout.image, workout.category)
+                    for workout in workouts
+                ]
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO kids_activity_categories (category_name) VALUES (?)",
+                [(activity_type,) for activity_type in sorted({activity.type for activity in activities})]
+            )
+            rows = []
+            for activity in activities:
+                age_min, age_max = parse_range(activity.age) or (0, 0)
+                duration = parse_range(activity.duration)
+                rows.append((
+                    activity.id, activity.name, age_min, age_max, duration[0] if duration else None,
+                    normalize(activity.difficulty), activity.image, activity.adult_supervision, activity.type
+                ))
+            conn.executemany(
+                """
+                INSERT INTO kids_activities (
+                    activity_id, activity_name, category_id, age_min, age_max, duration_minutes,
+                    difficulty_level, image_emoji, adult_supervision
+                )
+                SELECT ?, ?, category_id, ?, ?, ?, ?, ?, ? FROM kids_activity_categories WHERE category_name = ?
+                """,
+                rows
+            )
+
+    def search_workouts(self, categories: Sequence[str] = (), levels: Sequence[str] = (),
+                        duration: Optional[Range] = None, calories: Optional[Range] = None,
+                        text: Optional[str] = None, page: int = 0, page_size: int = 20) -> List[int]:
+        # workout_ids de la página; usa idx_workouts_category_difficulty
+        sql, params = workout_search_sql(
+            categories, levels, duration, calories, text, page, page_size, placeholder="?"
+        )
+        with self.pool.connection() as conn:
+            return [row['workout_id'] for row in conn.execute(sql, params)]
+
+    def search_kids_activities(self, types: Sequence[str] = (), age: Optional[Range] = None,
+                               duration: Optional[Range] = None, text: Optional[str] = None,
+                               page: int = 0, page_size: int = 20) -> List[int]:
+        # activity_ids de la página; usa idx_kids_activities_age
+        sql, params = kids_search_sql(types, age, duration, text, page, page_size, placeholder="?")
+        with self.pool.connection() as conn:
+            return [row['activity_id'] for row in conn.execute(sql, params)]
+
+    def load_weight_history(self, user_id: int) -> List[Tuple[datetime.date, float]]:
+        # (fecha, kg) de body_measurements en orden cronológico; usa
+        # idx_body_measurements_user_date
+        with self.pool.connection() as conn:
+            return [
+                (datetime.date.fromisoformat(row['measurement_date']), float(row['weight_kg']))
+                for row in conn.execute(
+                    """
+                    SELECT measurement_date, weight_kg FROM body_measurements
+                    WHERE user_id = ? AND weight_kg IS NOT NULL
+                    ORDER BY measurement_date, measurement_id
+                    """,
+                    (user_id,)
+                )
+            ]
+
+    def load_calorie_history(self, user_id: int) -> Tuple[List[Tuple], List[Tuple]]:
+        # Sesiones completadas (session_id, workout_id, día, calorías,
+        # minutos) y su telemetría como filas de enteros (session_id,
+        # exercise_id o -1, duration_seconds o -1, rest_seconds, skipped,
+        # sets_completed, reps_completed), en dos consultas
+        with self.pool.connection() as conn:
+            sessions = [
+                (
+                    row['session_id'], row['workout_id'],
+                    datetime.datetime.fromisoformat(row['completed_at']).date(),
+                    row['calories_burned'] or 0, row['duration_minutes'] or 0
+                )
+                for row in conn.execute(
+                    """
+                    SELECT session_id, workout_id, completed_at, calories_burned, duration_minutes
+                    FROM workout_sessions
+                    WHERE user_id = ? AND is_completed = 1
+                    """,
+                    (user_id,)
+                )
+            ]
+            details = [
+                tuple(row) for row in conn.execute(
+                    """
+                    SELECT d.session_id, COALESCE(d.exercise_id, -1), COALESCE(d.duration_seconds, -1),
+                           COALESCE(d.rest_seconds, 0), COALESCE(d.skipped, 0),
+                           COALESCE(d.sets_completed, 0), COALESCE(d.reps_completed, 0)
+                    FROM session_exercise_details d
+                    JOIN workout_sessions ws ON ws.session_id = d.session_id
+                    WHERE ws.user_id = ? AND ws.is_completed = 1
+                    """,
+                    (user_id,)
+                )
+            ]
+        return sessions, details
+
+    def apply_calorie_corrections(self, user_id: int, calories: Dict[int, int]):
+        # Sustituye calories_burned de esas sesiones y lleva la diferencia a
+        # daily_stats (por día), activity_rollups y user_stats_summary, sin
+        # recalcular desde el historial
+        if not calories:
+            return
+        with self.transaction() as conn:
+            session_ids = list(calories)
+            per_day: Dict[str, int] = {}
+            for row in _select_in(
+                conn,
+                """
+                SELECT session_id, completed_at, calories_burned FROM workout_sessions
+                WHERE session_id IN ({ids}) AND user_id = ?
+                """,
+                session_ids,
+                (user_id,)
+            ):
+                delta = calories[row['session_id']] - (row['calories_burned'] or 0)
+                day = datetime.datetime.fromisoformat(row['completed_at']).date().isoformat()
+                per_day[day] = per_day.get(day, 0) + delta
+            conn.executemany(
+                "UPDATE workout_sessions SET calories_burned = ? WHERE session_id = ? AND user_id = ?",
+                [(kcal, session_id, user_id) for session_id, kcal in calories.items()]
+            )
+            conn.executemany(
+                """
+                UPDATE daily_stats SET calories_burned = calories_burned + ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ? AND stat_date = ?
+                """,
+                [(delta, user_id, day) for day, delta in per_day.items() if delta]
+            )
+            conn.execute(
+                """
+                UPDATE user_stats_summary SET total_calories = total_calories + ?, updated_at = CURRENT_TIMESTAMP
+                WHERE user_id = ?
+                """,
+                (sum(per_day.values()), user_id)
+            )
+            rollups = RollupAggregator()
+            for day, delta in per_day.items():
+                if delta:
+                    rollups.add(user_id, datetime.date.fromisoformat(day), calories=delta)
+            self._write_rollups(conn, rollups)
+        self.totals_cache.invalidate({user_id})
+
+    def load_water(self, user_id: int, day: datetime.date) -> int:
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT water_glasses FROM daily_stats WHERE user_id = ? AND stat_date = ?",
+                (user_id, day.isoformat())
+            ).fetchone()
+        return row['water_glasses'] if row else 0
+
+    def apply(self, batch: WriteBatch):
+        if not batch and batch.journal is None:
+            return
+        with self.transaction() as conn:
+            self._write_profiles(conn, batch.profiles)
+            self._write_weights(conn, batch.weights)
+            self._write_workouts(conn, batch.workouts)
+            self._write_food(conn, batch.food)
+            conn.executemany(
+                """
+                INSERT INTO daily_stats (user_id, stat_date, water_glasses) VALUES (?, ?, ?)
+                ON CONFLICT (user_id, stat_date) DO UPDATE SET
+                    water_glasses = excluded.water_glasses,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                [(user_id, day.isoformat(), glasses) for (user_id, day), glasses in batch.water.items()]
+            )
+            if batch.journal is not None:
+                conn.execute(
+                    """
+                    INSERT INTO journal_checkpoints (journal_name, last_seq) VALUES (?, ?)
+                    ON CONFLICT (journal_name) DO UPDATE SET
+                        last_seq = MAX(last_seq, excluded.last_seq),
+                        updated_at = CURRENT_TIMESTAMP
+                    """,
+                    batch.journal
+                )
+        self.totals_cache.invalidate(batch.user_ids())
+
+    def load_achievement_rules(self) -> List[AchievementRule]:
+        with self.pool.connection() as conn:
+            return [
+                AchievementRule(
+                    achievement_id=row['achievement_id'],
+                    name=row['achievement_name'],
+                    requirement_type=row['requirement_type'],
+                    requirement_value=row['requirement_value'],
+                    requirement_unit=row['requirement_unit']
+                )
+                for row in conn.execute(
+                    """
+                    SELECT achievement_id, achievement_name, requirement_type, requirement_value, requirement_unit
+                    FROM achievements
+                    """
+                )
+            ]
+
+    def journal_checkpoint(self, name: str) -> Optional[int]:
+        # None si ese journal aún no ha aplicado nada
+        with self.pool.connection() as conn:
+            row = conn.execute(
+                "SELECT last_seq FROM journal_checkpoints WHERE journal_name = ?", (name,)
+            ).fetchone()
+        return row['last_seq'] if row else None
+
+    def _write_profiles(self, conn: sqlite3.Connection, profiles: Dict[int, UserProfile]):
+        if not profiles:
+            return
+        conn.executemany(
+            "UPDATE users SET name = ?, updated_at = CURRENT_TIMESTAMP WHERE user_id = ?",
+            [(profile.name, user_id) for user_id, profile in profiles.items() if profile.name]
+        )
+        conn.executemany(
+            """
+            INSERT INTO user_profiles (user_id, age, gender, height, current_weight, target_weight, fitness_level, is_premium)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                age = excluded.age,
+                gender = excluded.gender,
+                height = excluded.height,
+                current_weight = excluded.current_weight,
+                target_weight = excluded.target_weight,
+                fitness_level = excluded.fitness_level,
+                is_premium = excluded.is_premium,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            [
+                (
+                    user_id,
+                    _to_int(profile.age),
+                    profile.gender or None,
+                    _to_float(profile.height),
+                    _to_float(profile.weight),
+                    _to_float(profile.target_weight),
+                    profile.fitness_level or None,
+                    int(profile.is_premium)
+                )
+                for user_id, profile in profiles.items()
+            ]
+        )
+        conn.executemany("DELETE FROM user_goals WHERE user_id = ?", [(user_id,) for user_id in profiles])
+        conn.executemany(
+            """
+            INSERT OR IGNORE INTO user_goals (user_id, goal_id, priority)
+            SELECT ?, goal_id, ? FROM goals WHERE goal_name = ?
+            """,
+            [
+                (user_id, priority, goal)
+                for user_id, profile in profiles.items()
+                for priority, goal in enumerate(profile.goals, start=1)
+            ]
+        )
+        # Las recomendaciones precalculadas usan el nivel y los objetivos
+        # anteriores: la pestaña de inicio vuelve a puntuar en vivo
+        conn.executemany("DELETE FROM user_recommendations WHERE user_id = ?", [(user_id,) for user_id in profiles])
+        conn.executemany("DELETE FROM user_allergies WHERE user_id = ?", [(user_id,) for user_id in profiles])
+        conn.executemany(
+            "INSERT OR IGNORE INTO user_allergies (user_id, allergen) VALUES (?, ?)",
+            [(user_id, allergen) for user_id, profile in profiles.items() for allergen in profile.allergies]
+        )
+
+    def _write_weights(self, conn: sqlite3.Connection, weights: List[Tuple[int, datetime.date, float]]):
+        if not weights:
+            return
+        conn.executemany(
+            "INSERT INTO body_measurements (user_id, measurement_date, weight_kg) VALUES (?, ?, ?)",
+            [(user_id, day.isoformat(), kg) for user_id, day, kg in weights]
+        )
+        # El peso del perfil es la lectura más reciente (como el trigger
+        # track_weight_progress de MySQL); una lectura atrasada no lo cambia
+        latest: Dict[int, Tuple[datetime.date, float]] = {}
+        for user_id, day, kg in weights:
+            if user_id not in latest or day >= latest[user_id][0]:
+                latest[user_id] = (day, kg)
+        conn.executemany(
+            """
+            UPDATE user_profiles SET current_weight = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE user_id = ? AND NOT EXISTS (
+                SELECT 1 FROM body_measurements bm WHERE bm.user_id = ? AND bm.measurement_date > ?
+            )
+            """,
+            [(kg, user_id, user_id, day.isoformat()) for user_id, (day, kg) in latest.items()]
+        )
+
+    def _write_food(self, conn: sqlite3.Connection, entries: List[FoodLogEntry]):
+        if not entries:
+            return
+        conn.executemany(
+            """
+            INSERT INTO user_nutrition_log (
+                user_id, meal_id, date, meal_type, calories_consumed, custom_meal_name, custom_calories, notes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (entry.user_id, entry.meal_id, entry.day.isoformat(), entry.meal_type, entry.calories,
+                 entry.custom_meal_name, entry.custom_calories, entry.notes)
+                for entry in entries
+            ]
+        )
+        # Un upsert aditivo por (usuario, día) del lote, en orden de clave
+        intake: Dict[Tuple[int, str], int] = {}
+        for entry in entries:
+            key = (entry.user_id, entry.day.isoformat())
+            intake[key] = intake.get(key, 0) + entry.calories
+        conn.executemany(
+            """
+            INSERT INTO daily_stats (user_id, stat_date, calories_consumed) VALUES (?, ?, ?)
+            ON CONFLICT (user_id, stat_date) DO UPDATE SET
+                calories_consumed = calories_consumed + excluded.calories_consumed,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            [(user_id, day, calories) for (user_id, day), calories in sorted(intake.items())]
+        )
+
+    def _write_workouts(self, conn: sqlite3.Connection, workouts: List[WorkoutRecord]):
+        if not workouts:
+            return
+        # Una inserción por sesión para tener su session_id (lastrowid),
+        # como con cursor.lastrowid en MySQL
+        session_ids = [
+            conn.execute(
+                """
+                INSERT INTO workout_sessions (
+                    user_id, workout_id, started_at, completed_at, calories_burned,
+                    duration_minutes, difficulty_rating, enjoyment_rating, is_completed
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, 1)
+                """,
+                (
+                    record.user_id, record.workout_id,
+                    record.started_at.isoformat(sep=' '), record.completed_at.isoformat(sep=' '),
+                    record.calories_burned, record.duration_minutes,
+                    record.difficulty_rating, record.enjoyment_rating
+                )
+            ).lastrowid
+            for record in workouts
+        ]
+
+        # Telemetría por ejercicio de todo el lote en un solo executemany
+        details = [
+            (
+                session_id, detail.exercise_order, detail.exercise_id,
+                detail.sets_completed, detail.reps_completed, detail.duration_seconds,
+                detail.rest_seconds, detail.extra_seconds, detail.pauses, int(detail.skipped)
+            )
+            for session_id, record in zip(session_ids, workouts)
+            for detail in record.exercises
+        ]
+        if details:
+            conn.executemany(
+                """
+                INSERT INTO session_exercise_details (
+                    session_id, exercise_order, exercise_id, sets_completed, reps_completed,
+                    duration_seconds, rest_seconds, extra_seconds, pauses, skipped
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                details
+            )
+
+        # Una fila de daily_stats por (usuario, día), no una por sesión
+        per_day: Dict[Tuple[int, str], List[int]] = {}
+        for record in workouts:
+            totals = per_day.setdefault((record.user_id, record.completed_at.date().isoformat()), [0, 0, 0])
+            totals[0] += 1
+            totals[1] += record.duration_minutes
+            totals[2] += record.calories_burned
+        conn.executemany(
+            """
+            INSERT INTO daily_stats (user_id, stat_date, workouts_completed, total_exercise_minutes, calories_burned)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, stat_date) DO UPDATE SET
+                workouts_completed = workouts_completed + excluded.workouts_completed,
+                total_exercise_minutes = total_exercise_minutes + excluded.total_exercise_minutes,
+                calories_burned = calories_burned + excluded.calories_burned,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            [(user_id, day, *totals) for (user_id, day), totals in per_day.items()]
+        )
+
+        # Cubos de día, semana y mes
+        rollups = RollupAggregator()
+        for record in workouts:
+            rollups.add(record.user_id, record.completed_at.date(), 1, record.duration_minutes, record.calories_burned)
+        self._write_rollups(conn, rollups)
+
+        # Valoraciones: suma y conteo por entrenamiento, sin recalcular la media
+        ratings = RatingAggregator()
+        for record in workouts:
+            ratings.add(record.workout_id, record.difficulty_rating)
+        if ratings:
+            conn.executemany(
+                """
+                INSERT INTO workout_ratings (workout_id, rating_sum, rating_count) VALUES (?, ?, ?)
+                ON CONFLICT (workout_id) DO UPDATE SET
+                    rating_sum = rating_sum + excluded.rating_sum,
+                    rating_count = rating_count + excluded.rating_count,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                [(workout_id, rating.rating_sum, rating.rating_count) for workout_id, rating in ratings.ratings.items()]
+            )
+
+        # Totales por usuario (user_stats_summary), una fila por usuario
+        per_user: Dict[int, List] = {}
+        for record in workouts:
+            totals = per_user.setdefault(record.user_id, [0, 0, 0, record.completed_at])
+            totals[0] += 1
+            totals[1] += record.calories_burned
+            totals[2] += record.duration_minutes
+            totals[3] = max(totals[3], record.completed_at)
+        conn.executemany(
+            """
+            INSERT INTO user_stats_summary (user_id, total_workouts, total_calories, total_minutes, last_workout_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                total_workouts = total_workouts + excluded.total_workouts,
+                total_calories = total_calories + excluded.total_calories,
+                total_minutes = total_minutes + excluded.total_minutes,
+                last_workout_at = MAX(COALESCE(last_workout_at, ''), excluded.last_workout_at),
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            [
+                (user_id, count, calories, minutes, last_at.isoformat(sep=' '))
+                for user_id, (count, calories, minutes, last_at) in per_user.items()
+            ]
+        )
+
+        # Rachas: se avanzan en memoria en orden cronológico y se escribe una
+        # fila por usuario
+        streaks = self._load_streaks(conn, sorted({record.user_id for record in workouts}))
+        for record in sorted(workouts, key=lambda r: r.completed_at):
+            streaks[record.user_id] = advance(streaks.get(record.user_id, StreakState()), record.completed_at.date())
+        conn.executemany(
+            """
+            INSERT INTO user_streaks (user_id, current_streak, longest_streak, last_active_date)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (user_id) DO UPDATE SET
+                current_streak = excluded.current_streak,
+                longest_streak = excluded.longest_streak,
+                last_active_date = excluded.last_active_date,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            [
+                (user_id, state.current_streak, state.longest_streak, state.last_active_date.isoformat())
+                for user_id, state in streaks.items()
+            ]
+        )
+
+        self._unlock_achievements(conn, streaks)
+
+    def _write_rollups(self, conn: sqlite3.Connection, rollups: RollupAggregator):
+        conn.executemany(
+            """
+            INSERT INTO activity_rollups (
+                user_id, period, period_start, workouts_completed, total_minutes, calories_burned
+            ) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, period, period_start) DO UPDATE SET
+                workouts_completed = workouts_completed + excluded.workouts_completed,
+                total_minutes = total_minutes + excluded.total_minutes,
+                calories_burned = calories_burned + excluded.calories_burned,
+                updated_at = CURRENT_TIMESTAMP
+            """,
+            rollups.rows()
+        )
+
+    def _unlock_achievements(self, conn: sqlite3.Connection, streaks: Dict[int, StreakState]):
+        # user_stats_summary y user_streaks ya incluyen este lote: se evalúan
+        # las reglas contra esos contadores y se desbloquea en un executemany
+        user_ids = sorted(streaks)
+        totals = {
+            row['user_id']: row for row in _select_in(
+                conn,
+                "SELECT user_id, total_workouts, total_calories FROM user_stats_summary WHERE user_id IN ({ids})",
+                user_ids
+            )
+        }
+        unlocked: Dict[int, Set[int]] = {user_id: set() for user_id in user_ids}
+        for row in _select_in(
+            conn,
+            "SELECT user_id, achievement_id FROM user_achievements WHERE is_completed = 1 AND user_id IN ({ids})",
+            user_ids
+        ):
+            unlocked[row['user_id']].add(row['achievement_id'])
+
+        rows = []
+        for user_id in user_ids:
+            progress = {
+                WORKOUTS: totals[user_id]['total_workouts'],
+                CALORIES: totals[user_id]['total_calories'],
+                STREAK: streaks[user_id].current_streak,
+            }
+            for rule in self.achievement_engine.evaluate(progress, unlocked[user_id]):
+                rows.append((user_id, rule.achievement_id, progress[rule.counter]))
+        if not rows:
+            return
+
+        conn.executemany(
+            """
+            INSERT INTO user_achievements (user_id, achievement_id, progress_value, is_completed)
+            VALUES (?, ?, ?, 1)
+            ON CONFLICT (user_id, achievement_id) DO UPDATE SET
+                progress_value = excluded.progress_value,
+                is_completed = 1,
+                unlocked_at = CURRENT_TIMESTAMP
+            """,
+            rows
+        )
+        per_user: Dict[int, int] = {}
+        for user_id, _, _ in rows:
+            per_user[user_id] = per_user.get(user_id, 0) + 1
+        conn.executemany(
+            "UPDATE user_stats_summary SET total_achievements = total_achievements + ? WHERE user_id = ?",
+            [(count, user_id) for user_id, count in per_user.items()]
+        )
+
+class SessionStore:
+    # Caché de lectura por sesión: cada dato se consulta una sola vez por
+    # sesión y se descarta cuando esta misma sesión escribe sobre el usuario
+    def __init__(self, backend: StorageBackend):
+        self.backend = backend
+        self._cache: Dict[Hashable, object] = {}
+
+    def _read(self, key: Hashable, loader: Callable[[], object]):
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return self._cache[key]
+
+    def profile(self, user_id: int) -> Optional[UserProfile]:
+        return self._read(('profile', user_id), lambda: self.backend.load_profile(user_id))
+
+    def stats(self, user_id: int, today: datetime.date) -> UserStats:
+        return self._read(('stats', user_id, today), lambda: self.backend.load_stats(user_id, today))
+
+    def water(self, user_id: int, day: datetime.date) -> int:
+        return self._read(('water', user_id, day), lambda: self.backend.load_water(user_id, day))
+
+    def meal_plan(self, user_id: int, start: datetime.date,
+                  end: datetime.date) -> List[Tuple[datetime.date, str, int, int, float]]:
+        return self._read(('meal_plan', user_id, start, end), lambda: self.backend.load_meal_plan(user_id, start, end))
+
+    def recommendations(self, user_id: int) -> Tuple[Optional[datetime.datetime], List[int]]:
+        return self._read(('recommendations', user_id), lambda: self.backend.load_recommendations(user_id))
+
+    def weights(self, user_id: int) -> WeightSeries:
+        return self._read(('weights', user_id), lambda: WeightSeries(self.backend.load_weight_history(user_id)))
+
+    def recent_sessions(self, user_id: int, since: datetime.date) -> List[Tuple[int, datetime.datetime]]:
+        start = datetime.datetime.combine(since, datetime.time())
+        return self._read(
+            ('recent_sessions', user_id, since),
+            lambda: self.backend.load_recent_sessions([user_id], start).get(user_id, [])
+        )
+
+    def write(self, batch: WriteBatch):
+        self.backend.apply(batch)
+        for user_id in batch.user_ids():
+            self.invalidate(user_id)
+
+    def record_weight(self, user_id: int, day: datetime.date, kg: float):
+        batch = WriteBatch()
+        batch.record_weight(user_id, day, kg)
+        series = self._cache.get(('weights', user_id))
+        self.write(batch)
+        # La serie en caché sigue siendo válida con la lectura añadida
+        if series is not None:
+            series.append(day, kg)
+            self._cache[('weights', user_id)] = series
+
+    # Eventos que aún están en el journal (fithome.journal): la base no los
+    # tiene, así que se aplican sobre lo cacheado en vez de invalidarlo
+    def add_session(self, user_id: int, workout_id: int, started_at: datetime.datetime,
+                    completed_at: datetime.datetime):
+        for key, sessions in self._cache.items():
+            if key[0] == 'recent_sessions' and key[1] == user_id and started_at.date() >= key[2]:
+                sessions.append((workout_id, completed_at))
+
+    def set_water(self, user_id: int, day: datetime.date, glasses: int):
+        if ('water', user_id, day) in self._cache:
+            self._cache[('water', user_id, day)] = glasses
+
+    def invalidate(self, user_id: Optional[int] = None):
+        if user_id is None:
+            self._cache.clear()
+            return
+        for key in [key for key in self._cache if key[1] == user_id]:
+            del self._cache[key]
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+def get_backend() -> StorageBackend:
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = SQLiteBackend()
+    return _backend
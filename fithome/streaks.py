@@ -0,0 +1,45 @@
+import datetime
+from dataclasses import dataclass, replace
+from typing import Iterable, Optional
+
+# Racha de días consecutivos mantenida de forma incremental: cada
+# entrenamiento actualiza el estado en O(1) y leer la racha es leer una
+# fila (user_streaks), sin recorrer daily_stats.
+
+@dataclass(frozen=True, slots=True)
+class StreakState:
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_active_date: Optional[datetime.date] = None
+
+def advance(state: StreakState, day: datetime.date) -> StreakState:
+    # Misma regla que complete_workout(): el mismo día no suma, el día
+    # siguiente suma uno y un hueco reinicia la racha. Un día anterior al
+    # último registrado (evento atrasado) no modifica la racha.
+    if state.last_active_date is None:
+        current = 1
+    else:
+        days_diff = (day - state.last_active_date).days
+        if days_diff <= 0:
+            return state
+        current = state.current_streak + 1 if days_diff == 1 else 1
+    return replace(
+        state,
+        current_streak=current,
+        longest_streak=max(state.longest_streak, current),
+        last_active_date=day
+    )
+
+def current_streak(state: StreakState, today: datetime.date) -> int:
+    # La racha sigue viva si se entrenó hoy o ayer
+    if state.last_active_date is None or (today - state.last_active_date).days > 1:
+        return 0
+    return state.current_streak
+
+def from_history(days: Iterable[datetime.date]) -> StreakState:
+    # Reconstrucción completa (migraciones o backfill) a partir de los días
+    # con entrenamiento, en cualquier orden
+    state = StreakState()
+    for day in sorted(set(days)):
+        state = advance(state, day)
+    return state
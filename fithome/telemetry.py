@@ -0,0 +1,83 @@
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from fithome.models import Workout
+
+# Telemetría por ejercicio de una sesión de entrenamiento. El temporizador
+# del navegador mide cada fase y envía en cada transición la lista completa
+# de ejercicios terminados; WorkoutTelemetry la guarda en memoria (en
+# st.session_state) junto con las pausas y, al completar, se escribe con el
+# evento del journal en un único executemany sobre session_exercise_details.
+
+@dataclass(frozen=True, slots=True)
+class ExerciseDetail:
+    # Posición del ejercicio en el entrenamiento (un ejercicio puede repetirse)
+    exercise_order: int
+    exercise_id: Optional[int]
+    # Tiempo real en la fase de ejercicio y en el descanso siguiente
+    duration_seconds: Optional[int] = None
+    rest_seconds: Optional[int] = None
+    # Segundos añadidos con "+10s"
+    extra_seconds: int = 0
+    skipped: bool = False
+    pauses: int = 0
+    sets_completed: Optional[int] = None
+    reps_completed: Optional[int] = None
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "ExerciseDetail":
+        return cls(**{name: data[name] for name in cls.__dataclass_fields__ if name in data})
+
+def _seconds(value) -> Optional[int]:
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return None
+
+class WorkoutTelemetry:
+    def __init__(self, workout: Workout):
+        self.workout = workout
+        self._entries: Dict[int, Dict] = {}
+        self._pauses: Dict[int, int] = {}
+
+    def update(self, exercises: Iterable[Mapping]):
+        # Cada evento trae todo lo medido desde que se montó el temporizador;
+        # tras una pausa el componente empieza de cero, así que se fusiona
+        # por posición en lugar de sustituir la lista
+        for entry in exercises or ():
+            index = _seconds(entry.get('exercise'))
+            if index is None or index >= len(self.workout.exercises):
+                continue
+            self._entries.setdefault(index, {}).update(entry)
+
+    def pause(self, exercise_index: int):
+        self._pauses[exercise_index] = self._pauses.get(exercise_index, 0) + 1
+
+    def details(self) -> List[ExerciseDetail]:
+        details = []
+        for index in sorted(self._entries.keys() | self._pauses.keys()):
+            entry = self._entries.get(index, {})
+            exercise = self.workout.exercises[index]
+            skipped = bool(entry.get('skipped', False))
+            done = bool(entry) and not skipped
+            details.append(ExerciseDetail(
+                exercise_order=index,
+                exercise_id=exercise.exercise_id,
+                duration_seconds=_seconds(entry.get('seconds')),
+                rest_seconds=_seconds(entry.get('rest_seconds')),
+                extra_seconds=_seconds(entry.get('extra_seconds')) or 0,
+                skipped=skipped,
+                pauses=self._pauses.get(index, 0),
+                sets_completed=exercise.sets if done and exercise.sets is not None else None,
+                reps_completed=exercise.reps if done and exercise.sets is not None else None,
+            ))
+        return details
+
+    def active_seconds(self) -> int:
+        return sum(
+            (_seconds(entry.get('seconds')) or 0) + (_seconds(entry.get('rest_seconds')) or 0)
+            for entry in self._entries.values()
+        )
@@ -0,0 +1 @@
+# Piezas de interfaz compartidas por las pantallas: estilos y fragmentos HTML
@@ -0,0 +1,185 @@
+import threading
+from collections import OrderedDict
+from html import escape
+from typing import Callable, Dict, Hashable, Tuple
+
+from fithome.models import KidsActivity, Movie, Workout
+
+# HTML de las tarjetas del catálogo renderizado una vez y compartido por
+# todas las sesiones del proceso. La clave es (tipo, id del registro, tema,
+# idioma); si el catálogo se recarga y el registro cambia, la entrada se
+# vuelve a renderizar en la siguiente lectura.
+
+DEFAULT_THEME = "default"
+DEFAULT_LOCALE = "es"
+
+THEMES: Dict[str, Dict[str, str]] = {
+    "masculino": {'primary': '#3B82F6', 'secondary': '#DBEAFE', 'accent': '#1D4ED8'},
+    "femenino": {'primary': '#EC4899', 'secondary': '#FCE7F3', 'accent': '#BE185D'},
+    DEFAULT_THEME: {'primary': '#6366F1', 'secondary': '#E0E7FF', 'accent': '#4338CA'},
+}
+
+LABELS: Dict[str, Dict[str, str]] = {
+    "es": {
+        'completions': "completados",
+        'cast': "Con:",
+        'rest': "Descanso:",
+    },
+}
+
+def theme_for(gender: str) -> str:
+    return gender if gender in THEMES else DEFAULT_THEME
+
+class FragmentCache:
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple, Tuple[Hashable, str]]" = OrderedDict()
+
+    def get(self, kind: str, record, theme: str, locale: str,
+            render: Callable[[object, str, str], str]) -> str:
+        key = (kind, record.id, theme, locale)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is record or entry[0] == record):
+                self._entries.move_to_end(key)
+                return entry[1]
+        # El render va fuera del lock; dos sesiones pueden renderizar la
+        # misma tarjeta a la vez, pero el resultado es idéntico
+        html = render(record, theme, locale)
+        with self._lock:
+            self._entries[key] = (record, html)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return html
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+# Renderizado (sin caché)
+def render_workout_summary(workout: Workout, theme: str, locale: str) -> str:
+    labels = LABELS[locale]
+    return f"""
+    <div class="workout-card" style="border-left-color: {THEMES[theme]['primary']};">
+        <div style="display: flex; justify-content: space-between; align-items: center;">
+            <div>
+                <h4>{escape(workout.image)} {escape(workout.name)}</h4>
+                <p>{escape(workout.duration)} • {escape(workout.level)} • {escape(workout.calories)} kcal</p>
+                <p style="color: #666; font-size: 0.9rem;">{escape(workout.description)}</p>
+                <p style="color: #999; font-size: 0.8rem;">⭐ {workout.rating} • {workout.completions:,} {labels['completions']}</p>
+            </div>
+        </div>
+    </div>
+    """
+
+def render_workout_card(workout: Workout, theme: str, locale: str) -> str:
+    return f"""
+    <div class="workout-card" style="border-left-color: {THEMES[theme]['primary']};">
+        <div style="display: flex; justify-content: space-between; align-items: start;">
+            <div style="flex: 1;">
+                <h4>{escape(workout.image)} {escape(workout.name)}</h4>
+                <p><strong>{escape(workout.category)}</strong> • {escape(workout.level)}</p>
+                <p style="color: #666; margin: 0.5rem 0;">{escape(workout.description)}</p>
+                <div style="display: flex; gap: 1rem; font-size: 0.9rem; color: #999;">
+                    <span>⏱️ {escape(workout.duration)}</span>
+                    <span>⚡ {escape(workout.calories)} kcal</span>
+                    <span>⭐ {workout.rating}</span>
+                </div>
+            </div>
+        </div>
+    </div>
+    """
+
+def render_workout_hero(workout: Workout, theme: str, locale: str) -> str:
+    return f"""
+    <div style="text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; border-radius: 1rem; margin-bottom: 2rem;">
+        <div style="font-size: 4rem; margin-bottom: 1rem;">{escape(workout.image)}</div>
+        <h2>{escape(workout.name)}</h2>
+        <p>{escape(workout.description)}</p>
+    </div>
+    """
+
+def render_exercise_list(workout: Workout, theme: str, locale: str) -> str:
+    labels = LABELS[locale]
+    rows = []
+    for i, exercise in enumerate(workout.exercises, 1):
+        rest = f" • {labels['rest']} {escape(exercise.rest)}" if exercise.rest else ""
+        rows.append(f"""
+    <div style="background: #f8f9fa; padding: 1rem; border-radius: 0.5rem; margin-bottom: 0.5rem; display: flex; align-items: center;">
+        <div style="background: #6c757d; color: white; width: 2rem; height: 2rem; border-radius: 50%; display: flex; align-items: center; justify-content: center; margin-right: 1rem; font-weight: bold;">
+            {i}
+        </div>
+        <div>
+            <strong>{escape(exercise.name)}</strong><br>
+            <small>{escape(exercise.detail)}</small>
+            {rest}
+        </div>
+    </div>
+    """)
+    return "".join(rows)
+
+def render_kids_card(activity: KidsActivity, theme: str, locale: str) -> str:
+    return f"""
+    <div class="kids-card">
+        <div style="display: flex; justify-content: space-between; align-items: start; margin-bottom: 1rem;">
+            <div style="flex: 1;">
+                <h4>{escape(activity.image)} {escape(activity.name)}</h4>
+                <p><strong>{escape(activity.type)}</strong> • {escape(activity.age)}</p>
+                <p style="margin: 0.5rem 0;">{escape(activity.duration)}</p>
+                <span style="background: rgba(255,255,255,0.3); padding: 0.25rem 0.5rem; border-radius: 1rem; font-size: 0.8rem;">
+                    {escape(activity.difficulty)}
+                </span>
+            </div>
+        </div>
+    </div>
+    """
+
+def render_movie_card(movie: Movie, theme: str, locale: str) -> str:
+    labels = LABELS[locale]
+    return f"""
+    <div class="workout-card" style="border-left-color: {THEMES[theme]['primary']};">
+        <div style="display: flex; justify-content: space-between; align-items: start;">
+            <div style="flex: 1;">
+                <h4>{escape(movie.image)} {escape(movie.title)}</h4>
+                <p><strong>{escape(movie.genre)}</strong> • {movie.year}</p>
+                <p style="color: #666; margin: 0.5rem 0;">{escape(movie.description)}</p>
+                <div style="display: flex; gap: 1rem; font-size: 0.9rem; color: #999;">
+                    <span>⏱️ {escape(movie.duration)}</span>
+                    <span>⭐ {movie.rating}</span>
+                </div>
+                <p style="font-size: 0.8rem; color: #999; margin-top: 0.5rem;">
+                    {labels['cast']} {escape(', '.join(movie.cast))}
+                </p>
+            </div>
+        </div>
+    </div>
+    """
+
+# Acceso con caché compartida
+_cache = FragmentCache()
+
+def workout_summary(workout: Workout, theme: str = DEFAULT_THEME, locale: str = DEFAULT_LOCALE) -> str:
+    return _cache.get('workout_summary', workout, theme, locale, render_workout_summary)
+
+def workout_card(workout: Workout, theme: str = DEFAULT_THEME, locale: str = DEFAULT_LOCALE) -> str:
+    return _cache.get('workout_card', workout, theme, locale, render_workout_card)
+
+def workout_hero(workout: Workout, theme: str = DEFAULT_THEME, locale: str = DEFAULT_LOCALE) -> str:
+    return _cache.get('workout_hero', workout, theme, locale, render_workout_hero)
+
+def exercise_list(workout: Workout, theme: str = DEFAULT_THEME, locale: str = DEFAULT_LOCALE) -> str:
+    return _cache.get('exercise_list', workout, theme, locale, render_exercise_list)
+
+def kids_card(activity: KidsActivity, theme: str = DEFAULT_THEME, locale: str = DEFAULT_LOCALE) -> str:
+    return _cache.get('kids_card', activity, theme, locale, render_kids_card)
+
+def movie_card(movie: Movie, theme: str = DEFAULT_THEME, locale: str = DEFAULT_LOCALE) -> str:
+    return _cache.get('movie_card', movie, theme, locale, render_movie_card)
+
+def clear_fragments():
+    _cache.clear()
@@ -0,0 +1,34 @@
+import json
+from pathlib import Path
+
+import streamlit as st
+
+# Hoja de estilos global. Se inyecta en el <head> de la página una sola vez
+# por sesión y no en cada rerun: un elemento de st.html que no se vuelve a
+# dibujar desaparece en el siguiente rerun, pero el <style> que su script
+# añade al <head> se queda mientras la página siga abierta.
+
+STYLE_ELEMENT_ID = "fithome-global-css"
+
+CSS_PATH = Path(__file__).resolve().with_name("global.css")
+GLOBAL_CSS = CSS_PATH.read_text(encoding="utf-8")
+
+INJECT_SCRIPT = f"""
+<script>
+(function () {{
+    if (document.getElementById({json.dumps(STYLE_ELEMENT_ID)})) {{
+        return;
+    }}
+    const style = document.createElement("style");
+    style.id = {json.dumps(STYLE_ELEMENT_ID)};
+    style.textContent = {json.dumps(GLOBAL_CSS)};
+    document.head.appendChild(style);
+}})();
+</script>
+"""
+
+def inject_global_css():
+    if st.session_state.get('css_injected'):
+        return
+    st.html(INJECT_SCRIPT, unsafe_allow_javascript=True)
+    st.session_state.css_injected = True
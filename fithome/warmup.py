@@ -0,0 +1,76 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+# Preparación del proceso (catálogo, base de datos con las reglas de
+# logros, journal, vectores del recomendador y backend de gráficas) en un hilo aparte. La primera sesión la
+# lanza y la pantalla de carga consulta el Future en lugar de bloquear el
+# hilo del script; las sesiones siguientes la encuentran terminada y pasan
+# directo.
+
+logger = logging.getLogger(__name__)
+
+def _load_catalog():
+    from fithome.catalog import get_catalog
+    get_catalog()
+
+def _open_backend():
+    # Con el catálogo copiado en sus tablas para las búsquedas por SQL
+    from fithome.catalog import get_catalog
+    from fithome.storage import get_backend
+    catalog = get_catalog()
+    get_backend().save_catalog(catalog.workouts, catalog.kids_activities)
+
+def _start_journal():
+    from fithome.journal import get_journal
+    get_journal()
+
+def _build_recommender():
+    # Sin NumPy solo fallan las recomendaciones de la pestaña de inicio
+    try:
+        from fithome.recommend import workout_features
+    except ImportError:
+        logger.warning("NumPy no está disponible; no habrá entrenamientos recomendados")
+        return
+    workout_features()
+
+def _warm_charts():
+    # Sin matplotlib solo falla la gráfica de progreso, no el arranque
+    from fithome import charts
+    try:
+        charts.warm_up()
+    except ImportError:
+        logger.warning("matplotlib no está disponible; la gráfica semanal no se mostrará")
+
+# En orden: el journal usa el backend
+WARMUP_STEPS: Tuple[Tuple[str, Callable[[], None]], ...] = (
+    ("catálogo", _load_catalog),
+    ("base de datos", _open_backend),
+    ("journal", _start_journal),
+    ("recomendaciones", _build_recommender),
+    ("gráficas", _warm_charts),
+)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fithome-warmup")
+_future: Optional[Future] = None
+_future_lock = threading.Lock()
+
+def _run_steps():
+    for name, step in WARMUP_STEPS:
+        started = time.perf_counter()
+        step()
+        logger.info("Warm-up de %s en %.0f ms", name, (time.perf_counter() - started) * 1000)
+
+def start_warmup(retry: bool = False) -> Future:
+    # Idempotente; con retry=True relanza un intento anterior fallido
+    global _future
+    with _future_lock:
+        if _future is None or (retry and _future.done() and _future.exception() is not None):
+            _future = _executor.submit(_run_steps)
+        return _future
+
+def is_done() -> bool:
+    # Terminado con éxito o con error; no relanza
+    return _future is not None and _future.done()
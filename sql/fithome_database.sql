@@ -85,6 +85,8 @@ CREATE TABLE workouts (
     calories_min INT,
     calories_max INT,
     rating DECIMAL(3,2) DEFAULT 0.00,
+    rating_sum INT DEFAULT 0, -- suma de difficulty_rating de las sesiones
+    rating_count INT DEFAULT 0, -- sesiones valoradas; rating = rating_sum / rating_count
     total_completions INT DEFAULT 0,
     is_premium BOOLEAN DEFAULT FALSE,
     image_emoji VARCHAR(10),
@@ -103,6 +105,7 @@ CREATE TABLE exercises (
     difficulty_level ENUM('principiante', 'intermedio', 'avanzado'),
     instructions TEXT,
     safety_tips TEXT,
+    met_value DECIMAL(4,1), -- equivalente metabólico (ver fithome/calories.py)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -140,14 +143,19 @@ CREATE TABLE workout_sessions (
     FOREIGN KEY (workout_id) REFERENCES workouts(workout_id)
 );
 
--- Detalles de ejercicios en sesiones
+-- Detalles de ejercicios en sesiones (telemetría de fithome/telemetry.py,
+-- una fila por ejercicio terminado, saltado o pausado)
 CREATE TABLE session_exercise_details (
     detail_id INT PRIMARY KEY AUTO_INCREMENT,
     session_id INT NOT NULL,
+    exercise_order INT NOT NULL, -- posición en el entrenamiento
     exercise_id INT NOT NULL,
     sets_completed INT,
     reps_completed INT,
-    duration_seconds INT,
+    duration_seconds INT, -- tiempo real en el ejercicio
+    rest_seconds INT, -- descanso real tras el ejercicio
+    extra_seconds INT NOT NULL DEFAULT 0, -- añadidos con "+10s"
+    pauses INT NOT NULL DEFAULT 0,
     weight_used DECIMAL(5,2), -- en kg
     difficulty_felt INT CHECK (difficulty_felt BETWEEN 1 AND 5),
     skipped BOOLEAN DEFAULT FALSE,
@@ -436,6 +444,84 @@ CREATE TABLE daily_stats (
     UNIQUE KEY unique_user_date (user_id, stat_date)
 );
 
+-- Racha de entrenamiento mantenida de forma incremental por UpdateDailyStats.
+-- Leer la racha de un usuario es leer una fila.
+CREATE TABLE user_streaks (
+    user_id INT PRIMARY KEY,
+    current_streak INT NOT NULL DEFAULT 0,
+    longest_streak INT NOT NULL DEFAULT 0,
+    last_active_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Actividad por día, semana (lunes) y mes mantenida de forma incremental
+-- por UpdateDailyStats (ver fithome/rollups.py). La gráfica semanal y la
+-- meta del mes leen estas filas en vez de agrupar daily_stats.
+CREATE TABLE activity_rollups (
+    user_id INT NOT NULL,
+    period ENUM('day', 'week', 'month') NOT NULL,
+    period_start DATE NOT NULL,
+    workouts_completed INT NOT NULL DEFAULT 0,
+    total_minutes INT NOT NULL DEFAULT 0,
+    calories_burned INT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, period, period_start),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Totales por usuario materializados. CompleteWorkout los actualiza en la
+-- misma transacción que inserta la sesión y los triggers de
+-- user_achievements mantienen total_achievements.
+CREATE TABLE user_stats_summary (
+    user_id INT PRIMARY KEY,
+    total_workouts INT NOT NULL DEFAULT 0,
+    total_calories INT NOT NULL DEFAULT 0,
+    total_minutes INT NOT NULL DEFAULT 0,
+    total_achievements INT NOT NULL DEFAULT 0,
+    last_workout_at TIMESTAMP NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Recomendaciones precalculadas por fithome.recommend (tarea nocturna)
+CREATE TABLE user_recommendations (
+    user_id INT NOT NULL,
+    rank_position INT NOT NULL,
+    workout_id INT NOT NULL,
+    score FLOAT NOT NULL,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, rank_position),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (workout_id) REFERENCES workouts(workout_id) ON DELETE CASCADE
+);
+
+-- Alergias e intolerancias del usuario (códigos de allergen_types)
+CREATE TABLE user_allergies (
+    user_id INT NOT NULL,
+    allergen VARCHAR(30) NOT NULL,
+    PRIMARY KEY (user_id, allergen),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Plan de comidas generado por fithome.mealplan: platos y raciones de
+-- cada franja por día
+CREATE TABLE user_meal_plans (
+    user_id INT NOT NULL,
+    plan_date DATE NOT NULL,
+    meal_type_id INT NOT NULL,
+    position INT NOT NULL,
+    plan_id INT NOT NULL,
+    meal_id INT NOT NULL,
+    servings DECIMAL(4,2) NOT NULL DEFAULT 1,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, plan_date, meal_type_id, position),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (meal_type_id) REFERENCES meal_types(meal_type_id),
+    FOREIGN KEY (plan_id) REFERENCES nutrition_plans(plan_id) ON DELETE CASCADE,
+    FOREIGN KEY (meal_id) REFERENCES meals(meal_id) ON DELETE CASCADE
+);
+
 -- Mediciones corporales del usuario
 CREATE TABLE body_measurements (
     measurement_id INT PRIMARY KEY AUTO_INCREMENT,
@@ -640,6 +726,7 @@ INSERT INTO achievements (achievement_name, description, badge_emoji, category,
 -- Índices para mejorar rendimiento de consultas frecuentes
 CREATE INDEX idx_workout_sessions_user_date ON workout_sessions(user_id, started_at);
 CREATE INDEX idx_daily_stats_user_date ON daily_stats(user_id, stat_date);
+CREATE INDEX idx_nutrition_log_user_date ON user_nutrition_log(user_id, date);
 CREATE INDEX idx_user_achievements_progress ON user_achievements(user_id, is_completed);
 CREATE INDEX idx_workouts_category_difficulty ON workouts(category_id, difficulty_level);
 CREATE INDEX idx_movies_genre_premium ON movies(genre_id, is_premium);
@@ -661,53 +748,22 @@ SELECT
     up.target_weight,
     up.fitness_level,
     up.is_premium,
-    COALESCE(workout_stats.total_workouts, 0) as total_workouts,
-    COALESCE(workout_stats.total_calories, 0) as total_calories,
-    COALESCE(workout_stats.total_minutes, 0) as total_minutes,
+    COALESCE(uss.total_workouts, 0) as total_workouts,
+    COALESCE(uss.total_calories, 0) as total_calories,
+    COALESCE(uss.total_minutes, 0) as total_minutes,
     COALESCE(daily_today.workouts_completed, 0) as today_workouts,
     COALESCE(daily_today.calories_burned, 0) as today_calories,
     COALESCE(daily_today.total_exercise_minutes, 0) as today_minutes,
-    COALESCE(achievements_count.total_achievements, 0) as total_achievements,
-    COALESCE(streak_calc.current_streak, 0) as current_streak
+    COALESCE(uss.total_achievements, 0) as total_achievements,
+    CASE
+        WHEN us.last_active_date >= DATE_SUB(CURDATE(), INTERVAL 1 DAY) THEN us.current_streak
+        ELSE 0
+    END as current_streak
 FROM users u
 LEFT JOIN user_profiles up ON u.user_id = up.user_id
-LEFT JOIN (
-    SELECT 
-        user_id,
-        COUNT(*) as total_workouts,
-        SUM(calories_burned) as total_calories,
-        SUM(duration_minutes) as total_minutes
-    FROM workout_sessions 
-    WHERE is_completed = TRUE
-    GROUP BY user_id
-) workout_stats ON u.user_id = workout_stats.user_id
+LEFT JOIN user_stats_summary uss ON u.user_id = uss.user_id
 LEFT JOIN daily_stats daily_today ON u.user_id = daily_today.user_id AND daily_today.stat_date = CURDATE()
-LEFT JOIN (
-    SELECT user_id, COUNT(*) as total_achievements
-    FROM user_achievements
-    WHERE is_completed = TRUE
-    GROUP BY user_id
-) achievements_count ON u.user_id = achievements_count.user_id
-LEFT JOIN (
-    SELECT 
-        user_id,
-        COALESCE(
-            (SELECT COUNT(*) 
-             FROM daily_stats ds2 
-             WHERE ds2.user_id = ds1.user_id 
-             AND ds2.stat_date <= CURDATE() 
-             AND ds2.workouts_completed > 0
-             AND NOT EXISTS (
-                 SELECT 1 FROM daily_stats ds3
-                 WHERE ds3.user_id = ds2.user_id
-                 AND ds3.stat_date BETWEEN DATE_SUB(ds2.stat_date, INTERVAL 1 DAY) AND DATE_SUB(CURDATE(), INTERVAL 1 DAY)
-                 AND ds3.workouts_completed = 0
-             )
-            ), 0
-        ) as current_streak
-    FROM daily_stats ds1
-    GROUP BY user_id
-) streak_calc ON u.user_id = streak_calc.user_id;
+LEFT JOIN user_streaks us ON u.user_id = us.user_id;
 
 -- Vista de entrenamientos con información completa
 CREATE VIEW workouts_complete AS
@@ -757,20 +813,22 @@ LEFT JOIN activity_benefit_mapping abm ON ka.activity_id = abm.activity_id
 LEFT JOIN activity_benefits ab ON abm.benefit_id = ab.benefit_id
 GROUP BY ka.activity_id;
 
--- Vista de progreso semanal del usuario
+-- Vista de progreso semanal del usuario: los cubos diarios de
+-- activity_rollups con su semana, sin reagrupar daily_stats en cada lectura
 CREATE VIEW user_weekly_progress AS
 SELECT 
-    ds.user_id,
-    YEAR(ds.stat_date) as year,
-    WEEK(ds.stat_date) as week,
-    DAYOFWEEK(ds.stat_date) as day_of_week,
-    SUM(ds.total_exercise_minutes) as minutes_exercised,
-    SUM(ds.workouts_completed) as workouts_done,
-    SUM(ds.calories_burned) as calories_burned,
-    AVG(ds.mood_rating) as avg_mood,
-    AVG(ds.energy_level) as avg_energy
-FROM daily_stats ds
-GROUP BY ds.user_id, YEAR(ds.stat_date), WEEK(ds.stat_date), DAYOFWEEK(ds.stat_date);
+    ar.user_id,
+    YEAR(ar.period_start) as year,
+    WEEK(ar.period_start) as week,
+    DAYOFWEEK(ar.period_start) as day_of_week,
+    ar.total_minutes as minutes_exercised,
+    ar.workouts_completed as workouts_done,
+    ar.calories_burned as calories_burned,
+    ds.mood_rating as avg_mood,
+    ds.energy_level as avg_energy
+FROM activity_rollups ar
+LEFT JOIN daily_stats ds ON ds.user_id = ar.user_id AND ds.stat_date = ar.period_start
+WHERE ar.period = 'day';
 
 -- ============================================
 -- PROCEDIMIENTOS ALMACENADOS ÚTILES
@@ -800,9 +858,41 @@ BEGIN
         workouts_completed = workouts_completed + p_workouts_completed,
         total_exercise_minutes = total_exercise_minutes + p_exercise_minutes,
         calories_burned = calories_burned + p_calories_burned,
-        calories_consumed = GREATEST(calories_consumed, p_calories_consumed),
+        -- Aditivo: cada entrada de user_nutrition_log suma sus calorías
+        calories_consumed = calories_consumed + p_calories_consumed,
         water_glasses = GREATEST(water_glasses, p_water_glasses),
         updated_at = CURRENT_TIMESTAMP;
+    
+    -- Actualizar racha en O(1): el mismo día no suma, el día siguiente suma
+    -- uno y un hueco la reinicia. Las asignaciones se evalúan en orden, así
+    -- que longest_streak ya ve el current_streak actualizado.
+    IF p_workouts_completed > 0 THEN
+        INSERT INTO user_streaks (user_id, current_streak, longest_streak, last_active_date)
+        VALUES (p_user_id, 1, 1, p_date)
+        ON DUPLICATE KEY UPDATE
+            current_streak = CASE
+                WHEN p_date = DATE_ADD(last_active_date, INTERVAL 1 DAY) THEN current_streak + 1
+                WHEN p_date > DATE_ADD(last_active_date, INTERVAL 1 DAY) THEN 1
+                ELSE current_streak
+            END,
+            longest_streak = GREATEST(longest_streak, current_streak),
+            last_active_date = GREATEST(last_active_date, p_date);
+    END IF;
+    
+    -- Cubos de día, semana (lunes) y mes
+    IF p_workouts_completed <> 0 OR p_exercise_minutes <> 0 OR p_calories_burned <> 0 THEN
+        INSERT INTO activity_rollups (user_id, period, period_start, workouts_completed, total_minutes, calories_burned)
+        VALUES
+            (p_user_id, 'day', p_date, p_workouts_completed, p_exercise_minutes, p_calories_burned),
+            (p_user_id, 'week', DATE_SUB(p_date, INTERVAL WEEKDAY(p_date) DAY),
+             p_workouts_completed, p_exercise_minutes, p_calories_burned),
+            (p_user_id, 'month', DATE_FORMAT(p_date, '%Y-%m-01'),
+             p_workouts_completed, p_exercise_minutes, p_calories_burned)
+        ON DUPLICATE KEY UPDATE
+            workouts_completed = workouts_completed + VALUES(workouts_completed),
+            total_minutes = total_minutes + VALUES(total_minutes),
+            calories_burned = calories_burned + VALUES(calories_burned);
+    END IF;
 END //
 
 -- Procedimiento para completar un entrenamiento
@@ -817,6 +907,14 @@ CREATE PROCEDURE CompleteWorkout(
 BEGIN
     DECLARE session_id INT;
     
+    DECLARE EXIT HANDLER FOR SQLEXCEPTION
+    BEGIN
+        ROLLBACK;
+        RESIGNAL;
+    END;
+    
+    START TRANSACTION;
+    
     -- Insertar sesión de entrenamiento
     INSERT INTO workout_sessions (
         user_id, workout_id, started_at, completed_at, 
@@ -835,6 +933,15 @@ BEGIN
         p_user_id, CURDATE(), 1, p_duration_minutes, p_calories_burned, 0, 0
     );
     
+    -- Actualizar totales materializados del usuario
+    INSERT INTO user_stats_summary (user_id, total_workouts, total_calories, total_minutes, last_workout_at)
+    VALUES (p_user_id, 1, COALESCE(p_calories_burned, 0), COALESCE(p_duration_minutes, 0), NOW())
+    ON DUPLICATE KEY UPDATE
+        total_workouts = total_workouts + 1,
+        total_calories = total_calories + VALUES(total_calories),
+        total_minutes = total_minutes + VALUES(total_minutes),
+        last_workout_at = VALUES(last_workout_at);
+    
     -- Actualizar contador de completaciones del entrenamiento
     UPDATE workouts 
     SET total_completions = total_completions + 1
@@ -843,75 +950,73 @@ BEGIN
     -- Verificar y desbloquear logros
     CALL CheckAndUnlockAchievements(p_user_id);
     
+    COMMIT;
+    
     SELECT session_id as session_id;
 END //
 
 -- Procedimiento para verificar y desbloquear logros
 CREATE PROCEDURE CheckAndUnlockAchievements(IN p_user_id INT)
 BEGIN
-    -- Logro: Primer entrenamiento
-    INSERT IGNORE INTO user_achievements (user_id, achievement_id, is_completed, progress_value)
-    SELECT p_user_id, 1, TRUE, 1
-    FROM workout_sessions ws
-    WHERE ws.user_id = p_user_id AND ws.is_completed = TRUE
-    LIMIT 1;
-    
-    -- Logro: 10 entrenamientos
-    INSERT INTO user_achievements (user_id, achievement_id, progress_value, is_completed)
-    SELECT p_user_id, 2, COUNT(*), (COUNT(*) >= 10)
-    FROM workout_sessions ws
-    WHERE ws.user_id = p_user_id AND ws.is_completed = TRUE
-    ON DUPLICATE KEY UPDATE
-        progress_value = VALUES(progress_value),
-        is_completed = VALUES(is_completed),
-        unlocked_at = CASE WHEN VALUES(is_completed) = TRUE AND is_completed = FALSE 
-                          THEN CURRENT_TIMESTAMP ELSE unlocked_at END;
-    
-    -- Logro: 1000 calorías
+    -- Las reglas salen de la tabla achievements: cada una se compara con el
+    -- contador materializado que le corresponde (user_stats_summary o
+    -- user_streaks), sin recorrer workout_sessions. Solo se tocan los logros
+    -- aún no completados cuyo umbral ya se alcanzó.
     INSERT INTO user_achievements (user_id, achievement_id, progress_value, is_completed)
-    SELECT p_user_id, 4, SUM(calories_burned), (SUM(calories_burned) >= 1000)
-    FROM workout_sessions ws
-    WHERE ws.user_id = p_user_id AND ws.is_completed = TRUE
+    SELECT p_user_id, a.achievement_id, progress.value, TRUE
+    FROM achievements a
+    JOIN (
+        SELECT 'count' AS requirement_type, 'workouts' AS requirement_unit, uss.total_workouts AS value
+        FROM user_stats_summary uss WHERE uss.user_id = p_user_id
+        UNION ALL
+        SELECT 'count', 'calories', uss.total_calories
+        FROM user_stats_summary uss WHERE uss.user_id = p_user_id
+        UNION ALL
+        SELECT 'streak', 'days',
+               CASE WHEN us.last_active_date >= DATE_SUB(CURDATE(), INTERVAL 1 DAY) THEN us.current_streak ELSE 0 END
+        FROM user_streaks us WHERE us.user_id = p_user_id
+    ) progress ON progress.requirement_type = a.requirement_type
+              AND progress.requirement_unit = a.requirement_unit
+    LEFT JOIN user_achievements ua ON ua.user_id = p_user_id
+                                  AND ua.achievement_id = a.achievement_id
+    WHERE progress.value >= a.requirement_value
+      AND (ua.user_achievement_id IS NULL OR ua.is_completed = FALSE)
     ON DUPLICATE KEY UPDATE
         progress_value = VALUES(progress_value),
-        is_completed = VALUES(is_completed),
-        unlocked_at = CASE WHEN VALUES(is_completed) = TRUE AND is_completed = FALSE 
-                          THEN CURRENT_TIMESTAMP ELSE unlocked_at END;
+        is_completed = TRUE,
+        unlocked_at = CURRENT_TIMESTAMP;
 END //
 
--- Procedimiento para calcular racha actual
+-- Procedimiento para calcular racha actual (lectura de una fila de user_streaks)
 CREATE PROCEDURE CalculateCurrentStreak(
     IN p_user_id INT,
     OUT p_current_streak INT
 )
 BEGIN
-    DECLARE done INT DEFAULT FALSE;
-    DECLARE streak_count INT DEFAULT 0;
-    DECLARE check_date DATE DEFAULT CURDATE();
-    DECLARE has_workout INT;
-    
-    -- Cursor para verificar días hacia atrás
-    streak_loop: LOOP
-        SELECT COUNT(*) INTO has_workout
-        FROM daily_stats
-        WHERE user_id = p_user_id 
-        AND stat_date = check_date
-        AND workouts_completed > 0;
-        
-        IF has_workout = 0 THEN
-            LEAVE streak_loop;
-        END IF;
-        
-        SET streak_count = streak_count + 1;
-        SET check_date = DATE_SUB(check_date, INTERVAL 1 DAY);
-        
-        -- Límite de seguridad para evitar loops infinitos
-        IF streak_count > 365 THEN
-            LEAVE streak_loop;
-        END IF;
-    END LOOP;
-    
-    SET p_current_streak = streak_count;
+    SELECT COALESCE(MAX(
+        CASE
+            WHEN last_active_date >= DATE_SUB(CURDATE(), INTERVAL 1 DAY) THEN current_streak
+            ELSE 0
+        END
+    ), 0) INTO p_current_streak
+    FROM user_streaks
+    WHERE user_id = p_user_id;
+END //
+
+-- Procedimiento para reconstruir rating_sum/rating_count desde el historial
+-- (backfills o sesiones importadas sin pasar por el trigger)
+CREATE PROCEDURE RebuildWorkoutRatings()
+BEGIN
+    UPDATE workouts w
+    LEFT JOIN (
+        SELECT workout_id, SUM(difficulty_rating) AS rating_sum, COUNT(*) AS rating_count
+        FROM workout_sessions
+        WHERE is_completed = TRUE AND difficulty_rating IS NOT NULL
+        GROUP BY workout_id
+    ) r ON r.workout_id = w.workout_id
+    SET w.rating_sum = COALESCE(r.rating_sum, 0),
+        w.rating_count = COALESCE(r.rating_count, 0),
+        w.rating = CASE WHEN r.rating_count > 0 THEN r.rating_sum / r.rating_count ELSE w.rating END;
 END //
 
 -- Función para obtener recomendaciones de entrenamientos
@@ -921,6 +1026,7 @@ CREATE PROCEDURE GetWorkoutRecommendations(
 )
 BEGIN
     DECLARE user_level ENUM('principiante', 'intermedio', 'avanzado');
+    DECLARE user_level_rank INT;
     DECLARE user_goals_list TEXT DEFAULT '';
     
     -- Obtener nivel del usuario
@@ -928,6 +1034,10 @@ BEGIN
     FROM user_profiles
     WHERE user_id = p_user_id;
     
+    -- Posición ordinal del nivel: comparar ENUMs con <= contra otro valor
+    -- compara texto ('avanzado' < 'intermedio' < 'principiante')
+    SET user_level_rank = FIELD(user_level, 'principiante', 'intermedio', 'avanzado');
+    
     -- Obtener objetivos del usuario
     SELECT GROUP_CONCAT(g.goal_name) INTO user_goals_list
     FROM user_goals ug
@@ -947,7 +1057,7 @@ BEGIN
         END as relevance_score
     FROM workouts w
     JOIN workout_categories wc ON w.category_id = wc.category_id
-    WHERE w.difficulty_level <= user_level
+    WHERE FIELD(w.difficulty_level, 'principiante', 'intermedio', 'avanzado') <= user_level_rank
     ORDER BY relevance_score DESC, w.rating DESC, w.total_completions DESC
     LIMIT p_limit;
 END //
@@ -960,20 +1070,18 @@ DELIMITER ;
 
 DELIMITER //
 
--- Trigger para actualizar rating de entrenamientos
+-- Trigger para actualizar rating de entrenamientos (media acumulada, O(1) por sesión)
 CREATE TRIGGER update_workout_rating
     AFTER INSERT ON workout_sessions
     FOR EACH ROW
 BEGIN
     IF NEW.is_completed = TRUE AND NEW.difficulty_rating IS NOT NULL THEN
+        -- En MySQL las asignaciones de un UPDATE se evalúan de izquierda a
+        -- derecha, así que rating ya ve la suma y el conteo nuevos
         UPDATE workouts 
-        SET rating = (
-            SELECT AVG(difficulty_rating)
-            FROM workout_sessions
-            WHERE workout_id = NEW.workout_id 
-            AND is_completed = TRUE 
-            AND difficulty_rating IS NOT NULL
-        )
+        SET rating_sum = rating_sum + NEW.difficulty_rating,
+            rating_count = rating_count + 1,
+            rating = rating_sum / rating_count
         WHERE workout_id = NEW.workout_id;
     END IF;
 END //
@@ -991,6 +1099,33 @@ BEGIN
     END IF;
 END //
 
+-- Triggers para mantener total_achievements en user_stats_summary
+CREATE TRIGGER count_unlocked_achievement_insert
+    AFTER INSERT ON user_achievements
+    FOR EACH ROW
+BEGIN
+    IF NEW.is_completed = TRUE THEN
+        INSERT INTO user_stats_summary (user_id, total_achievements)
+        VALUES (NEW.user_id, 1)
+        ON DUPLICATE KEY UPDATE total_achievements = total_achievements + 1;
+    END IF;
+END //
+
+CREATE TRIGGER count_unlocked_achievement_update
+    AFTER UPDATE ON user_achievements
+    FOR EACH ROW
+BEGIN
+    IF NEW.is_completed = TRUE AND OLD.is_completed = FALSE THEN
+        INSERT INTO user_stats_summary (user_id, total_achievements)
+        VALUES (NEW.user_id, 1)
+        ON DUPLICATE KEY UPDATE total_achievements = total_achievements + 1;
+    ELSEIF NEW.is_completed = FALSE AND OLD.is_completed = TRUE THEN
+        UPDATE user_stats_summary
+        SET total_achievements = GREATEST(total_achievements - 1, 0)
+        WHERE user_id = NEW.user_id;
+    END IF;
+END //
+
 -- Trigger para crear estadísticas diarias automáticamente
 CREATE TRIGGER create_daily_stats
     AFTER INSERT ON users
@@ -1008,14 +1143,14 @@ DELIMITER ;
 -- ============================================
 
 -- Insertar ejercicios básicos
-INSERT INTO exercises (exercise_name, description, muscle_groups, difficulty_level, instructions) VALUES
-('Push-ups', 'Flexiones de brazos básicas', '["chest", "shoulders", "triceps"]', 'principiante', 'Mantén el cuerpo recto, baja hasta que el pecho casi toque el suelo'),
-('Squats', 'Sentadillas básicas', '["quadriceps", "glutes", "hamstrings"]', 'principiante', 'Mantén la espalda recta, baja como si te fueras a sentar'),
-('Plancha', 'Plancha isométrica', '["core", "shoulders"]', 'principiante', 'Mantén el cuerpo recto como una tabla'),
-('Burpees', 'Ejercicio completo de cuerpo', '["full_body"]', 'intermedio', 'Combina una sentadilla, plancha y salto'),
-('Mountain Climbers', 'Escaladores', '["core", "cardio"]', 'intermedio', 'Alterna las rodillas al pecho desde posición de plancha'),
-('Lunges', 'Zancadas', '["quadriceps", "glutes"]', 'intermedio', 'Da un paso grande hacia adelante y baja la rodilla trasera'),
-('Jumping Jacks', 'Saltos de tijera', '["cardio", "full_body"]', 'principiante', 'Salta abriendo y cerrando piernas y brazos simultáneamente');
+INSERT INTO exercises (exercise_name, description, muscle_groups, difficulty_level, instructions, met_value) VALUES
+('Push-ups', 'Flexiones de brazos básicas', '["chest", "shoulders", "triceps"]', 'principiante', 'Mantén el cuerpo recto, baja hasta que el pecho casi toque el suelo', 3.8),
+('Squats', 'Sentadillas básicas', '["quadriceps", "glutes", "hamstrings"]', 'principiante', 'Mantén la espalda recta, baja como si te fueras a sentar', 5.0),
+('Plancha', 'Plancha isométrica', '["core", "shoulders"]', 'principiante', 'Mantén el cuerpo recto como una tabla', 3.8),
+('Burpees', 'Ejercicio completo de cuerpo', '["full_body"]', 'intermedio', 'Combina una sentadilla, plancha y salto', 8.0),
+('Mountain Climbers', 'Escaladores', '["core", "cardio"]', 'intermedio', 'Alterna las rodillas al pecho desde posición de plancha', 8.0),
+('Lunges', 'Zancadas', '["quadriceps", "glutes"]', 'intermedio', 'Da un paso grande hacia adelante y baja la rodilla trasera', 4.0),
+('Jumping Jacks', 'Saltos de tijera', '["cardio", "full_body"]', 'principiante', 'Salta abriendo y cerrando piernas y brazos simultáneamente', 7.7);
 
 -- Insertar entrenamientos de ejemplo
 INSERT INTO workouts (name, description, category_id, duration_minutes, difficulty_level, calories_min, calories_max, image_emoji, is_premium) VALUES
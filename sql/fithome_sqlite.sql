@@ -0,0 +1,320 @@
+-- ============================================
+-- FITHOME PRO - ESQUEMA LOCAL SQLITE
+-- Subconjunto de fithome_database.sql usado por fithome/storage.py como
+-- sustituto local de MySQL. Mantener los nombres de tablas y columnas
+-- alineados con el esquema principal.
+-- ============================================
+
+PRAGMA foreign_keys = ON;
+
+CREATE TABLE IF NOT EXISTS users (
+    user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    email VARCHAR(255) NOT NULL UNIQUE,
+    password_hash VARCHAR(255) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    is_active BOOLEAN DEFAULT 1,
+    email_verified BOOLEAN DEFAULT 0,
+    last_login TIMESTAMP NULL
+);
+
+-- En SQLite user_id es único para poder hacer upsert del perfil
+CREATE TABLE IF NOT EXISTS user_profiles (
+    profile_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL UNIQUE,
+    age INTEGER,
+    gender TEXT CHECK (gender IN ('masculino', 'femenino', 'otro')),
+    height DECIMAL(5,2),
+    current_weight DECIMAL(5,2),
+    target_weight DECIMAL(5,2),
+    fitness_level TEXT CHECK (fitness_level IN ('principiante', 'intermedio', 'avanzado')),
+    is_premium BOOLEAN DEFAULT 0,
+    premium_expires_at TIMESTAMP NULL,
+    timezone VARCHAR(50) DEFAULT 'America/Bogota',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS goals (
+    goal_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    goal_name VARCHAR(100) NOT NULL UNIQUE,
+    description TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS user_goals (
+    user_goal_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    goal_id INTEGER NOT NULL,
+    priority INTEGER DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (goal_id) REFERENCES goals(goal_id) ON DELETE CASCADE,
+    UNIQUE (user_id, goal_id)
+);
+
+-- workout_id referencia el catálogo (data/datoscsv.csv), no una tabla local
+CREATE TABLE IF NOT EXISTS workout_sessions (
+    session_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    workout_id INTEGER NOT NULL,
+    started_at TIMESTAMP NOT NULL,
+    completed_at TIMESTAMP,
+    calories_burned INTEGER,
+    duration_minutes INTEGER,
+    difficulty_rating INTEGER CHECK (difficulty_rating BETWEEN 1 AND 5),
+    enjoyment_rating INTEGER CHECK (enjoyment_rating BETWEEN 1 AND 5),
+    notes TEXT,
+    is_completed BOOLEAN DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Telemetría por ejercicio de cada sesión (ver fithome/telemetry.py)
+CREATE TABLE IF NOT EXISTS session_exercise_details (
+    detail_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id INTEGER NOT NULL,
+    exercise_order INTEGER NOT NULL,
+    exercise_id INTEGER,
+    sets_completed INTEGER,
+    reps_completed INTEGER,
+    duration_seconds INTEGER,
+    rest_seconds INTEGER,
+    extra_seconds INTEGER NOT NULL DEFAULT 0,
+    pauses INTEGER NOT NULL DEFAULT 0,
+    skipped BOOLEAN DEFAULT 0,
+    FOREIGN KEY (session_id) REFERENCES workout_sessions(session_id) ON DELETE CASCADE
+);
+
+-- Historial de peso: fithome/calories.py usa el peso vigente en cada sesión
+CREATE TABLE IF NOT EXISTS body_measurements (
+    measurement_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    measurement_date DATE NOT NULL,
+    weight_kg DECIMAL(5,2),
+    body_fat_percentage DECIMAL(4,2),
+    muscle_mass_kg DECIMAL(5,2),
+    waist_cm DECIMAL(5,2),
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    stat_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    stat_date DATE NOT NULL,
+    workouts_completed INTEGER DEFAULT 0,
+    total_exercise_minutes INTEGER DEFAULT 0,
+    calories_burned INTEGER DEFAULT 0,
+    calories_consumed INTEGER DEFAULT 0,
+    water_glasses INTEGER DEFAULT 0,
+    steps_count INTEGER DEFAULT 0,
+    sleep_hours DECIMAL(3,1),
+    mood_rating INTEGER CHECK (mood_rating BETWEEN 1 AND 5),
+    energy_level INTEGER CHECK (energy_level BETWEEN 1 AND 5),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    UNIQUE (user_id, stat_date)
+);
+
+-- Registro de comidas; meal_id y meal_type referencian el catálogo
+-- (data/meals.csv, MEAL_TYPES). Cada entrada suma sus calorías a
+-- daily_stats.calories_consumed en la misma transacción (ver fithome/intake.py)
+CREATE TABLE IF NOT EXISTS user_nutrition_log (
+    log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    meal_id INTEGER,
+    date DATE NOT NULL,
+    meal_type VARCHAR(20) NOT NULL,
+    calories_consumed INTEGER,
+    custom_meal_name VARCHAR(150),
+    custom_calories INTEGER,
+    notes TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Actividad por día, semana (lunes) y mes mantenida al escribir (ver fithome/rollups.py)
+CREATE TABLE IF NOT EXISTS activity_rollups (
+    user_id INTEGER NOT NULL,
+    period TEXT NOT NULL CHECK (period IN ('day', 'week', 'month')),
+    period_start DATE NOT NULL,
+    workouts_completed INTEGER NOT NULL DEFAULT 0,
+    total_minutes INTEGER NOT NULL DEFAULT 0,
+    calories_burned INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, period, period_start),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Racha mantenida al escribir (ver fithome/streaks.py)
+CREATE TABLE IF NOT EXISTS user_streaks (
+    user_id INTEGER PRIMARY KEY,
+    current_streak INTEGER NOT NULL DEFAULT 0,
+    longest_streak INTEGER NOT NULL DEFAULT 0,
+    last_active_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Totales por usuario mantenidos al registrar sesiones (ver fithome/aggregates.py)
+CREATE TABLE IF NOT EXISTS user_stats_summary (
+    user_id INTEGER PRIMARY KEY,
+    total_workouts INTEGER NOT NULL DEFAULT 0,
+    total_calories INTEGER NOT NULL DEFAULT 0,
+    total_minutes INTEGER NOT NULL DEFAULT 0,
+    total_achievements INTEGER NOT NULL DEFAULT 0,
+    last_workout_at TIMESTAMP NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Valoración de cada entrenamiento como suma y número de valoraciones
+-- (ver fithome/ratings.py); la media es rating_sum / rating_count
+CREATE TABLE IF NOT EXISTS workout_ratings (
+    workout_id INTEGER PRIMARY KEY,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS achievements (
+    achievement_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    achievement_name VARCHAR(100) NOT NULL UNIQUE,
+    description TEXT,
+    badge_emoji VARCHAR(10),
+    category TEXT CHECK (category IN ('workouts', 'nutrition', 'consistency', 'milestones', 'social')),
+    requirement_type TEXT CHECK (requirement_type IN ('count', 'streak', 'goal', 'time_based')),
+    requirement_value INTEGER,
+    requirement_unit VARCHAR(20),
+    points_value INTEGER DEFAULT 10,
+    is_hidden BOOLEAN DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS user_achievements (
+    user_achievement_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER NOT NULL,
+    achievement_id INTEGER NOT NULL,
+    unlocked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    progress_value INTEGER DEFAULT 0,
+    is_completed BOOLEAN DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (achievement_id) REFERENCES achievements(achievement_id),
+    UNIQUE (user_id, achievement_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_workout_sessions_user_date ON workout_sessions(user_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_session_exercise_details_session ON session_exercise_details(session_id);
+CREATE INDEX IF NOT EXISTS idx_daily_stats_user_date ON daily_stats(user_id, stat_date);
+CREATE INDEX IF NOT EXISTS idx_nutrition_log_user_date ON user_nutrition_log(user_id, date);
+CREATE INDEX IF NOT EXISTS idx_body_measurements_user_date ON body_measurements(user_id, measurement_date);
+CREATE INDEX IF NOT EXISTS idx_user_achievements_progress ON user_achievements(user_id, is_completed);
+
+INSERT OR IGNORE INTO goals (goal_name, description) VALUES
+('perder peso', 'Reducir peso corporal y grasa'),
+('ganar músculo', 'Aumentar masa muscular'),
+('mantenerse en forma', 'Mantener condición física actual'),
+('mejorar resistencia', 'Aumentar resistencia cardiovascular'),
+('rehabilitación', 'Recuperación de lesiones'),
+('competir', 'Preparación para competencias deportivas');
+
+INSERT OR IGNORE INTO achievements (achievement_id, achievement_name, description, badge_emoji, category, requirement_type, requirement_value, requirement_unit, points_value) VALUES
+(1, '🎉 Primer entrenamiento', 'Completa tu primer entrenamiento', '🎉', 'workouts', 'count', 1, 'workouts', 50),
+(2, '💪 10 entrenamientos', 'Completa 10 entrenamientos', '💪', 'workouts', 'count', 10, 'workouts', 100),
+(3, '🔥 7 días seguidos', 'Entrena 7 días consecutivos', '🔥', 'consistency', 'streak', 7, 'days', 200),
+(4, '⚡ 1000 calorías', 'Quema 1000 calorías en total', '⚡', 'workouts', 'count', 1000, 'calories', 150),
+(5, '🏆 Mes completo', 'Entrena todos los días del mes', '🏆', 'consistency', 'streak', 30, 'days', 500),
+(6, '🌟 Nivel experto', 'Completa 100 entrenamientos', '🌟', 'milestones', 'count', 100, 'workouts', 1000);
+
+-- Recomendaciones precalculadas por fithome.recommend (tarea nocturna)
+CREATE TABLE IF NOT EXISTS user_recommendations (
+    user_id INTEGER NOT NULL,
+    rank_position INTEGER NOT NULL,
+    workout_id INTEGER NOT NULL,
+    score REAL NOT NULL,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, rank_position),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Alergias e intolerancias del usuario (códigos de allergen_types)
+CREATE TABLE IF NOT EXISTS user_allergies (
+    user_id INTEGER NOT NULL,
+    allergen VARCHAR(30) NOT NULL,
+    PRIMARY KEY (user_id, allergen),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+-- Plan de comidas generado por fithome.mealplan: platos (meal_id del
+-- catálogo, data/meals.csv) y raciones de cada franja por día
+CREATE TABLE IF NOT EXISTS user_meal_plans (
+    user_id INTEGER NOT NULL,
+    plan_date DATE NOT NULL,
+    meal_type VARCHAR(20) NOT NULL,
+    position INTEGER NOT NULL,
+    nutrition_plan_id INTEGER NOT NULL,
+    meal_id INTEGER NOT NULL,
+    servings REAL NOT NULL DEFAULT 1,
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, plan_date, meal_type, position),
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+-- Último evento del journal local (fithome/journal.py) aplicado en la base.
+-- Se actualiza en la misma transacción que los datos del lote, así que al
+-- reiniciar se reaplica exactamente lo que faltaba.
+CREATE TABLE IF NOT EXISTS journal_checkpoints (
+    journal_name VARCHAR(100) PRIMARY KEY,
+    last_seq INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Catálogo de entrenamientos y actividades infantiles para las búsquedas
+-- por SQL (fithome.search.workout_search_sql / kids_search_sql); se copia
+-- desde los CSV con SQLiteBackend.save_catalog
+CREATE TABLE IF NOT EXISTS workout_categories (
+    category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_name VARCHAR(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS workouts (
+    workout_id INTEGER PRIMARY KEY,
+    name VARCHAR(150) NOT NULL,
+    description TEXT,
+    category_id INTEGER NOT NULL,
+    duration_minutes INTEGER NOT NULL,
+    difficulty_level VARCHAR(20), -- normalizado: principiante, intermedio, avanzado
+    calories_min INTEGER,
+    calories_max INTEGER,
+    rating DECIMAL(3,2) DEFAULT 0.00,
+    total_completions INTEGER DEFAULT 0,
+    image_emoji VARCHAR(10),
+    FOREIGN KEY (category_id) REFERENCES workout_categories(category_id)
+);
+
+CREATE TABLE IF NOT EXISTS kids_activity_categories (
+    category_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    category_name VARCHAR(50) NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS kids_activities (
+    activity_id INTEGER PRIMARY KEY,
+    activity_name VARCHAR(150) NOT NULL,
+    category_id INTEGER NOT NULL,
+    description TEXT,
+    age_min INTEGER NOT NULL,
+    age_max INTEGER NOT NULL,
+    duration_minutes INTEGER,
+    difficulty_level VARCHAR(20), -- normalizado: facil, intermedio, avanzado
+    image_emoji VARCHAR(10),
+    adult_supervision BOOLEAN DEFAULT 0,
+    FOREIGN KEY (category_id) REFERENCES kids_activity_categories(category_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_workouts_category_difficulty ON workouts(category_id, difficulty_level);
+CREATE INDEX IF NOT EXISTS idx_kids_activities_age ON kids_activities(age_min, age_max);
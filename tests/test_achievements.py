@@ -0,0 +1,36 @@
+from fithome.achievements import CALORIES, STREAK, WORKOUTS, AchievementEngine, AchievementRule
+from fithome.storage import SQLiteBackend
+
+def test_each_rule_fires_once_at_its_threshold(tmp_path):
+    # Reglas de la tabla achievements (datos iniciales del esquema)
+    engine = SQLiteBackend(tmp_path / "fithome.db").achievement_engine
+    assert {rule.counter for rule in engine.rules} == {WORKOUTS, CALORIES, STREAK}
+
+    unlocked = {}
+    progress = {WORKOUTS: 0, CALORIES: 0, STREAK: 0}
+    for step in range(1, 1001):
+        # Un entrenamiento de 10 kcal al día; la racha se corta cada 40 días
+        progress = {WORKOUTS: step, CALORIES: step * 10, STREAK: (step - 1) % 40 + 1}
+        for rule in engine.evaluate(progress, unlocked):
+            assert rule.achievement_id not in unlocked
+            unlocked[rule.achievement_id] = dict(progress)
+
+    assert set(unlocked) == {rule.achievement_id for rule in engine.rules}
+    for rule in engine.rules:
+        reached = unlocked[rule.achievement_id][rule.counter]
+        assert reached == rule.requirement_value
+
+def test_only_changed_counters_are_checked():
+    engine = AchievementEngine([
+        AchievementRule(1, "Primero", "count", 1, "workouts"),
+        AchievementRule(2, "Mil", "count", 1000, "calories"),
+    ])
+    progress = {WORKOUTS: 1, CALORIES: 1500}
+    assert [rule.achievement_id for rule in engine.evaluate(progress, set(), changed=[WORKOUTS])] == [1]
+    # Un evento perdido no impide desbloquear después (>= y no ==)
+    assert [rule.achievement_id for rule in engine.evaluate(progress, {1})] == [2]
+
+def test_unsupported_rules_are_ignored():
+    engine = AchievementEngine([AchievementRule(1, "Meta", "goal", 5, "kg")])
+    assert engine.evaluate({WORKOUTS: 100, CALORIES: 100, STREAK: 100}, set()) == []
+    assert engine.unlocked_ids(["Meta", "Desconocido"]) == {1}
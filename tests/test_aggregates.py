@@ -0,0 +1,48 @@
+import datetime
+
+from fithome.aggregates import UserTotals
+from fithome.storage import SQLiteBackend, WorkoutRecord, WriteBatch
+
+START = datetime.datetime(2026, 3, 2, 8, 0)
+
+def record_sessions(backend, user_id, days):
+    batch = WriteBatch()
+    for day in range(days):
+        started_at = START + datetime.timedelta(days=day)
+        batch.record_workout(WorkoutRecord(
+            user_id=user_id, workout_id=1, started_at=started_at,
+            completed_at=started_at + datetime.timedelta(minutes=25), calories_burned=200, duration_minutes=25
+        ))
+    backend.apply(batch)
+
+def test_summary_created_on_migration_is_backfilled(tmp_path):
+    path = tmp_path / "fithome.db"
+    backend = SQLiteBackend(path)
+    user_id = backend.create_user("Ana", "ana@example.com", "secreto")
+    record_sessions(backend, user_id, 3)
+    expected = backend.load_totals(user_id)
+    assert (expected.total_workouts, expected.total_calories, expected.total_minutes) == (3, 600, 75)
+    assert expected.total_achievements == 1
+
+    # Base de antes de user_stats_summary: el historial ya está en workout_sessions
+    with backend.transaction() as conn:
+        conn.execute("DROP TABLE user_stats_summary")
+    assert SQLiteBackend(path).load_totals(user_id) == expected
+
+def test_rebuild_totals_includes_sessions_written_outside_apply(tmp_path):
+    backend = SQLiteBackend(tmp_path / "fithome.db")
+    user_id = backend.create_user("Ana", "ana@example.com", "secreto")
+    record_sessions(backend, user_id, 1)
+    with backend.transaction() as conn:
+        conn.execute(
+            """
+            INSERT INTO workout_sessions (user_id, workout_id, started_at, completed_at, duration_minutes,
+                                          calories_burned, is_completed)
+            VALUES (?, 2, '2026-03-05 08:00:00', '2026-03-05 08:30:00', 30, 250, 1)
+            """,
+            (user_id,)
+        )
+    assert backend.load_totals(user_id).total_workouts == 1
+
+    backend.rebuild_totals()
+    assert backend.load_totals(user_id) == UserTotals(2, 450, 55, 1)
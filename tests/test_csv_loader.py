@@ -0,0 +1,18 @@
+from fithome.csv_loader import DEFAULT_REST_SECONDS, DEFAULT_WORK_SECONDS, iter_workouts
+
+HEADER = "id,name,duration,level,calories,category,description,rating,completions,exercises\n"
+
+def test_old_exercise_format_gets_default_times(tmp_path):
+    # data/datoscsv.csv antes de los tiempos por ejercicio
+    path = tmp_path / "datoscsv.csv"
+    path.write_text(
+        HEADER + '1,Cardio HIIT Matutino,20 min,Intermedio,180-220,Cardio,Intervalos,4.8,1250,'
+        '"Saltos de tijera, Burpees (30s; 30s)"\n',
+        encoding="utf-8"
+    )
+    [workout] = iter_workouts(path)
+    jumping, burpees = workout.exercises
+    assert (jumping.name, jumping.duration_seconds, jumping.rest_seconds) == (
+        "Saltos de tijera", DEFAULT_WORK_SECONDS, DEFAULT_REST_SECONDS
+    )
+    assert (burpees.name, burpees.duration_seconds, burpees.rest_seconds) == ("Burpees", 30, 30)
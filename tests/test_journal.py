@@ -0,0 +1,62 @@
+import datetime
+
+from fithome.journal import LEGACY_NAME, WATER_SET, EventJournal
+from fithome.storage import SQLiteBackend
+
+DAY = datetime.date(2026, 3, 2)
+
+def make_backend(tmp_path):
+    backend = SQLiteBackend(tmp_path / "fithome.db")
+    user_id = backend.create_user("Ana", "ana@example.com", "secreto")
+    return backend, user_id
+
+def quiet_journal(backend, path):
+    # Sin hilo de fondo: los eventos solo llegan a la base con flush()
+    journal = EventJournal(backend, path, flush_interval=3600, fsync=False)
+    journal._recover()
+    return journal
+
+def crash(journal):
+    # Caída del proceso: el archivo queda escrito y nada se aplica
+    journal._file.close()
+    journal._file = None
+
+def test_two_journals_recover_independently(tmp_path):
+    backend, user_id = make_backend(tmp_path)
+
+    # Dos procesos arrancan a la vez, cada uno con su archivo
+    first = quiet_journal(backend, tmp_path / "a.journal")
+    second = quiet_journal(backend, tmp_path / "b.journal")
+    assert second.name != first.name
+
+    for glasses in range(1, 6):
+        first.append(WATER_SET, user_id=user_id, date=DAY.isoformat(), glasses=glasses)
+    first.flush()
+    next_day = DAY + datetime.timedelta(days=1)
+    for glasses in (3, 7):
+        second.append(WATER_SET, user_id=user_id, date=next_day.isoformat(), glasses=glasses)
+    crash(second)
+
+    recovered = quiet_journal(backend, tmp_path / "b.journal")
+    assert recovered.pending() == 2
+    recovered.flush()
+    assert backend.load_water(user_id, DAY) == 5
+    assert backend.load_water(user_id, next_day) == 7
+    assert backend.journal_checkpoint(recovered.name) == 2
+    assert backend.journal_checkpoint(first.name) == 5
+
+def test_recovery_starts_from_legacy_checkpoint(tmp_path):
+    # Un journal de antes del checkpoint por archivo no reaplica lo ya
+    # aplicado con el checkpoint compartido
+    backend, user_id = make_backend(tmp_path)
+    legacy = EventJournal(backend, tmp_path / "old.journal", name=LEGACY_NAME, flush_interval=3600, fsync=False)
+    legacy._recover()
+    legacy.append(WATER_SET, user_id=user_id, date=DAY.isoformat(), glasses=4)
+    legacy.flush()
+    legacy.append(WATER_SET, user_id=user_id, date=DAY.isoformat(), glasses=6)
+    crash(legacy)
+
+    recovered = quiet_journal(backend, tmp_path / "old.journal")
+    assert recovered.pending() == 1
+    recovered.flush()
+    assert backend.load_water(user_id, DAY) == 6
@@ -0,0 +1,32 @@
+import datetime
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from fithome.catalog import get_catalog
+from fithome.mealplan import WEEK_DAYS, generate_all, meal_planner, plan_for
+from fithome.storage import SQLiteBackend
+
+MONDAY = datetime.date(2026, 3, 2)
+
+def test_stored_week_matches_generated(tmp_path):
+    backend = SQLiteBackend(tmp_path / "fithome.db")
+    user_id = backend.create_user("Ana", "ana@example.com", "secreto")
+    generate_all(backend, start=MONDAY)
+
+    planner = meal_planner()
+    plans = get_catalog().nutrition_plans
+    plan = plan_for([], plans)
+    rows = backend.load_meal_plan(user_id, MONDAY, MONDAY + datetime.timedelta(days=WEEK_DAYS - 1))
+    stored = planner.stored_days(rows, plan)
+    assert [stored[MONDAY + datetime.timedelta(days=offset)] for offset in range(WEEK_DAYS)] == planner.week(plan)
+
+    # Otro plan u otras alergias: no vale el guardado
+    other = next(candidate for candidate in plans if candidate.id != plan.id)
+    assert planner.stored_days(rows, other) == {}
+    allergen = next(
+        code for day in planner.week(plan) for choice in day.slots for meal_id in choice.meal_ids
+        for code, meals in planner.index.allergen_meals.items() if (meals >> planner.index.position(meal_id)) & 1
+    )
+    assert len(planner.stored_days(rows, plan, [allergen])) < WEEK_DAYS
@@ -0,0 +1,41 @@
+import datetime
+
+from fithome.ratings import RatingAggregate, from_history
+from fithome.storage import SQLiteBackend, WorkoutRecord, WriteBatch
+
+START = datetime.datetime(2026, 3, 2, 8, 0)
+
+def session(user_id, workout_id, day, rating):
+    started_at = START + datetime.timedelta(days=day)
+    return WorkoutRecord(
+        user_id=user_id, workout_id=workout_id, started_at=started_at,
+        completed_at=started_at + datetime.timedelta(minutes=20), calories_burned=150,
+        duration_minutes=20, difficulty_rating=rating
+    )
+
+def test_from_history_skips_unrated():
+    assert from_history([(1, 4), (2, None), (1, 2), (3, 5)]) == {
+        1: RatingAggregate(6, 2), 3: RatingAggregate(5, 1)
+    }
+
+def test_rebuild_matches_incremental_sums(tmp_path):
+    backend = SQLiteBackend(tmp_path / "fithome.db")
+    user_id = backend.create_user("Ana", "ana@example.com", "secreto")
+    batches = [
+        [session(user_id, 1, 0, 4), session(user_id, 2, 0, 3)],
+        [session(user_id, 1, 1, 5), session(user_id, 3, 1, None)],
+        [session(user_id, 2, 2, 1), session(user_id, 1, 3, 2)],
+    ]
+    for records in batches:
+        batch = WriteBatch()
+        for record in records:
+            batch.record_workout(record)
+        backend.apply(batch)
+
+    incremental = backend.load_workout_ratings()
+    assert incremental == {1: RatingAggregate(11, 3), 2: RatingAggregate(4, 2)}
+
+    with backend.transaction() as conn:
+        conn.execute("DELETE FROM workout_ratings")
+    assert backend.rebuild_ratings() == 2
+    assert backend.load_workout_ratings() == incremental
@@ -0,0 +1,68 @@
+import dataclasses
+import datetime
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from fithome.catalog import get_catalog
+from fithome.models import UserProfile
+from fithome.ratings import RatingAggregate
+from fithome.recommend import GOAL_CATEGORIES, WorkoutFeatures, preferences_for
+
+NOW = datetime.datetime(2026, 3, 2, 20, 0)
+
+def synthetic_features(count, rng):
+    base = get_catalog().workouts
+    workouts = [
+        dataclasses.replace(
+            base[i % len(base)], id=i + 1,
+            category=rng.choice(("Cardio", "Fuerza", "Flexibilidad", "Core")),
+            level=rng.choice(("Principiante", "Intermedio", "Avanzado")),
+            rating=round(rng.uniform(3.5, 5.0), 1), completions=rng.randrange(0, 5000),
+        )
+        for i in range(count)
+    ]
+    ratings = {workout.id: RatingAggregate(rng.randrange(1, 50) * 4, 50) for workout in rng.sample(workouts, count // 10)}
+    return WorkoutFeatures(workouts, ratings)
+
+def synthetic_users(count, items, rng):
+    return [
+        preferences_for(
+            user_id,
+            UserProfile(fitness_level=rng.choice(("principiante", "intermedio", "avanzado", "")),
+                        goals=rng.sample(list(GOAL_CATEGORIES), rng.randrange(0, 3))),
+            [(rng.randrange(1, items + 1), NOW - datetime.timedelta(days=rng.uniform(0, 28)))
+             for _ in range(rng.randrange(0, 12))],
+            NOW,
+        )
+        for user_id in range(1, count + 1)
+    ]
+
+@pytest.mark.parametrize("k", [1, 5, 20])
+def test_top_k_matches_full_sort(k):
+    rng = random.Random(7)
+    features = synthetic_features(500, rng)
+    users = synthetic_users(40, 500, rng)
+    positions, top_scores = features.top_k(users, k)
+    scores = features.scores(users)
+
+    assert positions.shape == top_scores.shape == (len(users), k)
+    for row in range(len(users)):
+        expected = np.sort(scores[row])[::-1][:k]
+        np.testing.assert_array_equal(top_scores[row], expected)
+        valid = positions[row] >= 0
+        np.testing.assert_array_equal(scores[row, positions[row][valid]], top_scores[row][valid])
+        assert len(set(positions[row][valid].tolist())) == valid.sum()
+
+def test_excluded_workouts_are_never_returned():
+    # Un principiante no recibe entrenamientos avanzados, aunque k sobre
+    rng = random.Random(3)
+    features = synthetic_features(60, rng)
+    beginner = preferences_for(1, UserProfile(fitness_level="principiante"), now=NOW)
+    positions, top_scores = features.top_k([beginner], len(features))
+    returned = positions[0][positions[0] >= 0]
+    assert len(returned) < len(features)
+    assert all(features.workouts[position].level != "Avanzado" for position in returned)
+    assert not np.isfinite(top_scores[0][positions[0] < 0]).any()
@@ -0,0 +1,79 @@
+import datetime
+import random
+
+import pytest
+
+from fithome.rollups import DAY, MONTH, PERIODS, WEEK, ActivityBucket, period_start
+from fithome.storage import SQLiteBackend, WorkoutRecord, WriteBatch
+
+START = datetime.datetime(2026, 1, 20, 7, 0)
+SINCE = datetime.date(2025, 12, 1)
+UNTIL = datetime.date(2026, 6, 1)
+
+def record_history(backend, user_ids, rng):
+    # Varias sesiones algunos días, repartidas entre semanas y meses
+    for day in range(75):
+        batch = WriteBatch()
+        for user_id in user_ids:
+            for _ in range(rng.choice((0, 0, 1, 2))):
+                started_at = START + datetime.timedelta(days=day, hours=rng.randrange(0, 14))
+                minutes = rng.randrange(10, 60)
+                batch.record_workout(WorkoutRecord(
+                    user_id=user_id, workout_id=rng.randrange(1, 5), started_at=started_at,
+                    completed_at=started_at + datetime.timedelta(minutes=minutes),
+                    calories_burned=rng.randrange(80, 500), duration_minutes=minutes
+                ))
+        backend.apply(batch)
+
+def recompute(backend, user_id, period):
+    # Los cubos a partir de workout_sessions, sin pasar por activity_rollups
+    buckets = {}
+    with backend.pool.connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT completed_at, duration_minutes, calories_burned
+            FROM workout_sessions WHERE user_id = ? AND is_completed = 1
+            """,
+            (user_id,)
+        ).fetchall()
+    for row in rows:
+        start = period_start(period, datetime.datetime.fromisoformat(row['completed_at']).date())
+        bucket = buckets.get(start, ActivityBucket())
+        buckets[start] = ActivityBucket(
+            bucket.workouts + 1, bucket.minutes + row['duration_minutes'], bucket.calories + row['calories_burned']
+        )
+    return buckets
+
+@pytest.fixture
+def history(tmp_path):
+    backend = SQLiteBackend(tmp_path / "fithome.db")
+    user_ids = [
+        backend.create_user("Ana", "ana@example.com", "secreto"),
+        backend.create_user("Luis", "luis@example.com", "secreto"),
+    ]
+    record_history(backend, user_ids, random.Random(9))
+    return backend, user_ids
+
+@pytest.mark.parametrize("period", PERIODS)
+def test_incremental_rollups_match_sessions(history, period):
+    backend, user_ids = history
+    for user_id in user_ids:
+        expected = recompute(backend, user_id, period)
+        assert expected
+        assert backend.load_rollups(user_id, period, SINCE, UNTIL) == expected
+
+def test_bucket_starts_follow_period():
+    day = datetime.date(2026, 3, 5)
+    assert period_start(DAY, day) == day
+    assert period_start(WEEK, day) == datetime.date(2026, 3, 2)
+    assert period_start(MONTH, day) == datetime.date(2026, 3, 1)
+
+def test_rebuild_rollups_matches_sessions(history):
+    backend, user_ids = history
+    with backend.transaction() as conn:
+        conn.execute("DELETE FROM activity_rollups")
+    # Bloques y volcados pequeños: los cubos repartidos entre volcados se suman
+    backend.rebuild_rollups(max_buckets=5, page_size=7)
+    for user_id in user_ids:
+        for period in PERIODS:
+            assert backend.load_rollups(user_id, period, SINCE, UNTIL) == recompute(backend, user_id, period)
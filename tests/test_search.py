@@ -0,0 +1,105 @@
+import dataclasses
+import random
+
+from fithome.catalog import get_catalog
+from fithome.search import (
+    build_kids_index, build_workout_index, kids_search_sql, normalize, parse_range, workout_search_sql
+)
+from fithome.storage import SQLiteBackend
+
+def make_backend(tmp_path):
+    backend = SQLiteBackend(tmp_path / "fithome.db")
+    catalog = get_catalog()
+    backend.save_catalog(catalog.workouts, catalog.kids_activities)
+    return backend, catalog
+
+def query_plan(backend, sql, params):
+    with backend.pool.connection() as conn:
+        return " | ".join(row['detail'] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+
+def test_workout_search_uses_category_difficulty_index(tmp_path):
+    backend, catalog = make_backend(tmp_path)
+    sql, params = workout_search_sql(["Cardio"], ["Intermedio"], placeholder="?")
+    assert "idx_workouts_category_difficulty" in query_plan(backend, sql, params)
+
+    expected = [
+        workout.id for workout in catalog.workouts
+        if workout.category == "Cardio" and workout.level == "Intermedio"
+    ]
+    assert backend.search_workouts(["Cardio"], ["Intermedio"]) == sorted(expected)
+
+def test_kids_search_uses_age_index(tmp_path):
+    backend, catalog = make_backend(tmp_path)
+    sql, params = kids_search_sql(age=(5, 5), placeholder="?")
+    assert "idx_kids_activities_age" in query_plan(backend, sql, params)
+
+    ids = backend.search_kids_activities(age=(5, 5), page_size=100)
+    assert ids and set(ids) <= {activity.id for activity in catalog.kids_activities}
+    assert backend.search_kids_activities(age=(5, 5), page=1, page_size=1) == ids[1:2]
+
+def synthetic_workouts(count, rng):
+    base = get_catalog().workouts
+    return [
+        dataclasses.replace(
+            base[i % len(base)], id=i + 1,
+            category=rng.choice(("Cardio", "Fuerza", "Flexibilidad", "Core")),
+            level=rng.choice(("Principiante", "Intermedio", "Avanzado")),
+            duration_minutes=rng.randrange(10, 61),
+            calories_min=(low := rng.randrange(50, 400)), calories_max=low + rng.randrange(0, 150),
+        )
+        for i in range(count)
+    ]
+
+def overlaps(low, high, query):
+    return low <= query[1] and high >= query[0]
+
+def test_combined_facet_and_range_query_matches_linear_filter():
+    workouts = synthetic_workouts(3000, random.Random(11))
+    index = build_workout_index(workouts)
+    mask = index.query(
+        facets={'category': ["Cardio", "Core"], 'level': "intermedio"},
+        ranges={'duration': (20, 35), 'calories': (150, 200)},
+    )
+    expected = [
+        workout for workout in workouts
+        if workout.category in ("Cardio", "Core") and workout.level == "Intermedio"
+        and overlaps(workout.duration_minutes, workout.duration_minutes, (20, 35))
+        and overlaps(workout.calories_min, workout.calories_max, (150, 200))
+    ]
+    assert expected and mask.bit_count() == len(expected)
+    assert index.take(mask, 0, len(workouts)) == expected
+
+def test_pagination_walks_the_filtered_results_in_order():
+    workouts = synthetic_workouts(3000, random.Random(5))
+    index = build_workout_index(workouts)
+    expected = [workout for workout in workouts if workout.category == "Fuerza" and workout.duration_minutes <= 30]
+    page_size = 7
+
+    first = index.search(facets={'category': "Fuerza"}, ranges={'duration': (0, 30)}, page_size=page_size)
+    assert first.total == len(expected)
+    assert first.pages == -(-len(expected) // page_size)
+    assert not first.has_previous and first.has_next
+
+    query = {'facets': {'category': "Fuerza"}, 'ranges': {'duration': (0, 30)}}
+    pages = [index.search(page, page_size, **query) for page in range(first.pages)]
+    assert [workout for page in pages for workout in page.items] == expected
+    assert not pages[-1].has_next
+    assert index.search(first.pages, page_size, **query).items == ()
+
+    mask = index.query(**query)
+    for skip in (0, 1, 13, len(expected) - 1):
+        assert index.take(mask, skip, 5) == expected[skip:skip + 5]
+
+def test_kids_age_range_combines_with_type_facet():
+    activities = get_catalog().kids_activities
+    index = build_kids_index(activities)
+    for activity in activities:
+        age = parse_range(activity.age)
+        result = index.search(facets={'type': activity.type}, ranges={'age': age}, page_size=100)
+        expected = [
+            other for other in activities
+            if normalize(other.type) == normalize(activity.type)
+            and parse_range(other.age) and overlaps(*parse_range(other.age), age)
+        ]
+        assert activity in result.items
+        assert list(result.items) == expected
@@ -0,0 +1,51 @@
+import datetime
+
+from fithome.streaks import StreakState, advance, current_streak, from_history
+
+MONDAY = datetime.date(2026, 3, 2)
+
+def day(offset):
+    return MONDAY + datetime.timedelta(days=offset)
+
+def test_first_day_starts_streak():
+    assert advance(StreakState(), MONDAY) == StreakState(1, 1, MONDAY)
+
+def test_same_day_repeat_does_not_count():
+    state = advance(StreakState(), MONDAY)
+    assert advance(state, MONDAY) is state
+
+def test_consecutive_days_extend_streak():
+    state = StreakState()
+    for offset in range(4):
+        state = advance(state, day(offset))
+    assert state == StreakState(4, 4, day(3))
+
+def test_gap_resets_streak_and_keeps_longest():
+    state = StreakState()
+    for offset in (0, 1, 2, 5):
+        state = advance(state, day(offset))
+    assert state == StreakState(1, 3, day(5))
+
+    # La más larga se conserva hasta que la nueva la supera
+    for offset in (6, 7):
+        state = advance(state, day(offset))
+    assert (state.current_streak, state.longest_streak) == (3, 3)
+    state = advance(state, day(8))
+    assert (state.current_streak, state.longest_streak) == (4, 4)
+
+def test_late_event_does_not_change_streak():
+    state = advance(advance(StreakState(), day(1)), day(2))
+    assert advance(state, day(0)) is state
+
+def test_current_streak_expires_after_a_missed_day():
+    state = advance(advance(StreakState(), day(0)), day(1))
+    assert current_streak(state, day(1)) == 2
+    assert current_streak(state, day(2)) == 2
+    assert current_streak(state, day(3)) == 0
+
+def test_from_history_matches_incremental():
+    days = [day(offset) for offset in (4, 0, 1, 1, 2, 5, 6, 9)]
+    state = StreakState()
+    for active in sorted(days):
+        state = advance(state, active)
+    assert from_history(days) == state == StreakState(1, 3, day(9))